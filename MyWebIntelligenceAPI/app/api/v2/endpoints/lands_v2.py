@@ -1294,7 +1294,7 @@ async def gather_serpapi_urls_v2(
     Replaces legacy `land urlist` command.
     """
     from app.config import settings
-    from app.services.serpapi_service import fetch_serpapi_url_list, SerpApiError
+    from app.services.serpapi_service import fetch_serpapi_url_list_async, SerpApiError
 
     land = await crud_land.get(db, id=land_id)
     if not land or land.owner_id != current_user.id:
@@ -1318,7 +1318,7 @@ async def gather_serpapi_urls_v2(
         )
 
     try:
-        results = fetch_serpapi_url_list(
+        results = await fetch_serpapi_url_list_async(
             api_key=api_key,
             query=payload.query,
             engine=payload.engine,
@@ -1330,7 +1330,7 @@ async def gather_serpapi_urls_v2(
         )
 
         # Add discovered URLs to the land
-        urls_to_add = [r["url"] for r in results if r.get("url")]
+        urls_to_add = [r.link for r in results if r.link]
         added_count = 0
         if urls_to_add:
             updated = await crud_land.add_urls_to_land(db, land_id, urls_to_add)
@@ -1343,7 +1343,7 @@ async def gather_serpapi_urls_v2(
             "engine": payload.engine,
             "total_results": len(results),
             "urls_added": added_count,
-            "results": results[:20],  # Return first 20 for preview
+            "results": [r._asdict() for r in results[:20]],  # Return first 20 for preview
         }
 
     except SerpApiError as e:
@@ -2,6 +2,7 @@
 API endpoints pour la gestion des paragraphes et embeddings
 """
 
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
@@ -540,12 +541,7 @@ async def get_text_processing_stats(
     """Récupère les statistiques de traitement de texte pour un land"""
     try:
         _ensure_land_access(db, land_id, current_user)
-        # TODO: Fix this - get_processing_stats needs AsyncSession but this endpoint uses Session
-        # This needs architectural review to align session types
-        # text_processor = TextProcessorService(db)
-        # stats = text_processor.get_processing_stats(db, land_id)
-        stats = {"error": "Processing stats temporarily unavailable - session type mismatch"}
-        return stats
+        return TextProcessorService().get_processing_stats(db, land_id)
     except Exception as e:
         logger.error(f"Error retrieving text processing stats for land {land_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -563,8 +559,8 @@ async def analyze_text_content(
         if len(text) > 20000:
             raise HTTPException(status_code=400, detail="Payload too large")
         
-        # Use static method for text analysis (no DB needed)
-        analysis = TextProcessorService.analyze_text_content(text)
+        # Use static method for text analysis (no DB needed), off the event loop
+        analysis = await asyncio.to_thread(TextProcessorService.analyze_text_content, text)
         return analysis
     except HTTPException:
         raise
@@ -2,9 +2,19 @@
 Configuration de l'application Celery
 """
 
+import asyncio
+import time
+from typing import Any, Awaitable, Optional
+
 from celery import Celery
+from celery.signals import worker_process_init
 from ..config import settings
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional dependency
+    uvloop = None
+
 celery_app = Celery("tasks")
 
 celery_app.conf.broker_url = settings.CELERY_BROKER_URL
@@ -33,3 +43,48 @@ if autoscale_setting:
             celery_app.conf.worker_autoscale = (max_workers, min_workers)
     except (ValueError, TypeError):
         pass
+
+
+# Boucle asyncio persistante du process worker : les tâches async la
+# réutilisent au lieu de créer une boucle par appel (asyncio.run), et les
+# connexions du pool asyncpg restent attachées à une boucle vivante.
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+@worker_process_init.connect
+def _install_event_loop_policy(**kwargs) -> None:
+    """Active uvloop (fourni par uvicorn[standard]) dans chaque process worker."""
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+def run_async(coroutine: Awaitable[Any]) -> Any:
+    """Exécute une coroutine sur la boucle persistante du process worker."""
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+    return _worker_loop.run_until_complete(coroutine)
+
+
+# Intervalle minimal (secondes) entre deux mises à jour PROGRESS d'une tâche :
+# chaque update_state est un aller-retour vers le result backend
+PROGRESS_MIN_INTERVAL = 1.0
+
+
+def throttled_update_state(
+    task: Any,
+    last_ts: float,
+    min_interval: float = PROGRESS_MIN_INTERVAL,
+    **meta: Any,
+) -> float:
+    """
+    Publie l'état PROGRESS au plus une fois par min_interval.
+
+    Renvoie l'horodatage (time.monotonic) de la dernière publication, à
+    repasser en last_ts à l'appel suivant ; float("-inf") publie toujours.
+    """
+    now = time.monotonic()
+    if now - last_ts < min_interval:
+        return last_ts
+    task.update_state(state="PROGRESS", meta=meta)
+    return now
@@ -282,13 +282,20 @@ def extract_md_links(markdown_content: str) -> List[str]:
 
     return links
 
-async def get_readable_content_with_fallbacks(url: str, html: Optional[str] = None) -> Dict[str, Any]:
+async def get_readable_content_with_fallbacks(
+    url: str,
+    html: Optional[str] = None,
+    archive_client: Optional[httpx.AsyncClient] = None,
+) -> Dict[str, Any]:
     """
     Extrait le contenu lisible avec fallbacks avancés (ALIGNED WITH LEGACY):
     1. Trafilatura sur HTML fourni (markdown + enrichissement médias)
     2. Archive.org + Trafilatura (si échec #1)
     3. BeautifulSoup fallback
 
+    archive_client: client HTTP réutilisé pour archive.org par un appelant
+    dont la boucle asyncio est persistante ; sinon un client par appel.
+
     Returns:
         Dict with:
             - readable: Contenu principal extrait (markdown ou texte)
@@ -355,7 +362,7 @@ async def get_readable_content_with_fallbacks(url: str, html: Optional[str] = No
 
     # Method 2: Archive.org fallback (before BeautifulSoup, aligned with legacy)
     try:
-        archived_result = await _extract_from_archive_org(url)
+        archived_result = await _extract_from_archive_org(url, archive_client)
         if archived_result and archived_result.get('readable'):
             return archived_result
     except Exception as e:
@@ -426,78 +433,84 @@ async def get_readable_content_with_fallbacks(url: str, html: Optional[str] = No
         'published_at': final_metadata.get('published_at')
     }
 
-async def _extract_from_archive_org(url: str) -> Optional[Dict[str, Any]]:
+async def _extract_from_archive_org(
+    url: str, client: Optional[httpx.AsyncClient] = None
+) -> Optional[Dict[str, Any]]:
     """
     Extract content from Archive.org archived version of the URL.
     ALIGNED WITH LEGACY (_legacy/core.py:1812-1857).
 
     Uses trafilatura.fetch_url and reproduces full markdown enrichment pipeline.
+    Without a caller-owned client, a client is opened and closed for the call.
     """
     try:
         # Get archived snapshot info
         archive_api_url = f"http://archive.org/wayback/available?url={url}"
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        if client is None:
+            async with httpx.AsyncClient(timeout=10.0) as own_client:
+                response = await own_client.get(archive_api_url)
+        else:
             response = await client.get(archive_api_url)
-            response.raise_for_status()
-            archive_data = response.json()
-
-            archived_url = archive_data.get('archived_snapshots', {}).get('closest', {}).get('url')
-            if not archived_url:
-                return None
-
-            print(f"Archive.org snapshot found: {archived_url}")
-
-            # Use trafilatura.fetch_url (legacy behavior) instead of httpx
-            archived_html = await asyncio.to_thread(trafilatura.fetch_url, archived_url)
-
-            if not archived_html:
-                return None
-
-            # Extract with Trafilatura in markdown format (legacy behavior)
-            extracted_content = trafilatura.extract(
-                archived_html,
-                include_comments=False,
-                include_links=True,
-                include_images=True,
-                output_format='markdown',
-                include_tables=True,
-                include_formatting=True,
-                favor_precision=True
-            )
-
-            readable_html = trafilatura.extract(
-                archived_html,
-                include_comments=False,
-                include_links=True,
-                include_images=True,
-                output_format='html'
-            )
-
-            if extracted_content and len(extracted_content) > 100:
-                # Enrich markdown with media markers (legacy behavior)
-                enriched_content, media_list = enrich_markdown_with_media(extracted_content, readable_html, url)
-                links = extract_md_links(enriched_content)
-
-                soup = BeautifulSoup(archived_html, 'html.parser')
-                metadata = get_metadata(soup, url)
-
-                return {
-                    'readable': enriched_content,
-                    'content': archived_html,
-                    'soup': soup,
-                    'readable_html': readable_html,
-                    'filtered_soup': None,  # Archive.org: Trafilatura markdown (pas besoin de soup filtré)
-                    'extraction_source': 'archive_org',
-                    'media_list': media_list,
-                    'links': links,
-                    'title': metadata.get('title'),
-                    'description': metadata.get('description'),
-                    'keywords': metadata.get('keywords'),
-                    'language': metadata.get('lang'),
-                    'canonical_url': metadata.get('canonical_url'),
-                    'published_at': metadata.get('published_at')
-                }
+        response.raise_for_status()
+        archive_data = response.json()
+
+        archived_url = archive_data.get('archived_snapshots', {}).get('closest', {}).get('url')
+        if not archived_url:
+            return None
+
+        print(f"Archive.org snapshot found: {archived_url}")
+
+        # Use trafilatura.fetch_url (legacy behavior) instead of httpx
+        archived_html = await asyncio.to_thread(trafilatura.fetch_url, archived_url)
+
+        if not archived_html:
+            return None
+
+        # Extract with Trafilatura in markdown format (legacy behavior)
+        extracted_content = trafilatura.extract(
+            archived_html,
+            include_comments=False,
+            include_links=True,
+            include_images=True,
+            output_format='markdown',
+            include_tables=True,
+            include_formatting=True,
+            favor_precision=True
+        )
+
+        readable_html = trafilatura.extract(
+            archived_html,
+            include_comments=False,
+            include_links=True,
+            include_images=True,
+            output_format='html'
+        )
+
+        if extracted_content and len(extracted_content) > 100:
+            # Enrich markdown with media markers (legacy behavior)
+            enriched_content, media_list = enrich_markdown_with_media(extracted_content, readable_html, url)
+            links = extract_md_links(enriched_content)
+
+            soup = BeautifulSoup(archived_html, 'html.parser')
+            metadata = get_metadata(soup, url)
+
+            return {
+                'readable': enriched_content,
+                'content': archived_html,
+                'soup': soup,
+                'readable_html': readable_html,
+                'filtered_soup': None,  # Archive.org: Trafilatura markdown (pas besoin de soup filtré)
+                'extraction_source': 'archive_org',
+                'media_list': media_list,
+                'links': links,
+                'title': metadata.get('title'),
+                'description': metadata.get('description'),
+                'keywords': metadata.get('keywords'),
+                'language': metadata.get('lang'),
+                'canonical_url': metadata.get('canonical_url'),
+                'published_at': metadata.get('published_at')
+            }
 
     except Exception as e:
         print(f"Error in Archive.org extraction for {url}: {e}")
@@ -16,13 +16,15 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 import httpx
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session, selectinload
 
 from app.core import content_extractor, text_processing
 from app.core.media_processor import MediaProcessorSync
 from app.db import models
 from app.services.sentiment_service import SentimentService
-from app.services.quality_scorer import QualityScorer
+from app.services.quality_scorer import QualityScorer, classify_content_type
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -193,6 +195,7 @@ class SyncCrawlerEngine:
         update_data: Dict[str, Optional[str]] = {
             "http_status": http_status_code,
             "content_type": content_type,
+            "content_type_class": classify_content_type(content_type),
             "content_length": content_length,
             "last_modified": last_modified_str,
             "etag": etag_str,
@@ -421,6 +424,7 @@ class SyncCrawlerEngine:
                                 # Add fields needed for quality computation
                                 self.http_status = data.get("http_status")
                                 self.content_type = data.get("content_type")
+                                self.content_type_class = data.get("content_type_class")
                                 self.title = data.get("title")
                                 self.description = data.get("description")
                                 self.keywords = data.get("keywords")
@@ -439,7 +443,8 @@ class SyncCrawlerEngine:
 
                         quality_result = self.quality_scorer.compute_quality_score(
                             expression=temp_expr_quality,
-                            land=land
+                            land=land,
+                            include_reason=False
                         )
 
                         update_data["quality_score"] = quality_result["score"]
@@ -496,11 +501,15 @@ class SyncCrawlerEngine:
         if domain:
             return domain
 
-        domain = models.Domain(name=name, land_id=land_id)
-        self.db.add(domain)
-        self.db.commit()
-        self.db.refresh(domain)
-        return domain
+        # INSERT ... RETURNING : l'objet et son id en un aller-retour ;
+        # ON CONFLICT couvre un domaine cree entre-temps par un autre worker
+        return self.db.scalars(
+            pg_insert(models.Domain)
+            .values(name=name, land_id=land_id)
+            .on_conflict_do_update(constraint="uq_domain_land_name", set_={"name": name})
+            .returning(models.Domain),
+            execution_options={"populate_existing": True},
+        ).one()
 
     def _get_or_create_expression(self, land_id: int, url: str, depth: int) -> models.Expression:
         url_hash = models.Expression.compute_url_hash(url)
@@ -519,17 +528,17 @@ class SyncCrawlerEngine:
         domain_name = urlparse(url).netloc
         domain = self._get_or_create_domain(domain_name, land_id)
 
-        expression = models.Expression(
-            url=url,
-            url_hash=url_hash,
-            land_id=land_id,
-            domain_id=domain.id,
-            depth=depth,
-        )
-        self.db.add(expression)
-        self.db.flush()
-        self.db.refresh(expression)
-        return expression
+        # INSERT ... RETURNING plutot que flush + refresh (deux allers-retours)
+        return self.db.scalars(
+            insert(models.Expression).returning(models.Expression),
+            [{
+                "url": url,
+                "url_hash": url_hash,
+                "land_id": land_id,
+                "domain_id": domain.id,
+                "depth": depth,
+            }],
+        ).one()
 
     def _get_expressions_to_crawl_query(
         self,
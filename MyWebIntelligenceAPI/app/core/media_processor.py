@@ -13,7 +13,7 @@ import hashlib
 import io
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse, urlunparse
 import os
 
@@ -55,6 +55,51 @@ def _convert_to_web_safe(rgb: tuple[int, int, int]) -> tuple[int, int, int]:
     return min(palette, key=lambda candidate: _rgb_distance(rgb, candidate))
 
 
+def _empty_analysis(url: str) -> Dict[str, Any]:
+    """Analysis result skeleton shared by the download and analysis steps."""
+    return {
+        'url': url,
+        'error': None,
+        'width': None,
+        'height': None,
+        'format': None,
+        'file_size': None,
+        'color_mode': None,
+        'has_transparency': False,
+        'aspect_ratio': None,
+        'exif_data': None,
+        'image_hash': None,
+        'dominant_colors': [],
+        'websafe_colors': {},
+        'mime_type': None,
+    }
+
+
+def analyze_image_bytes(url: str, content: bytes, mime_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Analyse already downloaded image bytes (CPU only: no DB, no network).
+
+    Module level and picklable so it can run in a process pool.
+    """
+    result = _empty_analysis(url)
+    result['mime_type'] = mime_type
+
+    try:
+        result['file_size'] = len(content)
+        result['image_hash'] = hashlib.sha256(content).hexdigest()
+
+        with Image.open(io.BytesIO(content)) as img:
+            MediaProcessorSync._analyse_image_properties(img, result)
+            if settings.ANALYZE_MEDIA:
+                MediaProcessorSync._extract_colors(img, result)
+                MediaProcessorSync._extract_exif(img, result)
+
+    except Exception as exc:  # noqa: BLE001 - keep unexpected errors surfaced
+        result['error'] = str(exc)
+
+    return result
+
+
 class MediaProcessorSync:
     """Synchronous replacement for the async media processor."""
 
@@ -90,48 +135,27 @@ class MediaProcessorSync:
 
         return list(urls)
 
-    def analyze_image(self, url: str) -> Dict[str, Any]:
-        """Synchronously download and analyse an image."""
-        result: Dict[str, Any] = {
-            'url': url,
-            'error': None,
-            'width': None,
-            'height': None,
-            'format': None,
-            'file_size': None,
-            'color_mode': None,
-            'has_transparency': False,
-            'aspect_ratio': None,
-            'exif_data': None,
-            'image_hash': None,
-            'dominant_colors': [],
-            'websafe_colors': {},
-            'mime_type': None,
-        }
-
-        try:
-            response = self.http_client.get(url, timeout=30.0)
-            response.raise_for_status()
-
-            result['mime_type'] = response.headers.get('Content-Type')
-            content = response.content
+    def download_image(self, url: str) -> Tuple[bytes, Optional[str]]:
+        """Download image bytes (network only); raise on HTTP error or oversized file."""
+        response = self.http_client.get(url, timeout=30.0)
+        response.raise_for_status()
 
-            if len(content) > self.max_size:
-                raise ValueError(f"File size exceeds limit ({len(content)} bytes)")
+        content = response.content
+        if len(content) > self.max_size:
+            raise ValueError(f"File size exceeds limit ({len(content)} bytes)")
 
-            result['file_size'] = len(content)
-            result['image_hash'] = hashlib.sha256(content).hexdigest()
-
-            with Image.open(io.BytesIO(content)) as img:
-                self._analyse_image_properties(img, result)
-                if settings.ANALYZE_MEDIA:
-                    self._extract_colors(img, result)
-                    self._extract_exif(img, result)
+        return content, response.headers.get('Content-Type')
 
+    def analyze_image(self, url: str) -> Dict[str, Any]:
+        """Synchronously download and analyse an image."""
+        try:
+            content, mime_type = self.download_image(url)
         except Exception as exc:  # noqa: BLE001 - keep unexpected errors surfaced
+            result = _empty_analysis(url)
             result['error'] = str(exc)
+            return result
 
-        return result
+        return analyze_image_bytes(url, content, mime_type)
 
     def media_exists(self, expression_id: int, url: str) -> bool:
         """Return True if a media entry already exists for expression/url pair."""
@@ -355,7 +379,8 @@ class MediaProcessorSync:
             }
         )
 
-    def _extract_colors(self, img: Image.Image, result: Dict[str, Any]) -> None:
+    @staticmethod
+    def _extract_colors(img: Image.Image, result: Dict[str, Any]) -> None:
         """Run KMeans to determine dominant colours."""
         n_colors = settings.N_DOMINANT_COLORS
         try:
@@ -1,10 +1,13 @@
+import asyncio
 import logging
 import os
 import re
 import shutil
+import time
 import zipfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 import nltk
 from nltk.stem import SnowballStemmer, WordNetLemmatizer
@@ -134,10 +137,16 @@ def stem_word(word: str) -> str:
     cached_stemmer: SnowballStemmer = getattr(stem_word, "_stemmer")
     return cached_stemmer.stem((word or "").lower())
 
+# Distinct (term, lang) pairs memoized by get_lemma; vocabularies repeat heavily across documents
+LEMMA_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
 def get_lemma(term: str, lang: str = "en") -> str:
     """
     Get the lemma/stem (base form) of a term using appropriate language processors.
     Supports French stemming, English lemmatization, and basic cleaning for other languages.
+    Results are memoized: each call otherwise normalizes, tokenizes and stems the term.
     """
     if not term or not term.strip():
         return ""
@@ -198,25 +207,31 @@ def normalize_text(text: str) -> str:
     return text.strip()
 
 
+@lru_cache(maxsize=None)
+def _stop_words(lang: str) -> frozenset:
+    """Stopwords for a language, read once from the NLTK corpus."""
+    from nltk.corpus import stopwords
+
+    if lang == "fr":
+        # Add common French words not in NLTK
+        return frozenset(stopwords.words('french')) | {'cela', 'celui', 'celle', 'ceux', 'celles', 'ça', 'où'}
+    if lang == "en":
+        return frozenset(stopwords.words('english'))
+    return frozenset()
+
+
 def extract_keywords(text: str, lang: str = "fr", max_keywords: int = 10) -> list[str]:
     """
     Extract meaningful keywords from text using language-specific processing.
+
+    Keywords are the first max_keywords distinct lemmas, in reading order;
+    tokens past that point are not lemmatized.
     """
     if not text:
         return []
     
     try:
-        from nltk.corpus import stopwords
-        
-        # Get stopwords for the language
-        if lang == "fr":
-            stop_words = set(stopwords.words('french'))
-            # Add common French words not in NLTK
-            stop_words.update(['cela', 'celui', 'celle', 'ceux', 'celles', 'ça', 'où'])
-        elif lang == "en":
-            stop_words = set(stopwords.words('english'))
-        else:
-            stop_words = set()
+        stop_words = _stop_words(lang)
         
         # Normalize and tokenize
         normalized = normalize_text(text)
@@ -225,6 +240,7 @@ def extract_keywords(text: str, lang: str = "fr", max_keywords: int = 10) -> lis
         
         # Filter tokens: remove stopwords, short words, and get stems/lemmas
         keywords = []
+        seen = set()
         for token in tokens:
             if (len(token) >= 3 and 
                 token.isalnum() and 
@@ -232,11 +248,13 @@ def extract_keywords(text: str, lang: str = "fr", max_keywords: int = 10) -> lis
                 
                 # Get the stem/lemma
                 lemma = get_lemma(token, lang)
-                if lemma and lemma not in keywords:
+                if lemma and lemma not in seen:
+                    seen.add(lemma)
                     keywords.append(lemma)
+                    if len(keywords) >= max_keywords:
+                        break
         
-        # Limit number of keywords
-        return keywords[:max_keywords]
+        return keywords
         
     except Exception as e:
         logger.warning(f"Error extracting keywords: {e}")
@@ -269,6 +287,52 @@ async def get_land_dictionary(db: AsyncSession, land_id: int) -> Dict[str, float
     return dictionary
 
 
+# land_id -> (monotonic timestamp, dictionary); shared read-only by callers
+LAND_DICTIONARY_TTL = 300.0
+_DICT_CACHE: Dict[int, Tuple[float, Dict[str, float]]] = {}
+_DICT_LOCKS: Dict[int, Tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = {}
+
+
+def _land_dictionary_lock(land_id: int) -> asyncio.Lock:
+    """Per-land lock, recreated when called from another event loop (Celery runs one per task)."""
+    loop = asyncio.get_running_loop()
+    entry = _DICT_LOCKS.get(land_id)
+    if entry is None or entry[0] is not loop:
+        entry = (loop, asyncio.Lock())
+        _DICT_LOCKS[land_id] = entry
+    return entry[1]
+
+
+async def get_land_dictionary_cached(
+    db: AsyncSession, land_id: int, ttl: float = LAND_DICTIONARY_TTL
+) -> Dict[str, float]:
+    """
+    get_land_dictionary behind a per-land TTL cache.
+
+    Concurrent misses for the same land wait on one query. The returned dict
+    is shared between callers and must not be mutated.
+    """
+    cached = _DICT_CACHE.get(land_id)
+    if cached is not None and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+
+    async with _land_dictionary_lock(land_id):
+        cached = _DICT_CACHE.get(land_id)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        dictionary = await get_land_dictionary(db, land_id)
+        _DICT_CACHE[land_id] = (time.monotonic(), dictionary)
+        return dictionary
+
+
+def invalidate_land_dictionary(land_id: Optional[int] = None) -> None:
+    """Drop the cached dictionary of a land (or of every land when land_id is None)."""
+    if land_id is None:
+        _DICT_CACHE.clear()
+    else:
+        _DICT_CACHE.pop(land_id, None)
+
+
 def get_land_dictionary_sync(db, land_id: int) -> Dict[str, float]:
     """
     Synchronous alternative used by Celery workers relying on Session.
@@ -313,27 +377,27 @@ async def expression_relevance(dictionary: Dict[str, float], expr, lang: str = "
     if hasattr(expr, 'title') and expr.title:
         title_keywords = extract_keywords(expr.title, lang, max_keywords=20)
         for keyword in title_keywords:
-            if keyword in dictionary and keyword not in matched_terms:
-                weight = dictionary[keyword]
+            weight = dictionary.get(keyword)
+            if weight is not None and keyword not in matched_terms:
                 score += weight * 10
                 matched_terms.add(keyword)
-                logger.debug(f"Title match: '{keyword}' -> +{weight * 10}")
+                logger.debug("Title match: '%s' -> +%s", keyword, weight * 10)
     
     # Process readable content (weight 1)
     if hasattr(expr, 'readable') and expr.readable:
         content_keywords = extract_keywords(expr.readable, lang, max_keywords=50)
         for keyword in content_keywords:
-            if keyword in dictionary and keyword not in matched_terms:
-                weight = dictionary[keyword]
+            weight = dictionary.get(keyword)
+            if weight is not None and keyword not in matched_terms:
                 score += weight * 1
                 matched_terms.add(keyword)
-                logger.debug(f"Content match: '{keyword}' -> +{weight}")
+                logger.debug("Content match: '%s' -> +%s", keyword, weight)
     
     # Bonus for multiple matching terms (indicates topic relevance)
     if len(matched_terms) > 1:
         bonus = len(matched_terms) * 0.5
         score += bonus
-        logger.debug(f"Multi-term bonus: {len(matched_terms)} terms -> +{bonus}")
+        logger.debug("Multi-term bonus: %d terms -> +%s", len(matched_terms), bonus)
     
     # Apply language-specific relevance boost
     if lang == "fr" and len(matched_terms) > 0:
@@ -341,7 +405,7 @@ async def expression_relevance(dictionary: Dict[str, float], expr, lang: str = "
         score *= 1.1
     
     final_score = round(score, 2)
-    logger.debug(f"Final relevance score: {final_score} (matched {len(matched_terms)} terms)")
+    logger.debug("Final relevance score: %s (matched %d terms)", final_score, len(matched_terms))
     
     return final_score
 
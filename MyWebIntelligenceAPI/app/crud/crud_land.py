@@ -7,7 +7,7 @@ from sqlalchemy.orm import selectinload
 
 from app.db.models import Land, Word, LandDictionary, CrawlStatus
 from app.schemas.land import LandCreate, LandUpdate
-from app.core.text_processing import get_lemma
+from app.core.text_processing import get_lemma, invalidate_land_dictionary
 
 class CRUDLand:
     async def get(self, db: AsyncSession, id: int):
@@ -101,6 +101,7 @@ class CRUDLand:
         if obj:
             await db.delete(obj)
             await db.commit()
+            invalidate_land_dictionary(id)
         return obj
 
     async def get_by_name_and_user(
@@ -185,6 +186,7 @@ class CRUDLand:
                 db.add(new_association)
         
         await db.commit()
+        invalidate_land_dictionary(land.id)
         await db.refresh(land, attribute_names=["words"])
         return land
 
@@ -2,9 +2,10 @@
 CRUD operations pour les paragraphes
 """
 
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Sequence, Tuple
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_, or_, text
+from sqlalchemy import func, and_, or_, text, delete
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud.base import CRUDBase
 from app.db.models import Paragraph, Expression
 from app.schemas.paragraph import ParagraphCreate, ParagraphUpdate
@@ -13,6 +14,19 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Ordre des colonnes des tuples passés à copy_insert
+PARAGRAPH_COPY_COLUMNS = (
+    'expression_id',
+    'text',
+    'text_hash',
+    'position',
+    'word_count',
+    'char_count',
+    'sentence_count',
+    'language',
+    'reading_level',
+)
+
 class CRUDParagraph(CRUDBase[Paragraph, ParagraphCreate, ParagraphUpdate]):
     
     def get(self, db: Session, id: int) -> Optional[Paragraph]:
@@ -403,32 +417,41 @@ class CRUDParagraph(CRUDBase[Paragraph, ParagraphCreate, ParagraphUpdate]):
         paragraphs: List[ParagraphCreate],
         analyze_text: bool = True
     ) -> List[Paragraph]:
-        """Création en lot optimisée."""
+        """Création en lot optimisée (une seule requête de déduplication)."""
         from app.utils.text_utils import analyze_text_metrics
         
+        hashed = [
+            (para, hashlib.sha256(para.text.encode('utf-8')).hexdigest())
+            for para in paragraphs
+        ]
+        
+        # Empreintes déjà en base pour les expressions concernées
+        expression_ids = {para.expression_id for para, _ in hashed}
+        seen = set(
+            db.query(Paragraph.expression_id, Paragraph.text_hash).filter(
+                Paragraph.expression_id.in_(expression_ids)
+            ).all()
+        ) if expression_ids else set()
+        
         db_objects = []
-        for para in paragraphs:
-            text_hash = hashlib.sha256(para.text.encode('utf-8')).hexdigest()
-            
-            # Vérifier la déduplication
-            existing = db.query(Paragraph).filter(
-                and_(
-                    Paragraph.expression_id == para.expression_id,
-                    Paragraph.text_hash == text_hash
-                )
-            ).first()
+        for para, text_hash in hashed:
+            key = (para.expression_id, text_hash)
+            if key in seen:
+                continue  # Skip les doublons (base ou lot courant)
+            seen.add(key)
             
-            if existing:
-                continue  # Skip les doublons
-            
-            metrics = analyze_text_metrics(para.text) if analyze_text else {}
+            # Langue détectée seulement si elle n'est pas fournie
+            metrics = analyze_text_metrics(
+                para.text, with_language=para.language is None
+            ) if analyze_text else {}
+            detected_language = metrics.pop('language', None)
             
             db_obj = Paragraph(
                 expression_id=para.expression_id,
                 text=para.text,
                 text_hash=text_hash,
                 position=para.position,
-                language=para.language,
+                language=para.language or detected_language,
                 **metrics
             )
             db_objects.append(db_obj)
@@ -440,9 +463,46 @@ class CRUDParagraph(CRUDBase[Paragraph, ParagraphCreate, ParagraphUpdate]):
             for obj in db_objects:
                 db.refresh(obj)
         
-        logger.info(f"Bulk created {len(db_objects)} paragraphs (skipped {len(paragraphs) - len(db_objects)} duplicates)")
+        logger.info(f"Bulk created {len(db_objects)} paragraphs (skipped {len(hashed) - len(db_objects)} duplicates)")
         return db_objects
     
+    async def copy_insert(
+        self,
+        db: AsyncSession,
+        rows: Sequence[Tuple]
+    ) -> int:
+        """
+        Insère des paragraphes via COPY (asyncpg), sans dédoublonnage ni commit.
+        
+        Les tuples suivent PARAGRAPH_COPY_COLUMNS, métriques déjà calculées ;
+        created_at prend sa valeur par défaut côté serveur.
+        """
+        if not rows:
+            return 0
+        
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            Paragraph.__tablename__,
+            records=rows,
+            columns=PARAGRAPH_COPY_COLUMNS
+        )
+        logger.info(f"Copied {len(rows)} paragraphs")
+        return len(rows)
+    
+    async def delete_by_expressions(
+        self,
+        db: AsyncSession,
+        expression_ids: Sequence[int]
+    ) -> int:
+        """Supprime les paragraphes d'un ensemble d'expressions (sans commit)."""
+        if not expression_ids:
+            return 0
+        result = await db.execute(
+            delete(Paragraph).where(Paragraph.expression_id.in_(expression_ids))
+        )
+        return result.rowcount
+    
     def delete_by_expression(
         self,
         db: Session,
@@ -13,11 +13,22 @@ Base = declarative_base()
 # Import de tous les modèles pour SQLAlchemy
 from app.db.models import *  # noqa
 
-# Engine asynchrone pour PostgreSQL
+# Engine asynchrone pour PostgreSQL, partagé par toute l'application.
+# Le pool évite une connexion par requête ; les caches de requêtes préparées
+# (asyncpg et adaptateur SQLAlchemy) évitent de re-préparer les mêmes SQL.
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DATABASE_ECHO,
-    future=True
+    future=True,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    pool_pre_ping=False,
+    connect_args={
+        "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+    }
 )
 
 # Session factory asynchrone
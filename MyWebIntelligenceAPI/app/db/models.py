@@ -13,7 +13,7 @@ Ces modèles représentent les entités principales :
 """
 
 from sqlalchemy import (
-    Column, Integer, String, Text, Float, DateTime, Boolean,
+    Column, Integer, SmallInteger, String, Text, Float, DateTime, Boolean,
     ForeignKey, Index, JSON, Enum, UniqueConstraint, CheckConstraint,
     event
 )
@@ -225,6 +225,7 @@ class Expression(Base):
     
     # Headers HTTP
     content_type = Column(String(100), nullable=True)
+    content_type_class = Column(SmallInteger, nullable=True)  # 0=autre, 1=html, 2=pdf (cf. quality_scorer)
     content_length = Column(Integer, nullable=True)
     last_modified = Column(DateTime(timezone=True), nullable=True)
     etag = Column(String(255), nullable=True)
@@ -575,6 +576,7 @@ class Media(Base):
     __table_args__ = (
         Index('ix_media_expression_type', 'expression_id', 'type'),
         Index('ix_media_processed', 'is_processed'),
+        UniqueConstraint('expression_id', 'url_hash', name='uq_media_expression_url'),
     )
 
     @staticmethod
@@ -21,7 +21,26 @@ else:
 # The issue: URL.set() can mangle special characters when converting back to string
 sync_url_str = f"{_base_url.drivername.replace('+asyncpg', '+psycopg2')}://{_base_url.username}:{_base_url.password}@{_base_url.host}:{_base_url.port}/{_base_url.database}"
 
-engine = create_engine(sync_url_str, pool_pre_ping=True)
+# Pool dimensionné explicitement : le défaut (5 + 10) bloque les tâches
+# Celery et les routes sync concurrentes en attente d'une connexion.
+# Chaque process worker (prefork) a son propre pool.
+# psycopg2 : les executemany (UPDATE groupés par clé primaire, etc.) partent
+# en lots via execute_batch au lieu d'un aller-retour par ligne ; les INSERT
+# multi-lignes gardent execute_values.
+_executemany_options = (
+    {"executemany_mode": "values_plus_batch", "executemany_batch_page_size": 500}
+    if sync_url_str.split("://", 1)[0].endswith("+psycopg2")
+    else {}
+)
+engine = create_engine(
+    sync_url_str,
+    pool_pre_ping=True,
+    pool_size=settings.DATABASE_SYNC_POOL_SIZE,
+    max_overflow=settings.DATABASE_SYNC_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    **_executemany_options,
+)
 
 SessionLocal = sessionmaker(
     bind=engine,
@@ -145,7 +145,8 @@ def reprocess_quality_scores(
                 # Compute quality score
                 quality_result = scorer.compute_quality_score(
                     expression=expr,
-                    land=expr.land
+                    land=expr.land,
+                    include_reason=False
                 )
 
                 old_score = expr.quality_score
@@ -9,7 +9,12 @@ from sqlalchemy import select
 
 from app.db.models import Land, Word, LandDictionary
 from app.crud.crud_land import land as crud_land
-from app.core.text_processing import normalize_text, get_lemma, extract_keywords
+from app.core.text_processing import (
+    normalize_text,
+    get_lemma,
+    extract_keywords,
+    invalidate_land_dictionary,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -104,6 +109,7 @@ class DictionaryService:
             "total_entries": created_entries + variations_created
         }
         
+        invalidate_land_dictionary(land_id)
         logger.info(f"Dictionary populated for land {land_id}: {result}")
         return result
     
@@ -121,6 +127,7 @@ class DictionaryService:
             delete(LandDictionary).where(LandDictionary.land_id == land_id)
         )
         await self.db.commit()
+        invalidate_land_dictionary(land_id)
     
     async def _create_or_get_word(self, word: str, lemma: str, languages: List[str]) -> tuple[Optional[Word], bool]:
         """Crée ou récupère un mot dans la base avec processing amélioré.
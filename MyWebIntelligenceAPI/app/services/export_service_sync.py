@@ -7,7 +7,7 @@ import csv
 import datetime
 import re
 import unicodedata
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 from textwrap import dedent
 from lxml import etree
 from zipfile import ZipFile
@@ -27,6 +27,9 @@ class SyncExportService:
     """
     
     GEXF_NS = {None: 'http://www.gexf.net/1.2draft', 'viz': 'http://www.gexf.net/1.1draft/viz'}
+
+    # Rows fetched per round-trip when streaming query results
+    STREAM_BATCH_SIZE = 1000
     
     def __init__(self, db: Session):
         self.db = db
@@ -83,30 +86,39 @@ class SyncExportService:
 
         return file_path, count
     
-    def get_sql_data(self, sql: str, column_map: Dict[str, str], land_id: int, relevance: int) -> List[Dict[str, Any]]:
+    def get_sql_data(self, sql: str, column_map: Dict[str, str], land_id: int, relevance: int) -> Iterator[Dict[str, Any]]:
         """
-        Execute SQL query and return results as list of dictionaries
-        
+        Execute SQL query and stream results as dictionaries
+
+        Rows are fetched through a server-side cursor, STREAM_BATCH_SIZE at a
+        time, so writers consume them without holding the whole result set.
+
         Args:
             sql: SQL query template with {} placeholder for columns
             column_map: Mapping of result columns to SQL expressions
             land_id: Land ID parameter
             relevance: Minimum relevance parameter
-            
-        Returns:
-            List of dictionaries with query results
+
+        Yields:
+            One dictionary per result row
         """
         # Build column list
         cols = ",\n".join([f"{sql_expr} AS {col_name}" for col_name, sql_expr in column_map.items()])
-        
+
         # Execute query
-        query = text(sql.format(cols))
-        result = self.db.execute(query, {"land_id": land_id, "relevance": relevance})
-        
-        # Convert to list of dictionaries
-        rows = result.fetchall()
-        return [dict(zip(column_map.keys(), row)) for row in rows]
-    
+        result = self._stream(text(sql.format(cols)), {"land_id": land_id, "relevance": relevance})
+
+        keys = list(column_map.keys())
+        for row in result:
+            yield dict(zip(keys, row))
+
+    def _stream(self, query, params: Dict[str, Any]):
+        """Execute a text query through a server-side cursor (rows are not buffered)."""
+        return self.db.execute(
+            query.execution_options(stream_results=True, yield_per=self.STREAM_BATCH_SIZE),
+            params,
+        )
+
     def write_pagecsv(self, filename: str, land_id: int, minimum_relevance: int) -> int:
         """
         Write page CSV export - basic page information
@@ -218,14 +230,14 @@ class SyncExportService:
         data = self.get_sql_data(sql, column_map, land_id, minimum_relevance)
         return self.write_csv_file(filename, column_map.keys(), data)
     
-    def write_csv_file(self, filename: str, headers: List[str], data: List[Dict[str, Any]]) -> int:
+    def write_csv_file(self, filename: str, headers: List[str], data: Iterable[Dict[str, Any]]) -> int:
         """
-        Write CSV file from data
+        Write CSV file from data, one row at a time
         
         Args:
             filename: Output filename
             headers: CSV headers
-            data: List of dictionaries with data
+            data: Iterable of dictionaries with data (rows are not buffered)
             
         Returns:
             Number of records written
@@ -548,14 +560,12 @@ class SyncExportService:
         import io
         import json
 
-        def _csv_bytes(headers, rows):
-            """Write CSV to an in-memory bytes buffer."""
-            buf = io.StringIO()
-            writer = csv.writer(buf, quoting=csv.QUOTE_ALL)
-            writer.writerow(headers)
-            for r in rows:
-                writer.writerow(r)
-            return buf.getvalue().encode("utf-8")
+        def _write_csv_entry(archive, name, headers, rows):
+            """Stream CSV rows into a ZIP entry, without an in-memory copy."""
+            with archive.open(name, "w") as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as buf:
+                writer = csv.writer(buf, quoting=csv.QUOTE_ALL)
+                writer.writerow(headers)
+                writer.writerows(rows)
 
         params = {"land_id": land_id, "relevance": minimum_relevance}
 
@@ -572,7 +582,7 @@ class SyncExportService:
             WHERE e.land_id = :land_id AND e.relevance >= :relevance
             ORDER BY e.id
         """)
-        rows = self.db.execute(pn_sql, params).fetchall()
+        rows = self._stream(pn_sql, params)
         pn_base_headers = [
             "id", "url", "domain_id", "domain_name", "title", "description", "keywords",
             "lang", "relevance", "depth", "http_status",
@@ -596,13 +606,14 @@ class SyncExportService:
             d["_sr"] = sr_data
             parsed_rows.append(d)
 
+        # seorank columns are only known once every page is read: this part
+        # stays buffered
         all_headers = pn_base_headers + seorank_keys
-        pn_rows = []
-        for d in parsed_rows:
-            vals = [d.get(h, "") for h in pn_base_headers]
-            vals += [d["_sr"].get(k, "na") for k in seorank_keys]
-            pn_rows.append(vals)
-        count = len(pn_rows)
+        pn_rows = (
+            [d.get(h, "") for h in pn_base_headers] + [d["_sr"].get(k, "na") for k in seorank_keys]
+            for d in parsed_rows
+        )
+        count = len(parsed_rows)
 
         # ── 2. pageslinks ─────────────────────────────────────
         pl_sql = text("""
@@ -615,7 +626,6 @@ class SyncExportService:
             WHERE es.land_id = :land_id AND es.relevance >= :relevance
             ORDER BY el.source_id
         """)
-        pl_rows = self.db.execute(pl_sql, params).fetchall()
         pl_headers = ["source_id", "source_url", "source_domain_id",
                        "target_id", "target_url", "target_domain_id"]
 
@@ -633,7 +643,6 @@ class SyncExportService:
             GROUP BY d.id
             ORDER BY d.id
         """)
-        dn_rows = self.db.execute(dn_sql, params).fetchall()
         dn_headers = ["id", "name", "title", "description", "http_status",
                        "nbexpressions", "average_relevance",
                        "first_expression_date", "last_expression_date"]
@@ -654,16 +663,16 @@ class SyncExportService:
             GROUP BY es.domain_id, ds.name, et.domain_id, dt.name
             ORDER BY link_count DESC
         """)
-        dl_rows = self.db.execute(dl_sql, params).fetchall()
         dl_headers = ["source_domain_id", "source_domain_name",
                        "target_domain_id", "target_domain_name", "link_count"]
 
         # ── Bundle into ZIP ───────────────────────────────────
+        # Links and domain queries are streamed straight into their entries
         with ZipFile(filename, "w") as zf:
-            zf.writestr("pagesnodes.csv", _csv_bytes(all_headers, pn_rows))
-            zf.writestr("pageslinks.csv", _csv_bytes(pl_headers, pl_rows))
-            zf.writestr("domainnodes.csv", _csv_bytes(dn_headers, dn_rows))
-            zf.writestr("domainlinks.csv", _csv_bytes(dl_headers, dl_rows))
+            _write_csv_entry(zf, "pagesnodes.csv", all_headers, pn_rows)
+            _write_csv_entry(zf, "pageslinks.csv", pl_headers, self._stream(pl_sql, params))
+            _write_csv_entry(zf, "domainnodes.csv", dn_headers, self._stream(dn_sql, params))
+            _write_csv_entry(zf, "domainlinks.csv", dl_headers, self._stream(dl_sql, params))
 
         return count
 
@@ -694,7 +703,7 @@ class SyncExportService:
             ORDER BY s.similarity_score DESC
         """)
         try:
-            rows = self.db.execute(sql, {"land_id": land_id, "relevance": minimum_relevance}).fetchall()
+            rows = self._stream(sql, {"land_id": land_id, "relevance": minimum_relevance})
         except Exception:
             rows = []
         headers = ["Source_ParagraphID", "Target_ParagraphID", "SimilarityScore",
@@ -731,7 +740,7 @@ class SyncExportService:
             ORDER BY pair_count DESC
         """)
         try:
-            rows = self.db.execute(sql, {"land_id": land_id, "relevance": minimum_relevance}).fetchall()
+            rows = self._stream(sql, {"land_id": land_id, "relevance": minimum_relevance})
         except Exception:
             rows = []
         headers = ["Source_ExpressionID", "Target_ExpressionID", "Source_DomainID",
@@ -770,7 +779,7 @@ class SyncExportService:
             ORDER BY pair_count DESC
         """)
         try:
-            rows = self.db.execute(sql, {"land_id": land_id, "relevance": minimum_relevance}).fetchall()
+            rows = self._stream(sql, {"land_id": land_id, "relevance": minimum_relevance})
         except Exception:
             rows = []
         headers = ["Source_DomainID", "Source_Domain", "Target_DomainID", "Target_Domain",
@@ -803,24 +812,18 @@ class SyncExportService:
             ORDER BY tc.expression_id, t.parent_id, t.sorting
         """)
         try:
-            rows = self.db.execute(sql, {"land_id": land_id, "relevance": minimum_relevance}).fetchall()
+            rows = self._stream(sql, {"land_id": land_id, "relevance": minimum_relevance})
         except Exception:
             rows = []
 
-        # Build matrix
+        # Build sparse matrix in a single pass over the streamed rows; missing
+        # cells are written as 0
         tags_list: list = []
-        data_rows: list = []
-        for row in rows:
-            if row[1] not in tags_list:
-                tags_list.append(row[1])
-            data_rows.append(row)
-
         matrix: Dict[int, Dict[str, int]] = {}
-        for row in data_rows:
-            eid = row[0]
-            if eid not in matrix:
-                matrix[eid] = {t: 0 for t in tags_list}
-            matrix[eid][row[1]] = row[2]
+        for eid, path, cnt in rows:
+            if path not in tags_list:
+                tags_list.append(path)
+            matrix.setdefault(eid, {})[path] = cnt
 
         with open(filename, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f, quoting=csv.QUOTE_ALL)
@@ -851,7 +854,7 @@ class SyncExportService:
             ORDER BY t.parent_id, t.sorting
         """)
         try:
-            rows = self.db.execute(sql, {"land_id": land_id, "relevance": minimum_relevance}).fetchall()
+            rows = self._stream(sql, {"land_id": land_id, "relevance": minimum_relevance})
         except Exception:
             rows = []
         headers = ["path", "content", "expression_id"]
@@ -861,11 +864,13 @@ class SyncExportService:
     # Helper
     # ─────────────────────────────────────────────────────────
 
-    def _write_rows_csv(self, filename: str, headers: list, rows: list) -> int:
-        """Write rows to CSV file."""
+    def _write_rows_csv(self, filename: str, headers: list, rows: Iterable) -> int:
+        """Write rows (list or streamed result) to CSV file."""
+        count = 0
         with open(filename, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f, quoting=csv.QUOTE_ALL)
             writer.writerow(headers)
             for row in rows:
                 writer.writerow(row)
-        return len(rows)
\ No newline at end of file
+                count += 1
+        return count
\ No newline at end of file
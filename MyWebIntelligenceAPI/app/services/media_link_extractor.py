@@ -168,14 +168,20 @@ class MediaLinkExtractor:
             
             for media in existing_media:
                 await self.db.delete(media)
+            # Flush deletes first: the unit of work emits INSERTs before
+            # DELETEs, which would hit uq_media_expression_url for kept URLs
+            if existing_media:
+                await self.db.flush()
             
-            # Create new media records
+            # Create new media records (one per URL)
             created_count = 0
+            seen_urls = set()
             for media_info in media_list:
                 # Clean and validate URL (similar to crawl implementation)
                 cleaned_url = self._clean_media_url(media_info.url)
                 
-                if cleaned_url:
+                if cleaned_url and cleaned_url not in seen_urls:
+                    seen_urls.add(cleaned_url)
                     media = Media(
                         expression_id=expression_id,
                         url=cleaned_url,
@@ -197,45 +203,62 @@ class MediaLinkExtractor:
     async def create_expression_links(
         self,
         source_expression_id: int,
-        link_list: List[LinkInfo]
+        link_list: List[LinkInfo],
+        land_id: Optional[int] = None
     ) -> int:
         """
         Create ExpressionLink records for discovered URLs.
         Similar to the crawl implementation but from markdown links.
+        Targets and existing links are resolved with one query each
+        (url IN (...)), restricted to land_id when given.
         """
         try:
-            created_count = 0
-            
+            links_by_url: Dict[str, LinkInfo] = {}
             for link_info in link_list:
-                # Check if target expression exists in the database
-                target_query = select(Expression).where(Expression.url == link_info.url)
-                target_result = await self.db.execute(target_query)
-                target_expression = target_result.scalar_one_or_none()
-                
-                if target_expression:
-                    # Check if link already exists
-                    existing_link_query = select(ExpressionLink).where(
-                        and_(
-                            ExpressionLink.source_id == source_expression_id,
-                            ExpressionLink.target_id == target_expression.id
-                        )
-                    )
-                    existing_link_result = await self.db.execute(existing_link_query)
-                    existing_link = existing_link_result.scalar_one_or_none()
-                    
-                    if not existing_link:
-                        # Create new expression link
-                        expression_link = ExpressionLink(
-                            source_id=source_expression_id,
-                            target_id=target_expression.id,
-                            anchor_text=link_info.anchor_text,
-                            link_type=link_info.link_type
-                        )
-                        self.db.add(expression_link)
-                        created_count += 1
-                else:
-                    # Target URL not in our database yet - could be external or not crawled
-                    logger.debug(f"Target URL not found in database: {link_info.url}")
+                links_by_url.setdefault(link_info.url, link_info)
+            if not links_by_url:
+                return 0
+            
+            # Resolve all target expressions in one round trip
+            target_query = select(Expression.id, Expression.url).where(
+                Expression.url.in_(links_by_url)
+            )
+            if land_id is not None:
+                target_query = target_query.where(Expression.land_id == land_id)
+            target_result = await self.db.execute(target_query)
+            target_ids = {url: target_id for target_id, url in target_result.all()}
+            
+            for url in links_by_url.keys() - target_ids.keys():
+                # Target URL not in our database yet - could be external or not crawled
+                logger.debug(f"Target URL not found in database: {url}")
+            if not target_ids:
+                return 0
+            
+            # Existing links from this source, also in one query
+            existing_query = select(ExpressionLink.target_id).where(
+                and_(
+                    ExpressionLink.source_id == source_expression_id,
+                    ExpressionLink.target_id.in_(set(target_ids.values()))
+                )
+            )
+            existing_result = await self.db.execute(existing_query)
+            linked_ids = set(existing_result.scalars().all())
+            
+            created_count = 0
+            for url, target_id in target_ids.items():
+                if target_id in linked_ids:
+                    continue
+                linked_ids.add(target_id)
+                link_info = links_by_url[url]
+                # Create new expression link
+                expression_link = ExpressionLink(
+                    source_id=source_expression_id,
+                    target_id=target_id,
+                    anchor_text=link_info.anchor_text,
+                    link_type=link_info.link_type
+                )
+                self.db.add(expression_link)
+                created_count += 1
             
             await self.db.flush()
             return created_count
@@ -267,7 +290,9 @@ class MediaLinkExtractor:
                 logger.debug(f"Created {media_created} media records for expression {expression.id}")
             
             if link_list:
-                links_created = await self.create_expression_links(expression.id, link_list)
+                links_created = await self.create_expression_links(
+                    expression.id, link_list, land_id=expression.land_id
+                )
                 logger.debug(f"Created {links_created} expression links for expression {expression.id}")
             
             return media_created, links_created
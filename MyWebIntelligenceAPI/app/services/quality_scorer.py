@@ -33,6 +33,41 @@ WEIGHTS = {
     "integrity": 0.10
 }
 
+# Flags → libellé de la principale pénalité (ordre d'affichage dans reason)
+MAIN_ISSUES = (
+    (("http_error",), "erreur HTTP"),
+    (("short_content", "very_short_content"), "contenu trop court"),
+    (("wrong_language",), "langue incorrecte"),
+    (("low_relevance",), "faible pertinence"),
+    (("no_readable",), "extraction échouée"),
+)
+
+# Classes de content-type (colonne expressions.content_type_class)
+CONTENT_TYPE_OTHER = 0
+CONTENT_TYPE_HTML = 1
+CONTENT_TYPE_PDF = 2
+
+
+def classify_content_type(content_type: Optional[str]) -> Optional[int]:
+    """
+    Réduit un header Content-Type à sa classe entière.
+
+    Appelée une seule fois au crawl pour peupler content_type_class,
+    afin que le scoring n'ait plus à manipuler la chaîne.
+
+    Returns:
+        CONTENT_TYPE_HTML, CONTENT_TYPE_PDF, CONTENT_TYPE_OTHER,
+        ou None si le header est absent
+    """
+    if not content_type:
+        return None
+    content_type_lower = content_type.lower()
+    if "text/html" in content_type_lower:
+        return CONTENT_TYPE_HTML
+    if "application/pdf" in content_type_lower:
+        return CONTENT_TYPE_PDF
+    return CONTENT_TYPE_OTHER
+
 
 class QualityResult(TypedDict):
     """Résultat du calcul de qualité."""
@@ -74,7 +109,8 @@ class QualityScorer:
     def compute_quality_score(
         self,
         expression: 'models.Expression',
-        land: 'models.Land'
+        land: 'models.Land',
+        include_reason: bool = True
     ) -> QualityResult:
         """
         Calcule quality_score complet pour une expression.
@@ -82,6 +118,8 @@ class QualityScorer:
         Args:
             expression: Expression ORM object (can be a mock with dict attributes)
             land: Land parent ORM object (can be a mock with dict attributes)
+            include_reason: False pour les appels en masse qui n'utilisent que
+                score/category (reason vaut alors "")
 
         Returns:
             QualityResult avec score 0-1, catégorie, flags, raison
@@ -100,7 +138,7 @@ class QualityScorer:
                 "score": 0.0,
                 "category": "Très faible",
                 "flags": all_flags,
-                "reason": f"Accès impossible: {', '.join(all_flags)}",
+                "reason": f"Accès impossible: {', '.join(all_flags)}" if include_reason else "",
                 "details": details
             }
 
@@ -149,23 +187,19 @@ class QualityScorer:
             category = "Très faible"
 
         # Générer raison textuelle
-        if final_score >= 0.8:
+        if not include_reason:
+            reason = ""
+        elif final_score >= 0.8:
             reason = f"Haute qualité ({final_score:.2f}): contenu riche et complet"
         elif final_score >= 0.6:
             reason = f"Qualité acceptable ({final_score:.2f}): contenu standard"
         else:
             # Identifier principale pénalité
-            main_issues = []
-            if "http_error" in all_flags:
-                main_issues.append("erreur HTTP")
-            if "short_content" in all_flags or "very_short_content" in all_flags:
-                main_issues.append("contenu trop court")
-            if "wrong_language" in all_flags:
-                main_issues.append("langue incorrecte")
-            if "low_relevance" in all_flags:
-                main_issues.append("faible pertinence")
-            if "no_readable" in all_flags:
-                main_issues.append("extraction échouée")
+            flag_set = set(all_flags)
+            main_issues = [
+                label for issue_flags, label in MAIN_ISSUES
+                if not flag_set.isdisjoint(issue_flags)
+            ]
 
             reason = f"Qualité {category.lower()} ({final_score:.2f}): {', '.join(main_issues or all_flags[:2])}"
 
@@ -218,17 +252,17 @@ class QualityScorer:
             return score, flags  # Bloquant
 
         # Content-Type (critère bloquant pour PDF)
-        content_type = getattr(expression, 'content_type', None)
-        if content_type:
-            content_type_lower = content_type.lower()
-            if "text/html" in content_type_lower:
-                pass  # OK, pas de pénalité
-            elif "application/pdf" in content_type_lower:
-                flags.append("non_html_pdf")
-                return 0.0, flags  # Bloquant
-            else:
-                flags.append("non_html")
-                score *= 0.3  # Grosse pénalité mais pas bloquant
+        # content_type_class est calculé au crawl ; fallback sur la chaîne
+        # brute pour les lignes antérieures à la colonne
+        content_type_class = getattr(expression, 'content_type_class', None)
+        if content_type_class is None:
+            content_type_class = classify_content_type(getattr(expression, 'content_type', None))
+        if content_type_class == CONTENT_TYPE_PDF:
+            flags.append("non_html_pdf")
+            return 0.0, flags  # Bloquant
+        elif content_type_class == CONTENT_TYPE_OTHER:
+            flags.append("non_html")
+            score *= 0.3  # Grosse pénalité mais pas bloquant
 
         # Contenu crawlé (vérifie que crawled_at existe)
         crawled_at = getattr(expression, 'crawled_at', None)
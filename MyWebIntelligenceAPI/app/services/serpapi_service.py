@@ -3,23 +3,324 @@ SerpAPI integration helpers migrated from the legacy crawler core.
 """
 from __future__ import annotations
 
+import asyncio
 import calendar
+import json
+import multiprocessing
 import random
 import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta
-from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 from urllib.parse import parse_qs, urlparse
 
+import aiohttp
+import httpx
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
 
 from app.config import settings
 
+try:
+    import ijson
+
+    IJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+    IJSON_AVAILABLE = False
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:  # pragma: no cover - optional dependency
+    _json_loads = json.loads
+    _JSONDecodeError = ValueError
+
+try:
+    import h2  # noqa: F401  # httpx[http2]
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    HTTP2_AVAILABLE = False
+
 
 class SerpApiError(Exception):
     """Raised when a SerpAPI request or response fails."""
 
 
+class SerpEntry(NamedTuple):
+    """One organic SerpAPI result."""
+
+    position: Optional[int]
+    title: Optional[str]
+    link: Optional[str]
+    date: Optional[str]
+
+
+def _build_serpapi_session() -> requests.Session:
+    """Pooled session reused by every blocking SerpAPI request (keep-alive, retries)."""
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+        raise_on_status=False,
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries))
+    # brotli is not a dependency, so "br" is not advertised
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    return session
+
+
+_SESSION = _build_serpapi_session()
+
+# parse_serp_result_date patterns, compiled once. None of them nests or
+# overlaps quantifiers, so matching stays linear in the input on stdlib re;
+# _MAX_DATE_LENGTH bounds that input.
+_RE_PREFIX = re.compile(r"^(updated|publié[e]?)[:\s-]+", re.IGNORECASE)
+_RE_WS = re.compile(r"\s+")
+_RE_ABBR_DOT = re.compile(r"\b([A-Za-z]{3,9})\.", re.IGNORECASE)
+_RE_ORDINAL = re.compile(r"(?<=\d)(st|nd|rd|th)", re.IGNORECASE)
+_RE_RELATIVE = re.compile(
+    r"^(?:about\s+)?(\d+)\s+(minute|hour|day|week|month|year)s?\s+ago$", re.IGNORECASE
+)
+
+# Pagination offset in a SerpAPI next_link (google/duckduckgo: start, bing: first)
+_RE_START = re.compile(r"[?&](?:start|first|offset)=(\d+)")
+
+# Longer "date" values are page text leaking into the field, never a date
+_MAX_DATE_LENGTH = 100
+
+# strptime candidates by date shape, so a value only meets the formats it can match
+_NUMERIC_DATE_FORMATS = {
+    "-": ("%Y-%m-%d",),
+    "/": ("%Y/%m/%d", "%m/%d/%Y", "%d/%m/%Y"),
+    ".": ("%Y.%m.%d", "%d.%m.%Y", "%m.%d.%Y"),
+}
+_DAY_FIRST_TEXT_FORMATS = ("%d %b %Y", "%d %B %Y")
+_MONTH_FIRST_TEXT_FORMATS = ("%b %d, %Y", "%B %d, %Y")
+
+
+@dataclass
+class SerpCacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+
+
+class _StaleEntry(NamedTuple):
+    payload: Dict
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class _SerpCache:
+    """
+    LRU + TTL cache of decoded SerpAPI payloads.
+
+    Keys are the normalized request params without ``api_key``, so repeated
+    crawls of the same (query, engine, lang, window, offset) do not re-hit the
+    paid API. Shared by the blocking and async variants.
+
+    Entries that came with an ``ETag`` or ``Last-Modified`` header outlive
+    their TTL (until LRU eviction) so they can be revalidated with a
+    conditional request; the others are dropped on expiry.
+    """
+
+    def __init__(self, maxsize: int = 1000, default_ttl: float = 600.0):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self.stats = SerpCacheStats()
+        self._entries: "OrderedDict[Tuple, Tuple[float, _StaleEntry]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(params: Dict[str, Union[str, int]]) -> Tuple:
+        return tuple(sorted((k, str(v)) for k, v in params.items() if k != "api_key"))
+
+    def get(self, key: Tuple) -> Optional[Dict]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.stats.misses += 1
+                return None
+            expires_at, entry = item
+            if expires_at < time.monotonic():
+                if entry.etag is None and entry.last_modified is None:
+                    del self._entries[key]
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry.payload
+
+    def stale(self, key: Tuple) -> Optional[_StaleEntry]:
+        """Return the entry to revalidate, if it carries validators."""
+        with self._lock:
+            item = self._entries.get(key)
+        if item is None or (item[1].etag is None and item[1].last_modified is None):
+            return None
+        return item[1]
+
+    def set(
+        self,
+        key: Tuple,
+        payload: Dict,
+        ttl: Optional[float] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, _StaleEntry(payload, etag, last_modified))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def store_response(
+        self,
+        key: Tuple,
+        status: int,
+        headers,
+        payload: Optional[Dict],
+        stale: Optional[_StaleEntry],
+    ) -> Dict:
+        """
+        Cache a fetched page and return the payload to use.
+
+        A 304 reuses the revalidated entry; missing validators fall back to
+        the stale ones so the next revalidation still works.
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if status == 304 and stale is not None:
+            self.stats.revalidated += 1
+            payload = stale.payload
+            etag = etag or stale.etag
+            last_modified = last_modified or stale.last_modified
+        if "error" not in payload:
+            self.set(key, payload, etag=etag, last_modified=last_modified)
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.stats = SerpCacheStats()
+
+
+_CACHE = _SerpCache(
+    maxsize=getattr(settings, "SERPAPI_CACHE_MAXSIZE", 1000),
+    default_ttl=getattr(settings, "SERPAPI_CACHE_TTL", 600),
+)
+
+
+def clear_cache() -> None:
+    """Drop every cached SerpAPI payload and reset the hit/miss counters."""
+    _CACHE.clear()
+
+
+def cache_stats() -> SerpCacheStats:
+    """Return the SerpAPI response cache hit/miss/revalidation counters."""
+    return _CACHE.stats
+
+
+def _conditional_headers(stale: Optional[_StaleEntry]) -> Optional[Dict[str, str]]:
+    """If-None-Match / If-Modified-Since for a stale cache entry."""
+    if stale is None:
+        return None
+    headers = {}
+    if stale.etag:
+        headers["If-None-Match"] = stale.etag
+    if stale.last_modified:
+        headers["If-Modified-Since"] = stale.last_modified
+    return headers
+
+
+class _RateLimiter:
+    """
+    Per-endpoint pacing derived from SerpAPI rate-limit headers.
+
+    Each response's ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset`` spread
+    the remaining quota over the time left before the reset, and requests are
+    spaced by that interval. Endpoints that never sent the headers keep the
+    caller's jittered sleep.
+    """
+
+    def __init__(self):
+        self._intervals: Dict[str, float] = {}
+        self._next_slots: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def tracks(self, endpoint: str) -> bool:
+        return endpoint in self._intervals
+
+    def update(self, endpoint: str, headers) -> None:
+        remaining = _header_float(headers, "X-RateLimit-Remaining")
+        reset = _header_float(headers, "X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        if reset > 1e9:  # epoch timestamp rather than seconds until reset
+            reset -= time.time()
+        interval = max(0.0, reset) / max(remaining, 1.0)
+        with self._lock:
+            self._intervals[endpoint] = interval
+            self._next_slots[endpoint] = max(self._next_slots.get(endpoint, 0.0), time.monotonic() + interval)
+
+    def reserve(self, endpoint: str) -> float:
+        """Claim the next request slot and return how long to wait for it."""
+        with self._lock:
+            interval = self._intervals.get(endpoint)
+            if interval is None:
+                return 0.0
+            now = time.monotonic()
+            next_slot = self._next_slots.get(endpoint, now)
+            self._next_slots[endpoint] = max(now, next_slot) + interval
+            return max(0.0, next_slot - now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._intervals.clear()
+            self._next_slots.clear()
+
+
+_RATE_LIMITER = _RateLimiter()
+
+# Async path retries (the blocking session relies on urllib3's Retry)
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_RETRIES = 3
+_BACKOFF_MIN, _BACKOFF_MAX = 1.0, 30.0
+
+
+def _header_float(headers, name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_backoff(headers, attempt: int) -> float:
+    retry_after = _header_float(headers, "Retry-After")
+    if retry_after is not None:
+        return min(_BACKOFF_MAX, max(0.0, retry_after))
+    return min(_BACKOFF_MAX, max(_BACKOFF_MIN, 2.0 ** attempt))
+
+
 def fetch_serpapi_url_list(
     api_key: str,
     query: str,
@@ -30,10 +331,410 @@ def fetch_serpapi_url_list(
     timestep: str = "week",
     sleep_seconds: float = 1.0,
     progress_hook: Optional[Callable[[Optional[date], Optional[date], int], None]] = None,
-) -> List[Dict[str, Optional[Union[str, int]]]]:
+) -> List[SerpEntry]:
     """
     Query SerpAPI for organic results and return URL metadata.
+
+    Blocking variant, kept for callers running outside an event loop.
+    Async callers should use ``fetch_serpapi_url_list_async``.
+    """
+    return list(
+        iter_serpapi_url_list(
+            api_key,
+            query,
+            engine=engine,
+            lang=lang,
+            datestart=datestart,
+            dateend=dateend,
+            timestep=timestep,
+            sleep_seconds=sleep_seconds,
+            progress_hook=progress_hook,
+        )
+    )
+
+
+def iter_serpapi_url_list(
+    api_key: str,
+    query: str,
+    engine: str = "google",
+    lang: str = "fr",
+    datestart: Optional[str] = None,
+    dateend: Optional[str] = None,
+    timestep: str = "week",
+    sleep_seconds: float = 1.0,
+    progress_hook: Optional[Callable[[Optional[date], Optional[date], int], None]] = None,
+) -> Iterator[SerpEntry]:
+    """
+    Yield organic results page by page as they are fetched.
+
+    Lets callers persist results in batches while the crawl is still
+    running instead of holding the whole result set in memory. Arguments
+    are validated eagerly, before the first request.
     """
+    prepared = _prepare_serpapi_crawl(query, engine, lang, datestart, dateend, timestep)
+    return _iter_serpapi_pages(api_key, prepared, sleep_seconds, progress_hook)
+
+
+def _iter_serpapi_pages(
+    api_key: str,
+    prepared: Tuple[str, str, str, List[Tuple[Optional[date], Optional[date]]]],
+    sleep_seconds: float,
+    progress_hook: Optional[Callable[[Optional[date], Optional[date], int], None]],
+) -> Iterator[SerpEntry]:
+    normalized_query, engine, lang, date_windows = prepared
+
+    base_url = getattr(settings, "SERPAPI_BASE_URL", "https://serpapi.com/search")
+    timeout = getattr(settings, "SERPAPI_TIMEOUT", 15)
+    base_params = _build_serpapi_base_params(
+        api_key, normalized_query, engine, lang, _serpapi_page_size(engine)
+    )
+
+    for window_start, window_end in date_windows:
+        window_params = _build_serpapi_window_params(base_params, engine, window_start, window_end)
+        start_index = 0
+        window_count = 0
+        while True:
+            params = {**window_params, **_serpapi_paginator_params(engine, start_index)}
+
+            cache_key = _CACHE.key_for(params)
+            payload = _CACHE.get(cache_key)
+            if payload is None:
+                stale = _CACHE.stale(cache_key)
+                wait = _RATE_LIMITER.reserve(base_url)
+                if wait > 0:
+                    time.sleep(wait)
+                try:
+                    with _SESSION.get(
+                        base_url,
+                        params=params,
+                        headers=_conditional_headers(stale),
+                        timeout=timeout,
+                        stream=True,
+                    ) as response:
+                        _RATE_LIMITER.update(base_url, response.headers)
+                        status = response.status_code
+                        fresh = None if status == 304 and stale else _read_serpapi_response(response)
+                        payload = _CACHE.store_response(cache_key, status, response.headers, fresh, stale)
+                except (requests.RequestException, Urllib3HTTPError) as exc:
+                    raise SerpApiError(f"HTTP error during SerpAPI request: {exc}") from exc
+
+            organic_results = _serpapi_organic_results(payload, engine)
+            if not organic_results:
+                break
+
+            yield from _serpapi_entries(organic_results)
+            window_count += len(organic_results)
+
+            has_next_page, next_index = _serpapi_next_index(payload, start_index)
+            if not has_next_page:
+                break
+
+            if next_index is not None:
+                start_index = next_index
+                continue
+
+            start_index += len(organic_results)
+
+            if not _RATE_LIMITER.tracks(base_url):
+                effective_sleep = _serpapi_jitter(sleep_seconds)
+                if effective_sleep > 0:
+                    time.sleep(effective_sleep)
+
+        if progress_hook:
+            progress_hook(window_start, window_end, window_count)
+
+
+async def fetch_serpapi_url_list_async(
+    api_key: str,
+    query: str,
+    engine: str = "google",
+    lang: str = "fr",
+    datestart: Optional[str] = None,
+    dateend: Optional[str] = None,
+    timestep: str = "week",
+    sleep_seconds: float = 1.0,
+    progress_hook: Optional[Callable[[Optional[date], Optional[date], int], None]] = None,
+    concurrency: Optional[int] = None,
+) -> List[SerpEntry]:
+    """
+    Async variant of ``fetch_serpapi_url_list``.
+
+    Date windows are fetched concurrently over a shared aiohttp session, with
+    at most ``concurrency`` SerpAPI requests in flight. Pages within a window
+    stay sequential since each offset comes from the previous response.
+    Results keep the window order of the blocking variant.
+    """
+    prepared = _prepare_serpapi_crawl(query, engine, lang, datestart, dateend, timestep)
+    if concurrency is None:
+        concurrency = getattr(settings, "SERPAPI_CONCURRENCY", 10)
+    semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+
+    async with _open_serpapi_session() as session:
+        return await _fetch_serpapi_query_async(
+            session, semaphore, None, api_key, prepared, sleep_seconds, progress_hook
+        )
+
+
+async def fetch_serpapi_batch(
+    api_key: str,
+    queries: Sequence[str],
+    engine: str = "google",
+    lang: str = "fr",
+    datestart: Optional[str] = None,
+    dateend: Optional[str] = None,
+    timestep: str = "week",
+    sleep_seconds: float = 1.0,
+    concurrency: Optional[int] = None,
+    requests_per_second: Optional[float] = None,
+) -> Dict[str, Union[List[SerpEntry], SerpApiError]]:
+    """
+    Fetch several queries in parallel and return their results keyed by query.
+
+    All queries share one aiohttp session, the ``concurrency`` bound and a
+    request rate limit (``SERPAPI_RPS`` by default) so the account quota is
+    respected however many queries are submitted. A failing query does not
+    cancel the others: its entry holds the ``SerpApiError`` instead of a list.
+    """
+    unique_queries = list(dict.fromkeys(queries))
+    if concurrency is None:
+        concurrency = getattr(settings, "SERPAPI_CONCURRENCY", 10)
+    if requests_per_second is None:
+        requests_per_second = getattr(settings, "SERPAPI_RPS", 5.0)
+    semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+    rate_limiter = _AsyncRateLimiter(requests_per_second)
+
+    async def _run(query: str) -> List[SerpEntry]:
+        prepared = _prepare_serpapi_crawl(query, engine, lang, datestart, dateend, timestep)
+        return await _fetch_serpapi_query_async(
+            session, semaphore, rate_limiter, api_key, prepared, sleep_seconds, None
+        )
+
+    async with _open_serpapi_session() as session:
+        outcomes = await asyncio.gather(*(_run(query) for query in unique_queries), return_exceptions=True)
+
+    results: Dict[str, Union[List[SerpEntry], SerpApiError]] = {}
+    for query, outcome in zip(unique_queries, outcomes):
+        if isinstance(outcome, SerpApiError):
+            results[query] = outcome
+        elif isinstance(outcome, Exception):
+            results[query] = SerpApiError(f"SerpAPI batch query failed: {outcome}")
+        else:
+            results[query] = outcome
+    return results
+
+
+class _AsyncRateLimiter:
+    """Spaces request starts so that at most ``rate`` requests begin per second."""
+
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class _Http2Response:
+    """The slice of ``aiohttp.ClientResponse`` the SerpAPI readers use, over httpx."""
+
+    def __init__(self, response: httpx.Response):
+        self.status = response.status_code
+        self.headers = response.headers
+        self.content = self
+        self._response = response
+        self._chunks = response.aiter_bytes()
+        self._buffer = b""
+
+    async def read(self, n: int = -1) -> bytes:
+        if n < 0:
+            return await self._response.aread()
+        while len(self._buffer) < n:
+            chunk = await anext(self._chunks, b"")
+            if not chunk:
+                break
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:n], self._buffer[n:]
+        return data
+
+
+class _Http2Session:
+    """
+    aiohttp-shaped facade over an HTTP/2 ``httpx.AsyncClient``.
+
+    Concurrent windows then share one multiplexed TLS connection to SerpAPI
+    instead of queueing on a pool of HTTP/1.1 keep-alive connections.
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self._client = client
+
+    @asynccontextmanager
+    async def get(self, url: str, params=None, headers=None):
+        async with self._client.stream("GET", url, params=params, headers=headers) as response:
+            yield _Http2Response(response)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+        return False
+
+
+def _open_serpapi_session() -> Union[aiohttp.ClientSession, _Http2Session]:
+    timeout = getattr(settings, "SERPAPI_TIMEOUT", 15)
+    if HTTP2_AVAILABLE and getattr(settings, "SERPAPI_HTTP2", False):
+        return _Http2Session(
+            httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+                timeout=timeout,
+            )
+        )
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=64, limit_per_host=8),
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    )
+
+
+async def _fetch_serpapi_query_async(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    rate_limiter: Optional[_AsyncRateLimiter],
+    api_key: str,
+    prepared: Tuple[str, str, str, List[Tuple[Optional[date], Optional[date]]]],
+    sleep_seconds: float,
+    progress_hook: Optional[Callable[[Optional[date], Optional[date], int], None]],
+) -> List[SerpEntry]:
+    normalized_query, engine, lang, date_windows = prepared
+    base_url = getattr(settings, "SERPAPI_BASE_URL", "https://serpapi.com/search")
+    base_params = _build_serpapi_base_params(
+        api_key, normalized_query, engine, lang, _serpapi_page_size(engine)
+    )
+
+    per_window = await asyncio.gather(
+        *(
+            _fetch_serpapi_window_async(
+                session,
+                semaphore,
+                rate_limiter,
+                base_url,
+                _build_serpapi_window_params(base_params, engine, window_start, window_end),
+                engine,
+                window_start,
+                window_end,
+                sleep_seconds,
+                progress_hook,
+            )
+            for window_start, window_end in date_windows
+        )
+    )
+
+    aggregated: List[SerpEntry] = []
+    for window_results in per_window:
+        aggregated.extend(window_results)
+    return aggregated
+
+
+async def _fetch_serpapi_window_async(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    rate_limiter: Optional[_AsyncRateLimiter],
+    base_url: str,
+    window_params: Dict[str, Union[str, int]],
+    engine: str,
+    window_start: Optional[date],
+    window_end: Optional[date],
+    sleep_seconds: float,
+    progress_hook: Optional[Callable[[Optional[date], Optional[date], int], None]],
+) -> List[SerpEntry]:
+    results: List[SerpEntry] = []
+    start_index = 0
+    while True:
+        params = {**window_params, **_serpapi_paginator_params(engine, start_index)}
+
+        cache_key = _CACHE.key_for(params)
+        payload = _CACHE.get(cache_key)
+        if payload is None:
+            payload = await _get_serpapi_payload_async(
+                session, semaphore, rate_limiter, base_url, params, cache_key
+            )
+
+        organic_results = _serpapi_organic_results(payload, engine)
+        if not organic_results:
+            break
+
+        results.extend(_serpapi_entries(organic_results))
+
+        has_next_page, next_index = _serpapi_next_index(payload, start_index)
+        if not has_next_page:
+            break
+
+        if next_index is not None:
+            start_index = next_index
+            continue
+
+        start_index += len(organic_results)
+
+        if not _RATE_LIMITER.tracks(base_url):
+            effective_sleep = _serpapi_jitter(sleep_seconds)
+            if effective_sleep > 0:
+                await asyncio.sleep(effective_sleep)
+
+    if progress_hook:
+        progress_hook(window_start, window_end, len(results))
+
+    return results
+
+
+async def _get_serpapi_payload_async(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    rate_limiter: Optional[_AsyncRateLimiter],
+    base_url: str,
+    params: Dict[str, Union[str, int]],
+    cache_key: Tuple,
+) -> Dict:
+    """One SerpAPI page, paced by the header limiter and retried with backoff on 429/5xx."""
+    stale = _CACHE.stale(cache_key)
+    headers = _conditional_headers(stale)
+    for attempt in range(_MAX_RETRIES + 1):
+        async with semaphore:
+            wait = _RATE_LIMITER.reserve(base_url)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            try:
+                async with session.get(base_url, params=params, headers=headers) as response:
+                    _RATE_LIMITER.update(base_url, response.headers)
+                    status = response.status
+                    if status not in _RETRY_STATUSES or attempt == _MAX_RETRIES:
+                        fresh = None if status == 304 and stale else await _read_serpapi_response_async(response)
+                        return _CACHE.store_response(cache_key, status, response.headers, fresh, stale)
+                    backoff = _retry_backoff(response.headers, attempt)
+            except (aiohttp.ClientError, httpx.HTTPError, asyncio.TimeoutError) as exc:
+                raise SerpApiError(f"HTTP error during SerpAPI request: {exc}") from exc
+        await asyncio.sleep(backoff)
+
+
+def _prepare_serpapi_crawl(
+    query: str,
+    engine: str,
+    lang: str,
+    datestart: Optional[str],
+    dateend: Optional[str],
+    timestep: str,
+) -> Tuple[str, str, str, List[Tuple[Optional[date], Optional[date]]]]:
+    """Validate crawl arguments and return (query, engine, lang, date_windows)."""
     normalized_query = (query or "").strip()
     if not normalized_query:
         raise SerpApiError("Query must be a non-empty string")
@@ -67,124 +768,186 @@ def fetch_serpapi_url_list(
     if not date_windows:
         date_windows = [(normalized_start, normalized_end)]
 
-    aggregated: List[Dict[str, Optional[Union[str, int]]]] = []
+    return normalized_query, engine, lang, date_windows
 
-    base_url = getattr(settings, "SERPAPI_BASE_URL", "https://serpapi.com/search")
-    timeout = getattr(settings, "SERPAPI_TIMEOUT", 15)
-    jitter_floor, jitter_ceil = 0.8, 1.2
-    page_size = _serpapi_page_size(engine)
 
-    for window_start, window_end in date_windows:
-        start_index = 0
-        window_count = 0
-        while True:
-            params: Dict[str, Union[str, int]] = {
-                "api_key": api_key,
-                "engine": engine,
-                "q": normalized_query,
-            }
-            params.update(
-                _build_serpapi_params(
-                    engine,
-                    lang,
-                    start_index,
-                    page_size,
-                    window_start=window_start,
-                    window_end=window_end,
-                    use_date_filter=bool(window_start and window_end),
-                )
-            )
+def _decode_serpapi_response(status_code: int, body: bytes) -> Dict:
+    if status_code != 200:
+        snippet = body[:200].decode("utf-8", errors="replace")
+        raise SerpApiError(f"SerpAPI request failed with status {status_code}: {snippet}")
 
-            if engine == "google" and window_start and window_end:
-                params["tbs"] = _build_serpapi_tbs(window_start, window_end)
+    try:
+        return _json_loads(body)
+    except _JSONDecodeError as exc:
+        raise SerpApiError("Invalid JSON payload returned by SerpAPI") from exc
 
-            try:
-                response = requests.get(base_url, params=params, timeout=timeout)
-            except requests.RequestException as exc:
-                raise SerpApiError(f"HTTP error during SerpAPI request: {exc}") from exc
 
-            if response.status_code != 200:
-                snippet = response.text[:200]
-                raise SerpApiError(f"SerpAPI request failed with status {response.status_code}: {snippet}")
+def _read_serpapi_response(response: requests.Response) -> Dict:
+    """Stream the needed parts of a SerpAPI response (full parse on errors or without ijson)."""
+    if response.status_code != 200 or not IJSON_AVAILABLE:
+        return _decode_serpapi_response(response.status_code, response.content)
 
-            try:
-                payload = response.json()
-            except ValueError as exc:
-                raise SerpApiError("Invalid JSON payload returned by SerpAPI") from exc
-
-            if "error" in payload:
-                message = str(payload.get("error", "")).strip()
-                lowered = message.lower()
-                if engine == "duckduckgo" and "hasn't returned any results" in lowered:
-                    break
-                raise SerpApiError(f"SerpAPI error: {message}")
-
-            organic_results = payload.get("organic_results") or []
-            if not organic_results:
-                break
+    response.raw.decode_content = True
+    builder = _SerpPayloadBuilder()
+    try:
+        for prefix, event, value in ijson.parse(response.raw, use_float=True):
+            builder.event(prefix, event, value)
+    except ijson.JSONError as exc:
+        raise SerpApiError("Invalid JSON payload returned by SerpAPI") from exc
+    return builder.payload
 
-            for entry in organic_results:
-                aggregated.append(
-                    {
-                        "position": entry.get("position"),
-                        "title": entry.get("title"),
-                        "link": entry.get("link"),
-                        "date": entry.get("date"),
-                    }
-                )
-                window_count += 1
-
-            serp_pagination = payload.get("serpapi_pagination") or {}
-            next_link = serp_pagination.get("next_link") or serp_pagination.get("next")
-            has_next_page = bool(next_link)
 
-            if not has_next_page:
-                break
+async def _read_serpapi_response_async(response: aiohttp.ClientResponse) -> Dict:
+    if response.status != 200 or not IJSON_AVAILABLE:
+        return _decode_serpapi_response(response.status, await response.read())
 
-            next_offset_raw = serp_pagination.get("next_offset")
-            next_index: Optional[int] = None
-            if next_offset_raw is not None:
-                try:
-                    next_index = int(next_offset_raw)
-                except (TypeError, ValueError):
-                    next_index = None
+    builder = _SerpPayloadBuilder()
+    try:
+        async for prefix, event, value in ijson.parse_async(response.content, use_float=True):
+            builder.event(prefix, event, value)
+    except ijson.JSONError as exc:
+        raise SerpApiError("Invalid JSON payload returned by SerpAPI") from exc
+    return builder.payload
 
-            if next_index is None and isinstance(next_link, str):
-                try:
-                    parsed = urlparse(next_link)
-                    query_params = parse_qs(parsed.query)
-                except Exception:
-                    query_params = {}
-
-                for key in ("start", "first", "offset"):
-                    values = query_params.get(key)
-                    if not values:
-                        continue
-                    try:
-                        candidate = int(values[0])
-                    except (TypeError, ValueError):
-                        continue
-                    if candidate > start_index:
-                        next_index = candidate
-                        break
-
-            if next_index is not None and next_index > start_index:
-                start_index = next_index
-                continue
 
-            increment = len(organic_results)
-            if increment <= 0:
-                break
-            start_index += increment
+class _SerpPayloadBuilder:
+    """
+    Rebuild the subset of a SerpAPI payload the crawler reads from ijson events.
 
-            effective_sleep = max(0.0, float(sleep_seconds)) * random.uniform(jitter_floor, jitter_ceil)
-            if effective_sleep > 0:
-                time.sleep(effective_sleep)
+    Organic results keep only the ``SerpEntry`` fields and
+    only the top-level keys in ``STREAMED_KEYS`` are materialized; snippets,
+    thumbnails, ads or related searches are dropped as they stream by.
+    """
 
-        if progress_hook:
-            progress_hook(window_start, window_end, window_count)
+    STREAMED_KEYS = frozenset({"error", "serpapi_pagination", "search_information"})
+    ENTRY_FIELDS = frozenset(SerpEntry._fields)
+    _ENTRY_PREFIX = "organic_results.item"
+    _FIELD_OFFSET = len(_ENTRY_PREFIX) + 1
+    _CONTAINER_EVENTS = frozenset({"start_map", "end_map", "start_array", "end_array", "map_key"})
+
+    def __init__(self):
+        self.payload: Dict = {}
+        self._organic: Optional[List[Dict]] = None
+        self._entry: Optional[Dict] = None
+        self._key: Optional[str] = None
+        self._builder = None
+
+    def event(self, prefix: str, event: str, value) -> None:
+        if self._builder is not None:
+            self._builder.event(event, value)
+            if prefix == self._key and event in ("end_map", "end_array"):
+                self.payload[self._key] = self._builder.value
+                self._builder = None
+            return
+
+        if prefix == self._ENTRY_PREFIX:
+            if event == "start_map":
+                self._entry = {}
+            elif event == "end_map" and self._entry is not None:
+                self._organic.append(self._entry)
+                self._entry = None
+            return
+
+        if self._entry is not None:
+            if event not in self._CONTAINER_EVENTS:
+                field = prefix[self._FIELD_OFFSET:]
+                if field in self.ENTRY_FIELDS:
+                    self._entry[field] = value
+            return
+
+        if prefix == "organic_results":
+            if event == "start_array":
+                self._organic = self.payload["organic_results"] = []
+            return
+
+        if prefix in self.STREAMED_KEYS:
+            if event in ("start_map", "start_array"):
+                self._key = prefix
+                self._builder = ijson.ObjectBuilder()
+                self._builder.event(event, value)
+            elif event != "map_key":
+                self.payload[prefix] = value
+
+
+def _serpapi_organic_results(payload: Dict, engine: str) -> List[Dict]:
+    """Return the page's organic results; empty when the window is exhausted."""
+    if "error" in payload:
+        message = str(payload.get("error", "")).strip()
+        lowered = message.lower()
+        if engine == "duckduckgo" and "hasn't returned any results" in lowered:
+            return []
+        raise SerpApiError(f"SerpAPI error: {message}")
+
+    return payload.get("organic_results") or []
+
+
+def _serpapi_entries(organic_results: List[Dict]) -> List[SerpEntry]:
+    """Convert one page of organic results; locals keep the per-entry loop lean."""
+    entries: List[SerpEntry] = []
+    append = entries.append
+    make = SerpEntry
+    for entry in organic_results:
+        get = entry.get
+        append(make(get("position"), get("title"), get("link"), get("date")))
+    return entries
+
+
+def _serpapi_next_index(payload: Dict, start_index: int) -> Tuple[bool, Optional[int]]:
+    """
+    Return (has_next_page, next_index) from the SerpAPI pagination block.
 
-    return aggregated
+    ``next_index`` is None when the offset is not advertised and the caller
+    must advance by the number of results received.
+    """
+    serp_pagination = payload.get("serpapi_pagination") or {}
+    next_link = serp_pagination.get("next_link") or serp_pagination.get("next")
+    if not next_link:
+        return False, None
+
+    next_offset_raw = serp_pagination.get("next_offset")
+    next_index: Optional[int] = None
+    if next_offset_raw is not None:
+        try:
+            next_index = int(next_offset_raw)
+        except (TypeError, ValueError):
+            next_index = None
+
+    if next_index is None and isinstance(next_link, str):
+        next_index = _next_index_from_link(next_link, start_index)
+
+    if next_index is not None and next_index > start_index:
+        return True, next_index
+    return True, None
+
+
+def _next_index_from_link(next_link: str, start_index: int) -> Optional[int]:
+    """Read the start/first/offset value of a next_link greater than ``start_index``."""
+    matches = _RE_START.findall(next_link)
+    if matches:
+        for value in matches:
+            if int(value) > start_index:
+                return int(value)
+        return None
+
+    # No plain key=digits pair (e.g. percent-encoded values): full parse
+    try:
+        query_params = parse_qs(urlparse(next_link).query)
+    except ValueError:
+        return None
+
+    for key in ("start", "first", "offset"):
+        for value in query_params.get(key, ()):
+            try:
+                candidate = int(value)
+            except ValueError:
+                continue
+            if candidate > start_index:
+                return candidate
+    return None
+
+
+def _serpapi_jitter(sleep_seconds: float) -> float:
+    return max(0.0, float(sleep_seconds)) * random.uniform(0.8, 1.2)
 
 
 def parse_serp_result_date(value: Optional[str]) -> Optional[datetime]:
@@ -195,15 +958,17 @@ def parse_serp_result_date(value: Optional[str]) -> Optional[datetime]:
         return None
 
     normalized = value.strip()
-    if not normalized:
+    if not normalized or len(normalized) > _MAX_DATE_LENGTH:
         return None
 
-    normalized = re.sub(r"(?i)^(updated|publié[e]?)[:\s-]+", "", normalized)
+    normalized = _RE_PREFIX.sub("", normalized)
     normalized = normalized.replace("·", " ")
     normalized = normalized.replace("\u2013", " ").replace("\u2014", " ")
-    normalized = re.sub(r"\s+", " ", normalized).strip(" .-")
-    normalized = re.sub(r"(?i)\b([A-Za-z]{3,9})\.", r"\1", normalized)
-    normalized = re.sub(r"(?<=\d)(st|nd|rd|th)", "", normalized, flags=re.IGNORECASE)
+    normalized = _RE_WS.sub(" ", normalized).strip(" .-")
+    normalized = _RE_ABBR_DOT.sub(r"\1", normalized)
+    normalized = _RE_ORDINAL.sub("", normalized)
+    if not normalized:
+        return None
 
     iso_candidate = normalized.replace("Z", "+00:00")
     try:
@@ -211,19 +976,7 @@ def parse_serp_result_date(value: Optional[str]) -> Optional[datetime]:
     except ValueError:
         pass
 
-    for fmt in (
-        "%Y-%m-%d",
-        "%Y/%m/%d",
-        "%Y.%m.%d",
-        "%m/%d/%Y",
-        "%d/%m/%Y",
-        "%d.%m.%Y",
-        "%m.%d.%Y",
-        "%b %d, %Y",
-        "%B %d, %Y",
-        "%d %b %Y",
-        "%d %B %Y",
-    ):
+    for fmt in _serp_date_formats(normalized):
         try:
             return datetime.strptime(normalized, fmt)
         except ValueError:
@@ -235,7 +988,7 @@ def parse_serp_result_date(value: Optional[str]) -> Optional[datetime]:
     if lowered == "yesterday":
         return datetime.now() - timedelta(days=1)
 
-    relative_match = re.match(r"(?i)^(?:about\\s+)?(\\d+)\\s+(minute|hour|day|week|month|year)s?\\s+ago$", normalized)
+    relative_match = _RE_RELATIVE.match(normalized)
     if relative_match:
         amount = int(relative_match.group(1))
         unit = relative_match.group(2).lower()
@@ -253,6 +1006,43 @@ def parse_serp_result_date(value: Optional[str]) -> Optional[datetime]:
     return None
 
 
+def _serp_date_formats(normalized: str) -> Tuple[str, ...]:
+    if not normalized[0].isdigit():
+        return _MONTH_FIRST_TEXT_FORMATS
+    for separator, formats in _NUMERIC_DATE_FORMATS.items():
+        if separator in normalized:
+            return formats
+    return _DAY_FIRST_TEXT_FORMATS
+
+
+# Below this many values the process pool start-up costs more than it saves
+_PARALLEL_PARSE_MIN = 10_000
+
+
+def parse_serp_result_dates(
+    values: Sequence[Optional[str]],
+    workers: Optional[int] = None,
+    chunksize: int = 1024,
+) -> List[Optional[datetime]]:
+    """
+    Parse many SerpAPI ``date`` fields, spreading large batches over processes.
+
+    Small batches, and calls from daemonic processes (Celery prefork workers
+    cannot fork children), are parsed in-process. Scripts using this on
+    platforms that spawn workers (Windows, macOS) must call it under an
+    ``if __name__ == "__main__":`` guard.
+    """
+    if (
+        len(values) < _PARALLEL_PARSE_MIN
+        or workers == 1
+        or multiprocessing.current_process().daemon
+    ):
+        return [parse_serp_result_date(value) for value in values]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(parse_serp_result_date, values, chunksize=chunksize))
+
+
 def prefer_earlier_datetime(
     current_value: Optional[datetime], candidate: Optional[datetime]
 ) -> Optional[datetime]:
@@ -272,48 +1062,61 @@ def _serpapi_page_size(engine: str) -> int:
     return 50
 
 
-def _build_serpapi_params(
+def _build_serpapi_base_params(
+    api_key: str,
+    query: str,
     engine: str,
     lang: str,
-    start_index: int,
     page_size: int,
-    window_start: Optional[date] = None,
-    window_end: Optional[date] = None,
-    use_date_filter: bool = False,
 ) -> Dict[str, Union[str, int]]:
-    normalized_lang = (lang or "fr").strip().lower() or "fr"
+    """Params that stay the same for every page and window of a crawl (``lang`` already normalized)."""
+    params: Dict[str, Union[str, int]] = {
+        "api_key": api_key,
+        "engine": engine,
+        "q": query,
+    }
 
     if engine == "google":
-        params: Dict[str, Union[str, int]] = {
-            "google_domain": _serpapi_google_domain(normalized_lang),
-            "gl": normalized_lang,
-            "hl": normalized_lang,
-            "lr": f"lang_{normalized_lang}",
-            "safe": "off",
-            "start": start_index,
-        }
-        if not use_date_filter:
-            params["num"] = page_size
-        return params
+        params.update(
+            {
+                "google_domain": _serpapi_google_domain(lang),
+                "gl": lang,
+                "hl": lang,
+                "lr": f"lang_{lang}",
+                "safe": "off",
+                # Google honours num together with tbs=cdr:1, so date windows
+                # also get full pages instead of the 10-result default
+                "num": page_size,
+            }
+        )
+    elif engine == "bing":
+        params.update({"mkt": _serpapi_bing_market(lang), "count": page_size})
+    elif engine == "duckduckgo":
+        params.update({"kl": _serpapi_duckduckgo_region(lang), "m": page_size})
+
+    return params
 
-    if engine == "bing":
-        return {
-            "mkt": _serpapi_bing_market(normalized_lang),
-            "count": page_size,
-            "first": start_index + 1,
-        }
 
+def _build_serpapi_window_params(
+    base_params: Dict[str, Union[str, int]],
+    engine: str,
+    window_start: Optional[date],
+    window_end: Optional[date],
+) -> Dict[str, Union[str, int]]:
+    """Overlay the date filter of one window on the crawl's base params."""
+    if not (window_start and window_end):
+        return base_params
+    if engine == "google":
+        return {**base_params, "tbs": _build_serpapi_tbs(window_start, window_end)}
     if engine == "duckduckgo":
-        params = {
-            "kl": _serpapi_duckduckgo_region(normalized_lang),
-            "start": start_index,
-            "m": page_size,
-        }
-        if window_start and window_end:
-            params["df"] = f"{window_start.isoformat()}..{window_end.isoformat()}"
-        return params
+        return {**base_params, "df": f"{window_start.isoformat()}..{window_end.isoformat()}"}
+    return base_params
+
 
-    return {}
+def _serpapi_paginator_params(engine: str, start_index: int) -> Dict[str, int]:
+    if engine == "bing":
+        return {"first": start_index + 1}
+    return {"start": start_index}
 
 
 def _build_serpapi_windows(datestart: Optional[str], dateend: Optional[str], timestep: str) -> Iterable[Tuple[date, date]]:
@@ -325,8 +1128,15 @@ def _build_serpapi_windows(datestart: Optional[str], dateend: Optional[str], tim
     if start_date > end_date:
         raise SerpApiError("datestart must be earlier than or equal to dateend")
 
-    current_start = start_date
     step = timestep.lower()
+    step_days = _UNIFORM_STEP_DAYS.get(step)
+    if step_days is not None:
+        last = np.datetime64(end_date, "D")
+        starts = np.arange(np.datetime64(start_date, "D"), last + 1, step_days, dtype="datetime64[D]")
+        ends = np.minimum(starts + (step_days - 1), last)
+        return list(zip(starts.astype(object), ends.astype(object)))
+
+    current_start = start_date
     windows: List[Tuple[date, date]] = []
 
     while current_start <= end_date:
@@ -338,6 +1148,9 @@ def _build_serpapi_windows(datestart: Optional[str], dateend: Optional[str], tim
     return windows
 
 
+_UNIFORM_STEP_DAYS = {"day": 1, "week": 7}
+
+
 def _advance_date(current: date, timestep: str) -> date:
     if timestep == "day":
         return current + timedelta(days=1)
@@ -362,20 +1175,20 @@ def _build_serpapi_tbs(start: date, end: date) -> str:
     return "cdr:1,cd_min:{},cd_max:{}".format(start.strftime("%m/%d/%Y"), end.strftime("%m/%d/%Y"))
 
 
+# Localisation per engine; ``lang`` is already lowercased by _prepare_serpapi_crawl
+_GOOGLE_DOMAINS = {"fr": "google.fr", "en": "google.com"}
+_BING_MARKETS = {"fr": "fr-FR", "en": "en-US"}
+_DDG_REGIONS = {"fr": "fr-fr", "en": "us-en"}
+_DEFAULT_DOMAIN, _DEFAULT_MARKET, _DEFAULT_REGION = "google.com", "en-US", "us-en"
+
+
 def _serpapi_google_domain(lang: str) -> str:
-    lang = lang.lower()
-    if lang == "fr":
-        return "google.fr"
-    if lang == "en":
-        return "google.com"
-    return "google.com"
+    return _GOOGLE_DOMAINS.get(lang, _DEFAULT_DOMAIN)
 
 
 def _serpapi_bing_market(lang: str) -> str:
-    mapping = {"fr": "fr-FR", "en": "en-US"}
-    return mapping.get(lang, "en-US")
+    return _BING_MARKETS.get(lang, _DEFAULT_MARKET)
 
 
 def _serpapi_duckduckgo_region(lang: str) -> str:
-    mapping = {"fr": "fr-fr", "en": "us-en"}
-    return mapping.get(lang, "us-en")
+    return _DDG_REGIONS.get(lang, _DEFAULT_REGION)
@@ -2,28 +2,123 @@
 Service pour le traitement et l'extraction de texte
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import math
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from operator import attrgetter
+
+import numpy as np
+from typing import List, Dict, Any, Optional, AsyncIterator, NamedTuple, Tuple, Union
+from sqlalchemy import Float, Integer, column, exists, func, select, update, values
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from app.crud.crud_paragraph import paragraph as paragraph_crud
-from app.crud.crud_expression import expression as expression_crud
 from app.db.models import Expression, Paragraph
-from app.schemas.paragraph import ParagraphCreate
 from app.utils.text_utils import (
     extract_paragraphs_from_text,
+    analyze_document,
     analyze_text_metrics,
+    detect_language,
+    document_metrics,
+    document_summary_stats,
     get_text_summary_stats
 )
-from app.core.text_processing import expression_relevance, get_land_dictionary
+from app.core.text_processing import expression_relevance, get_land_dictionary_cached
 
 logger = logging.getLogger(__name__)
 
+# Taille des lots d'expressions lus pendant l'extraction d'un land
+EXPRESSION_BATCH_SIZE = 500
+# Nombre de paragraphes accumulés avant un COPY
+PARAGRAPH_FLUSH_SIZE = 10_000
+# Découpages d'expressions menés en parallèle (threads) au sein d'un lot
+EXTRACTION_CONCURRENCY = 16
+# Colonnes lues pour l'extraction : les champs texte de _get_expression_text,
+# sans le reste de la ligne (métadonnées, JSON de validation, etc.)
+EXTRACTION_COLUMNS = (
+    Expression.id,
+    Expression.land_id,
+    Expression.lang,
+    Expression.title,
+    Expression.description,
+    Expression.summary,
+    Expression.readable,
+    Expression.content,
+)
+# Champs texte combinés par _get_expression_text, par ordre de priorité
+_TEXT_ATTRS = ("readable", "content", "description", "summary", "title")
+_get_text_attrs = attrgetter(*_TEXT_ATTRS)
+# Colonnes lues pour le calcul de pertinence
+RELEVANCE_COLUMNS = (
+    Expression.id,
+    Expression.title,
+    Expression.readable,
+    Expression.land_id,
+    Expression.lang,
+    Expression.relevance,
+)
+# Lignes par UPDATE ... FROM (VALUES ...) (2 paramètres par ligne, limite asyncpg 32767)
+RELEVANCE_UPDATE_CHUNK = 5000
+
+
+def _above(bound: float) -> float:
+    """Borne pour bisect_right qui exclut ``bound`` (seuil « > bound »)."""
+    return math.nextafter(bound, math.inf)
+
+
+# Barèmes de _calculate_text_quality_score : bornes basses des tranches
+# (bisect_right) et points associés, len(points) == len(bornes) + 1
+_WORD_COUNT_BOUNDS = (_above(10), 20, 50, _above(2000), _above(5000))
+_WORD_COUNT_POINTS = (0, 10, 15, 20, 15, 10)
+_READING_LEVEL_BOUNDS = (_above(10), 20, 40, _above(80), _above(90))
+_READING_LEVEL_POINTS = (0, 15, 20, 25, 20, 15)
+_CHARS_PER_WORD_BOUNDS = (2, 4, _above(8), _above(12))
+_CHARS_PER_WORD_POINTS = (0, 5, 10, 5, 0)
+# Langues pleinement prises en charge (10 points, 5 pour les autres)
+_QUALITY_LANGUAGES = frozenset({'fr', 'en'})
+
+@dataclass(slots=True)
+class _ExtractionStats:
+    """Compteurs d'une extraction de land, convertis en dict en fin de traitement."""
+    land_id: int
+    total: int = 0
+    processed: int = 0
+    created: int = 0
+    skipped: int = 0
+    errors: List[str] = field(default_factory=list)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'land_id': self.land_id,
+            'total_expressions': self.total,
+            'processed_expressions': self.processed,
+            'created_paragraphs': self.created,
+            'skipped_expressions': self.skipped,
+            'errors': self.errors
+        }
+
+class _RelevanceInput(NamedTuple):
+    """Propriétés lues par expression_relevance pour un texte libre."""
+    title: Optional[str]
+    readable: Optional[str]
+
 class TextProcessorService:
     """Service pour le traitement et l'analyse de texte"""
     
-    def __init__(self, db: Optional[AsyncSession] = None):
+    def __init__(self, db: Optional[AsyncSession] = None, per_paragraph_language: bool = False):
+        """
+        Args:
+            db: Session asynchrone pour les opérations de pertinence
+            per_paragraph_language: Détecte la langue de chaque paragraphe
+                (coûteux) au lieu de reprendre celle du texte source
+        """
         self.db = db
+        self.per_paragraph_language = per_paragraph_language
     
     async def extract_paragraphs_for_land(
         self, 
@@ -36,6 +131,16 @@ class TextProcessorService:
         """
         Extrait les paragraphes de toutes les expressions d'un land
         
+        Sans force_reextract, seules les expressions sans paragraphe sont
+        sélectionnées (NOT EXISTS), ce qui évite une requête de vérification
+        par expression. Les expressions d'un lot sont découpées en parallèle
+        hors de la boucle d'événements ; leurs paragraphes sont accumulés puis
+        insérés par COPY tous les PARAGRAPH_FLUSH_SIZE.
+        
+        Le traitement est pipeliné : pendant le découpage d'un lot, la session
+        lit le lot suivant puis écrit les paragraphes du lot précédent. Les
+        accès à la session restent séquentiels, seul le calcul les chevauche.
+        
         Args:
             db: Session de base de données
             land_id: ID du land à traiter
@@ -48,56 +153,111 @@ class TextProcessorService:
         """
         logger.info(f"Starting paragraph extraction for land {land_id}")
         
-        stats = {
-            'land_id': land_id,
-            'total_expressions': 0,
-            'processed_expressions': 0,
-            'created_paragraphs': 0,
-            'skipped_expressions': 0,
-            'errors': []
-        }
+        stats = _ExtractionStats(land_id)
         
         try:
-            # Récupérer toutes les expressions du land
-            expressions = expression_crud.get_by_land(db, land_id, limit=10000)
-            stats['total_expressions'] = len(expressions)
-            
-            if not expressions:
-                logger.info(f"No expressions found for land {land_id}")
-                return stats
-            
-            for expression in expressions:
-                try:
-                    extraction_result = await self.extract_paragraphs_for_expression(
-                        db, 
-                        expression,
-                        force_reextract=force_reextract,
-                        min_length=min_paragraph_length,
-                        max_length=max_paragraph_length
+            pending_rows: List[Tuple] = []
+            pending_ids: List[int] = []
+            
+            semaphore = asyncio.Semaphore(EXTRACTION_CONCURRENCY)
+            in_flight: Optional[Tuple[List[Row], asyncio.Future]] = None
+            
+            async def collect(batch: List[Row], outcomes: asyncio.Future) -> None:
+                nonlocal pending_rows, pending_ids
+                failed = skipped = 0
+                for expression, rows in zip(batch, await outcomes):
+                    if isinstance(rows, Exception):
+                        error_msg = f"Error processing expression {expression.id}: {str(rows)}"
+                        logger.error(error_msg)
+                        stats.errors.append(error_msg)
+                        failed += 1
+                    elif rows:
+                        pending_rows.extend(rows)
+                        pending_ids.append(expression.id)
+                    else:
+                        skipped += 1
+                
+                # Compteurs mis à jour une fois par lot
+                stats.total += len(batch)
+                stats.processed += len(batch) - failed
+                stats.skipped += skipped
+                
+                # Les écritures restent séquentielles sur la session partagée
+                if len(pending_rows) >= PARAGRAPH_FLUSH_SIZE:
+                    stats.created += await self._flush_paragraphs(
+                        db, pending_rows, pending_ids, force_reextract
+                    )
+                    pending_rows, pending_ids = [], []
+            
+            try:
+                async for batch in self._iter_expression_batches(db, land_id, force_reextract):
+                    outcomes = asyncio.gather(
+                        *(
+                            self._build_paragraph_rows_async(
+                                semaphore, expression, min_paragraph_length, max_paragraph_length
+                            )
+                            for expression in batch
+                        ),
+                        return_exceptions=True
                     )
-                    
-                    stats['created_paragraphs'] += extraction_result['created_paragraphs']
-                    if extraction_result['created_paragraphs'] == 0:
-                        stats['skipped_expressions'] += 1
-                    
-                    stats['processed_expressions'] += 1
-                    
-                except Exception as e:
-                    error_msg = f"Error processing expression {expression.id}: {str(e)}"
-                    logger.error(error_msg)
-                    stats['errors'].append(error_msg)
+                    # Le lot précédent est écrit pendant le découpage de celui-ci
+                    previous, in_flight = in_flight, (batch, outcomes)
+                    if previous is not None:
+                        await collect(*previous)
+                
+                if in_flight is not None:
+                    await collect(*in_flight)
+                    in_flight = None
+            finally:
+                if in_flight is not None:
+                    in_flight[1].cancel()
+            
+            stats.created += await self._flush_paragraphs(
+                db, pending_rows, pending_ids, force_reextract
+            )
+            
+            if not stats.total:
+                logger.info(f"No expressions to process for land {land_id}")
+                return stats.as_dict()
             
             logger.info(f"Paragraph extraction completed for land {land_id}: "
-                       f"{stats['created_paragraphs']} paragraphs created from "
-                       f"{stats['processed_expressions']} expressions")
+                       f"{stats.created} paragraphs created from "
+                       f"{stats.processed} expressions")
             
-            return stats
+            return stats.as_dict()
             
         except Exception as e:
             logger.error(f"Error extracting paragraphs for land {land_id}: {e}")
-            stats['error'] = str(e)
             raise
     
+    async def _iter_expression_batches(
+        self,
+        db: AsyncSession,
+        land_id: int,
+        force_reextract: bool,
+        batch_size: int = EXPRESSION_BATCH_SIZE
+    ) -> AsyncIterator[List[Row]]:
+        """
+        Parcourt les expressions à traiter par lots (pagination keyset sur l'id).
+        
+        Chaque lot est une requête indépendante : les commits faits entre deux
+        lots ne coupent pas la lecture, contrairement à un curseur serveur.
+        Seules les EXTRACTION_COLUMNS sont lues (lignes légères, pas d'ORM).
+        """
+        stmt = select(*EXTRACTION_COLUMNS).where(Expression.land_id == land_id)
+        if not force_reextract:
+            stmt = stmt.where(~exists().where(Paragraph.expression_id == Expression.id))
+        stmt = stmt.order_by(Expression.id).limit(batch_size)
+        
+        last_id = 0
+        while True:
+            result = await db.execute(stmt.where(Expression.id > last_id))
+            batch = result.all()
+            if not batch:
+                return
+            yield batch
+            last_id = batch[-1].id
+    
     async def extract_paragraphs_for_expression(
         self,
         db: AsyncSession,
@@ -109,6 +269,9 @@ class TextProcessorService:
         """
         Extrait les paragraphes d'une expression
         
+        L'appelant sélectionne les expressions sans paragraphe (voir
+        _iter_expression_batches) ; force_reextract supprime ceux existants.
+        
         Args:
             db: Session de base de données
             expression: Expression à traiter
@@ -128,64 +291,22 @@ class TextProcessorService:
         }
         
         try:
-            # Vérifier si des paragraphes existent déjà
-            if not force_reextract:
-                existing_paragraphs = paragraph_crud.get_by_expression(db, expression.id, limit=1)
-                if existing_paragraphs:
-                    logger.debug(f"Paragraphs already exist for expression {expression.id}, skipping")
-                    result['skipped'] = True
-                    return result
-            
-            source_text = self._get_expression_text(expression)
-            
-            # Analyser le texte pour voir s'il vaut la peine d'être traité
-            if not source_text or len(source_text.strip()) < min_length:
-                logger.debug(f"Expression {expression.id} text too short, skipping")
-                result['skipped'] = True
-                return result
-            
-            # Extraire les paragraphes
-            paragraphs = extract_paragraphs_from_text(
-                source_text,
+            # Découpage et détection de langue hors de la boucle d'événements
+            rows = await asyncio.to_thread(
+                self._build_paragraph_rows,
+                expression,
                 min_length=min_length,
                 max_length=max_length
             )
-            
-            if not paragraphs:
-                logger.debug(f"No valid paragraphs extracted from expression {expression.id}")
+            if not rows:
                 result['skipped'] = True
                 return result
             
-            # Détecter la langue principale du texte
-            text_stats = get_text_summary_stats(source_text)
-            detected_language = text_stats.get('language')
-            
-            # Créer les objets paragraphe
-            paragraph_objects = []
-            for i, paragraph_text in enumerate(paragraphs):
-                paragraph_create = ParagraphCreate(
-                    expression_id=expression.id,
-                    text=paragraph_text,
-                    position=i,
-                    language=detected_language
-                )
-                paragraph_objects.append(paragraph_create)
-            
-            # Supprimer les anciens paragraphes si force_reextract
-            if force_reextract:
-                deleted_count = paragraph_crud.delete_by_expression(db, expression.id)
-                logger.debug(f"Deleted {deleted_count} existing paragraphs for expression {expression.id}")
-            
-            # Créer en lot
-            created_paragraphs = paragraph_crud.bulk_create(
-                db, 
-                paragraph_objects, 
-                analyze_text=True
+            result['created_paragraphs'] = await self._flush_paragraphs(
+                db, rows, [expression.id], force_reextract
             )
             
-            result['created_paragraphs'] = len(created_paragraphs)
-            
-            logger.debug(f"Created {len(created_paragraphs)} paragraphs for expression {expression.id}")
+            logger.debug(f"Created {result['created_paragraphs']} paragraphs for expression {expression.id}")
             
             return result
             
@@ -194,16 +315,100 @@ class TextProcessorService:
             result['error'] = str(e)
             return result
     
-    def _get_expression_text(self, expression: Expression) -> str:
-        """Combine les champs texte disponibles pour une expression."""
-        candidates = [
-            getattr(expression, "readable", None),
-            getattr(expression, "content", None),
-            getattr(expression, "description", None),
-            getattr(expression, "summary", None),
-            getattr(expression, "title", None),
+    def _build_paragraph_rows(
+        self,
+        expression: Union[Expression, Row],
+        min_length: int = 50,
+        max_length: int = 5000
+    ) -> List[Tuple]:
+        """
+        Découpe une expression en lignes prêtes pour paragraph_crud.copy_insert.
+        
+        Les métriques sont calculées ici pour que le COPY porte des colonnes
+        complètes ; les doublons de texte d'une même expression sont écartés.
+        """
+        source_text = self._get_expression_text(expression)
+        
+        # Analyser le texte pour voir s'il vaut la peine d'être traité
+        if not source_text or len(source_text.strip()) < min_length:
+            logger.debug(f"Expression {expression.id} text too short, skipping")
+            return []
+        
+        paragraphs = extract_paragraphs_from_text(
+            source_text,
+            min_length=min_length,
+            max_length=max_length
+        )
+        if not paragraphs:
+            logger.debug(f"No valid paragraphs extracted from expression {expression.id}")
+            return []
+        
+        # Langue principale du texte, appliquée à tous ses paragraphes
+        # sauf si la détection par paragraphe est demandée
+        detected_language = detect_language(source_text)
+        per_paragraph = self.per_paragraph_language
+        
+        rows = []
+        seen_hashes = set()
+        for position, paragraph_text in enumerate(paragraphs):
+            text_hash = hashlib.sha256(paragraph_text.encode('utf-8')).hexdigest()
+            if text_hash in seen_hashes:
+                continue
+            seen_hashes.add(text_hash)
+            metrics = analyze_text_metrics(paragraph_text, with_language=per_paragraph)
+            rows.append((
+                expression.id,
+                paragraph_text,
+                text_hash,
+                position,
+                metrics['word_count'],
+                metrics['char_count'],
+                metrics['sentence_count'],
+                (metrics['language'] or detected_language) if per_paragraph else detected_language,
+                metrics['reading_level'],
+            ))
+        return rows
+    
+    async def _build_paragraph_rows_async(
+        self,
+        semaphore: asyncio.Semaphore,
+        expression: Union[Expression, Row],
+        min_length: int,
+        max_length: int
+    ) -> List[Tuple]:
+        """Découpe une expression dans un thread pour ne pas bloquer la boucle."""
+        async with semaphore:
+            return await asyncio.to_thread(
+                self._build_paragraph_rows,
+                expression,
+                min_length=min_length,
+                max_length=max_length
+            )
+    
+    async def _flush_paragraphs(
+        self,
+        db: AsyncSession,
+        rows: List[Tuple],
+        expression_ids: List[int],
+        force_reextract: bool
+    ) -> int:
+        """Remplace (si force_reextract) puis insère par COPY, en une transaction."""
+        if not rows:
+            return 0
+        if force_reextract:
+            deleted_count = await paragraph_crud.delete_by_expressions(db, expression_ids)
+            logger.debug(f"Deleted {deleted_count} existing paragraphs for {len(expression_ids)} expressions")
+        created = await paragraph_crud.copy_insert(db, rows)
+        await db.commit()
+        return created
+    
+    def _get_expression_text(self, expression: Union[Expression, Row]) -> str:
+        """Combine les champs texte disponibles pour une expression (ORM ou ligne projetée)."""
+        filtered = [
+            stripped
+            for text in _get_text_attrs(expression)
+            if isinstance(text, str) and (stripped := text.strip())
         ]
-        filtered = [text.strip() for text in candidates if isinstance(text, str) and text.strip()]
         return "\n\n".join(filtered)
     
     @staticmethod
@@ -218,11 +423,15 @@ class TextProcessorService:
             Analyse complète du texte
         """
         try:
-            # Statistiques générales
-            summary_stats = get_text_summary_stats(text)
-            
-            # Métriques détaillées
-            detailed_metrics = analyze_text_metrics(text)
+            # Une seule analyse du texte pour les statistiques générales
+            # et les métriques détaillées
+            if text:
+                document = analyze_document(text)
+                summary_stats = document_summary_stats(document)
+                detailed_metrics = document_metrics(document)
+            else:
+                summary_stats = get_text_summary_stats(text)
+                detailed_metrics = analyze_text_metrics(text)
             
             # Extraction de paragraphes pour évaluation
             sample_paragraphs = extract_paragraphs_from_text(text, min_length=20, max_length=1000)
@@ -230,11 +439,7 @@ class TextProcessorService:
             analysis = {
                 'content_stats': summary_stats,
                 'detailed_metrics': detailed_metrics,
-                'paragraph_analysis': {
-                    'extractable_paragraphs': len(sample_paragraphs),
-                    'avg_paragraph_length': sum(len(p) for p in sample_paragraphs) / len(sample_paragraphs) if sample_paragraphs else 0,
-                    'sample_paragraphs': sample_paragraphs[:3] if sample_paragraphs else []
-                },
+                'paragraph_analysis': TextProcessorService._paragraph_length_stats(sample_paragraphs),
                 'quality_score': TextProcessorService._calculate_text_quality_score(summary_stats, detailed_metrics),
                 'recommendations': TextProcessorService._generate_text_recommendations(summary_stats, detailed_metrics)
             }
@@ -249,6 +454,30 @@ class TextProcessorService:
                 'quality_score': 0
             }
     
+    @staticmethod
+    def _paragraph_length_stats(paragraphs: List[str]) -> Dict[str, Any]:
+        """Distribution des longueurs de paragraphes (moyenne, écart-type, médiane, p90)."""
+        stats = {
+            'extractable_paragraphs': len(paragraphs),
+            'avg_paragraph_length': 0,
+            'std_paragraph_length': 0,
+            'median_paragraph_length': 0,
+            'p90_paragraph_length': 0,
+            'sample_paragraphs': paragraphs[:3]
+        }
+        if not paragraphs:
+            return stats
+        
+        lengths = np.fromiter((len(p) for p in paragraphs), dtype=np.int32, count=len(paragraphs))
+        median, p90 = np.percentile(lengths, [50, 90])
+        stats.update({
+            'avg_paragraph_length': float(lengths.mean()),
+            'std_paragraph_length': float(lengths.std()),
+            'median_paragraph_length': float(median),
+            'p90_paragraph_length': float(p90)
+        })
+        return stats
+    
     @staticmethod
     def _calculate_text_quality_score(
         summary_stats: Dict[str, Any], 
@@ -258,24 +487,14 @@ class TextProcessorService:
         
         score = 0.0
         
-        # Longueur appropriée (20% du score)
+        # Longueur appropriée (20% du score, optimum 50-2000 mots)
         word_count = summary_stats.get('word_count', 0)
-        if 50 <= word_count <= 2000:
-            score += 20
-        elif 20 <= word_count < 50 or 2000 < word_count <= 5000:
-            score += 15
-        elif word_count > 10:
-            score += 10
+        score += _WORD_COUNT_POINTS[bisect_right(_WORD_COUNT_BOUNDS, word_count)]
         
-        # Lisibilité (25% du score)
+        # Lisibilité (25% du score, optimum 40-80)
         reading_level = detailed_metrics.get('reading_level')
         if reading_level:
-            if 40 <= reading_level <= 80:  # Lisibilité optimale
-                score += 25
-            elif 20 <= reading_level < 40 or 80 < reading_level <= 90:
-                score += 20
-            elif reading_level > 10:
-                score += 15
+            score += _READING_LEVEL_POINTS[bisect_right(_READING_LEVEL_BOUNDS, reading_level)]
         
         # Structure (20% du score)
         paragraph_count = summary_stats.get('paragraph_count', 0)
@@ -289,19 +508,19 @@ class TextProcessorService:
             score += 10
         
         # Diversité lexicale (15% du score)
-        keywords = summary_stats.get('keywords', [])
+        keyword_count = len(summary_stats.get('keywords', ()))
         avg_word_length = summary_stats.get('avg_word_length', 0)
         
-        if len(keywords) >= 5 and 4 <= avg_word_length <= 7:
+        if keyword_count >= 5 and 4 <= avg_word_length <= 7:
             score += 15
-        elif len(keywords) >= 3:
+        elif keyword_count >= 3:
             score += 10
-        elif len(keywords) >= 1:
+        elif keyword_count >= 1:
             score += 5
         
         # Langue détectée (10% du score)
         language = detailed_metrics.get('language')
-        if language in ['fr', 'en']:
+        if language in _QUALITY_LANGUAGES:
             score += 10
         elif language:
             score += 5
@@ -310,10 +529,8 @@ class TextProcessorService:
         char_count = detailed_metrics.get('char_count', 0)
         if word_count > 0 and char_count > 0:
             avg_chars_per_word = char_count / word_count
-            if 4 <= avg_chars_per_word <= 8:  # Longueur de mot normale
-                score += 10
-            elif 2 <= avg_chars_per_word <= 12:
-                score += 5
+            # Longueur de mot normale : 4-8 caractères
+            score += _CHARS_PER_WORD_POINTS[bisect_right(_CHARS_PER_WORD_BOUNDS, avg_chars_per_word)]
         
         return min(100.0, max(0.0, score))
     
@@ -358,32 +575,36 @@ class TextProcessorService:
         
         return recommendations
     
-    def get_processing_stats(self, db: AsyncSession, land_id: int) -> Dict[str, Any]:
-        """Récupère les statistiques de traitement pour un land"""
+    def get_processing_stats(self, db: Session, land_id: int) -> Dict[str, Any]:
+        """
+        Récupère les statistiques de traitement pour un land
+        
+        La couverture des expressions est agrégée côté serveur en une requête
+        (COUNT FILTER sur EXISTS) ; session synchrone comme paragraph_crud.
+        """
         
         # Statistiques des paragraphes
         paragraph_stats = paragraph_crud.get_stats_by_land(db, land_id)
         
         # Statistiques des expressions
-        expressions = expression_crud.get_by_land(db, land_id, limit=10000)
-        
-        expressions_with_paragraphs = 0
-        total_expression_length = 0
-        
-        for expression in expressions:
-            if expression.text:
-                total_expression_length += len(expression.text)
-            
-            # Vérifier si l'expression a des paragraphes
-            paragraphs = paragraph_crud.get_by_expression(db, expression.id, limit=1)
-            if paragraphs:
-                expressions_with_paragraphs += 1
+        has_paragraphs = exists().where(Paragraph.expression_id == Expression.id)
+        expression_stats = db.execute(
+            select(
+                func.count().label('total'),
+                func.count().filter(has_paragraphs).label('with_paragraphs'),
+                func.coalesce(func.sum(func.length(Expression.readable)), 0).label('total_chars')
+            ).where(Expression.land_id == land_id)
+        ).one()
+        
+        total_expressions = expression_stats.total
+        expressions_with_paragraphs = expression_stats.with_paragraphs
+        total_expression_length = int(expression_stats.total_chars)
         
         return {
             'land_id': land_id,
-            'total_expressions': len(expressions),
+            'total_expressions': total_expressions,
             'expressions_with_paragraphs': expressions_with_paragraphs,
-            'expression_processing_coverage': (expressions_with_paragraphs / len(expressions) * 100) if expressions else 0,
+            'expression_processing_coverage': (expressions_with_paragraphs / total_expressions * 100) if total_expressions else 0,
             'total_paragraphs': paragraph_stats.get('total_paragraphs', 0),
             'avg_paragraphs_per_expression': paragraph_stats.get('avg_paragraphs_per_expression', 0),
             'total_words': paragraph_stats.get('total_words', 0),
@@ -391,7 +612,7 @@ class TextProcessorService:
             'avg_reading_level': paragraph_stats.get('avg_reading_level', 0),
             'language_distribution': paragraph_stats.get('languages', {}),
             'total_expression_chars': total_expression_length,
-            'avg_expression_length': total_expression_length / len(expressions) if expressions else 0
+            'avg_expression_length': total_expression_length / total_expressions if total_expressions else 0
         }
     
     async def calculate_relevance(
@@ -418,35 +639,39 @@ class TextProcessorService:
                 logger.warning("No land_id provided for relevance calculation")
                 return 0.0
             
-            # Récupérer le dictionnaire du land
-            dictionary = await get_land_dictionary(self.db, land_id)
+            # Récupérer le dictionnaire du land (cache TTL partagé entre appels)
+            dictionary = await get_land_dictionary_cached(self.db, land_id)
             
             if not dictionary:
                 logger.warning(f"No dictionary found for land {land_id}")
                 return 0.0
             
-            # Créer un objet mock avec les propriétés attendues par expression_relevance
-            class MockExpression:
-                def __init__(self, title, readable):
-                    self.title = title
-                    self.readable = readable
-            
-            mock_expr = MockExpression(title, text)
-            
             # Calculer la pertinence
-            relevance_score = await expression_relevance(dictionary, mock_expr, language)
+            relevance_score = await self._relevance_from_dictionary(dictionary, text, title, language)
             
             logger.debug(
                 f"Relevance calculated: {relevance_score} "
                 f"(dictionary size: {len(dictionary)}, text length: {len(text) if text else 0})"
             )
             
-            return float(relevance_score)
+            return relevance_score
             
         except Exception as e:
             logger.error(f"Error calculating relevance: {e}")
             return 0.0
     
+    @staticmethod
+    async def _relevance_from_dictionary(
+        dictionary: Dict[str, float],
+        text: str,
+        title: Optional[str] = None,
+        language: str = "fr"
+    ) -> float:
+        """Score de pertinence d'un texte pour un dictionnaire déjà chargé (sans accès base)."""
+        if not dictionary:
+            return 0.0
+        return float(await expression_relevance(dictionary, _RelevanceInput(title, text), language))
+    
     async def update_expression_relevance(
         self,
         expression_id: int,
@@ -463,14 +688,12 @@ class TextProcessorService:
             Résultats de la mise à jour
         """
         try:
-            from sqlalchemy import select, update
-            from app.db.models import Expression
-            
-            # Récupérer l'expression
+            # Récupérer les seules colonnes utiles ; SELECT et UPDATE partagent
+            # la transaction ouverte par la session, validée par un seul commit
             result = await self.db.execute(
-                select(Expression).where(Expression.id == expression_id)
+                select(*RELEVANCE_COLUMNS).where(Expression.id == expression_id)
             )
-            expression = result.scalar_one_or_none()
+            expression = result.one_or_none()
             
             if not expression:
                 return {
@@ -521,3 +744,80 @@ class TextProcessorService:
                 'success': False,
                 'error': str(e)
             }
+    
+    async def update_expression_relevance_batch(
+        self,
+        expression_ids: List[int],
+        force_recalculate: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Met à jour le score de pertinence d'un ensemble d'expressions.
+        
+        Une seule lecture des colonnes utiles, un chargement de dictionnaire
+        par land, écriture par UPDATE ... FROM (VALUES ...) et un seul commit.
+        
+        Args:
+            expression_ids: IDs des expressions
+            force_recalculate: Force le recalcul même si un score existe
+            
+        Returns:
+            Résultats de la mise à jour
+        """
+        try:
+            result = await self.db.execute(
+                select(*RELEVANCE_COLUMNS).where(Expression.id.in_(expression_ids))
+            )
+            rows = result.all()
+            
+            to_update = [
+                row for row in rows
+                if force_recalculate or row.relevance is None
+            ]
+            # Dictionnaires chargés un land après l'autre : la session ne
+            # supporte pas de requêtes concurrentes. Une erreur de chargement
+            # fait échouer le lot au lieu d'écrire une pertinence de 0.
+            dictionaries = {}
+            for land_id in {row.land_id for row in to_update if row.land_id}:
+                dictionaries[land_id] = await get_land_dictionary_cached(self.db, land_id)
+            
+            updates = []
+            for row in to_update:
+                score = await self._relevance_from_dictionary(
+                    dictionaries.get(row.land_id),
+                    row.readable or '',
+                    row.title,
+                    row.lang or 'fr'
+                )
+                updates.append((row.id, score))
+            
+            for start in range(0, len(updates), RELEVANCE_UPDATE_CHUNK):
+                data = values(
+                    column('id', Integer),
+                    column('relevance', Float),
+                    name='data'
+                ).data(updates[start:start + RELEVANCE_UPDATE_CHUNK])
+                await self.db.execute(
+                    update(Expression)
+                    .where(Expression.id == data.c.id)
+                    .values(relevance=data.c.relevance)
+                )
+            
+            if updates:
+                await self.db.commit()
+            
+            found_ids = {row.id for row in rows}
+            return {
+                'success': True,
+                'updated': len(updates),
+                'skipped': len(rows) - len(updates),
+                'missing': [expression_id for expression_id in expression_ids if expression_id not in found_ids],
+                'relevances': dict(updates)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error updating relevance for {len(expression_ids)} expressions: {e}")
+            await self.db.rollback()
+            return {
+                'success': False,
+                'error': str(e)
+            }
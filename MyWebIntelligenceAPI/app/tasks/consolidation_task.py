@@ -7,8 +7,14 @@ import asyncio
 import logging
 import re
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List, Set
+from urllib.parse import urlparse
 
+from celery import chord
+from sqlalchemy import and_, case, func, insert, or_, select
+from sqlalchemy.orm import load_only
+
+from app.config import settings
 from app.core.celery_app import celery_app
 from app.core import text_processing
 from app.core.content_extractor import extract_md_links
@@ -18,27 +24,34 @@ from app.db.session import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# Motifs d'extraction appliques a chaque contenu readable.
+# Passes separees volontairement : chaque motif commence par un litteral que
+# le moteur re recherche rapidement, alors qu'une alternation unique
+# (finditer + lastgroup) s'est averee ~25% plus lente sur un readable de 400 Ko.
+# Hyperscan n'est pas plus rapide non plus : sans groupes de capture, avec un
+# callback Python par correspondance, le seul scan depasse deja les 4 findall.
+_HREF_RE = re.compile(r'href=["\']([^"\']+)["\']')
+_IMG_MD_RE = re.compile(r'!\[.*?\]\((.*?)\)')
+_VIDEO_RE = re.compile(r'\[VIDEO:\s*(.*?)\]')
+
 
 def _get_land_dictionary(db, land: models.Land) -> Dict[str, float]:
-    """Construit le dictionnaire de mots-cles du land pour le calcul de relevance."""
-    dictionary: Dict[str, float] = {}
-    words = land.words or []
-    for word in words:
-        if isinstance(word, str) and word.strip():
-            dictionary[word.strip().lower()] = 1.0
-    return dictionary
+    """
+    Dictionnaire (lemme -> poids) du land pour le calcul de relevance.
 
+    Meme source que la relevance du crawler (land_dictionaries), une seule
+    requete par consolidation (les sous-taches recoivent le dictionnaire).
+    Pas de cache inter-taches : l'invalidation ne se fait que dans le process
+    API, un worker reutiliserait les poids d'avant une edition des mots.
+    """
+    return text_processing.get_land_dictionary_sync(db, land.id)
 
-def _compute_relevance_sync(dictionary: Dict[str, float], expr, lang: str = "fr") -> float:
-    """Wrapper sync pour expression_relevance (async)."""
-    try:
-        return asyncio.run(text_processing.expression_relevance(dictionary, expr, lang))
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        try:
-            return loop.run_until_complete(text_processing.expression_relevance(dictionary, expr, lang))
-        finally:
-            loop.close()
+
+def _compute_relevance_sync(
+    loop: asyncio.AbstractEventLoop, dictionary: Dict[str, float], expr, lang: str = "fr"
+) -> float:
+    """Wrapper sync pour expression_relevance (async), sur la boucle de la tache."""
+    return loop.run_until_complete(text_processing.expression_relevance(dictionary, expr, lang))
 
 
 def _is_crawlable(url: Optional[str]) -> bool:
@@ -53,6 +66,263 @@ def _is_crawlable(url: Optional[str]) -> bool:
     return True
 
 
+# Colonnes lues par la consolidation : content et metadonnees ne sont pas charges
+_CONSOLIDATION_COLUMNS = (
+    models.Expression.id,
+    models.Expression.url,
+    models.Expression.title,
+    models.Expression.readable,
+    models.Expression.lang,
+    models.Expression.relevance,
+    models.Expression.depth,
+)
+# Taille des pages d'expressions chargees en memoire a la fois
+CONSOLIDATION_PAGE_SIZE = 200
+
+
+def _iter_expressions(db, expression_ids: List[int]) -> Iterator[models.Expression]:
+    """
+    Charge les expressions par pages d'ids plutot qu'en un seul .all().
+
+    Pas de curseur serveur (yield_per) : le commit par expression le fermerait.
+    """
+    for start in range(0, len(expression_ids), CONSOLIDATION_PAGE_SIZE):
+        page = expression_ids[start:start + CONSOLIDATION_PAGE_SIZE]
+        yield from (
+            db.query(models.Expression)
+            .options(load_only(*_CONSOLIDATION_COLUMNS))
+            .filter(models.Expression.id.in_(page))
+            .order_by(models.Expression.id)
+            .all()
+        )
+
+
+def _empty_stats() -> Dict[str, int]:
+    return {
+        "processed": 0,
+        "errors": 0,
+        "links_rebuilt": 0,
+        "media_rebuilt": 0,
+        "expressions_added": 0,
+        "relevance_updated": 0,
+    }
+
+
+def _consolidate_expression(
+    db,
+    loop: asyncio.AbstractEventLoop,
+    land_id: int,
+    expr: models.Expression,
+    dictionary: Dict[str, float],
+    stats: Dict[str, int],
+) -> None:
+    """
+    Consolide une expression (sans commit) : relevance, liens, medias.
+
+    Les anciens liens sortants et medias ont deja ete supprimes pour tout
+    le lot par _delete_outgoing.
+    """
+    # 1. Recalculer la relevance (expression_relevance ne lit que title/readable)
+    lang = expr.lang or "fr"
+    new_relevance = _compute_relevance_sync(loop, dictionary, expr, lang)
+    if new_relevance != expr.relevance:
+        expr.relevance = new_relevance
+        stats["relevance_updated"] += 1
+
+    # 2. Extraire liens du contenu readable
+    # (liens markdown + liens HTML, dedoublonnes par ensemble)
+    links: Set[str] = set()
+    if expr.readable:
+        links.update(extract_md_links(expr.readable))
+        links.update(_HREF_RE.findall(expr.readable))
+
+    # 3. Ajouter expressions manquantes et creer les liens
+    # (une requete par table pour tous les liens de l'expression)
+    # Les liens vers la page elle-meme (navigation) sont ecartes avant toute requete
+    crawlable = {
+        link_url for link_url in links
+        if link_url != expr.url and _is_crawlable(link_url)
+    }
+    targets: Dict[str, int] = {}
+    if crawlable:
+        # Verrou transactionnel par land : les chunks paralleles ne creent
+        # pas deux fois la meme expression cible ni le meme domaine
+        db.execute(select(func.pg_advisory_xact_lock(land_id)))
+        targets = dict(
+            db.query(models.Expression.url, models.Expression.id)
+            .filter(
+                models.Expression.land_id == land_id,
+                models.Expression.url.in_(crawlable),
+            )
+            .all()
+        )
+
+    missing = [link_url for link_url in crawlable if link_url not in targets]
+    if missing:
+        # Ajouter les expressions manquantes
+        domain_names = {link_url: urlparse(link_url).netloc for link_url in missing}
+
+        # Trouver ou creer les domaines
+        domains: Dict[str, int] = dict(
+            db.query(models.Domain.name, models.Domain.id)
+            .filter(
+                models.Domain.land_id == land_id,
+                models.Domain.name.in_(set(domain_names.values())),
+            )
+            .all()
+        )
+        # Insertions groupees : un INSERT ... RETURNING par table
+        new_domain_names = set(domain_names.values()) - domains.keys()
+        if new_domain_names:
+            domains.update(db.execute(
+                insert(models.Domain).returning(models.Domain.name, models.Domain.id),
+                [{"land_id": land_id, "name": domain_name} for domain_name in new_domain_names],
+            ).all())
+
+        # url_hash explicite : l'INSERT groupe ne declenche pas before_insert
+        targets.update(db.execute(
+            insert(models.Expression).returning(models.Expression.url, models.Expression.id),
+            [
+                {
+                    "land_id": land_id,
+                    "domain_id": domains[domain_names[link_url]],
+                    "url": link_url,
+                    "url_hash": models.Expression.compute_url_hash(link_url),
+                    "depth": (expr.depth or 0) + 1,
+                }
+                for link_url in missing
+            ],
+        ).all())
+        stats["expressions_added"] += len(missing)
+
+    # Creer les liens : les anciens ont ete supprimes a l'etape 1,
+    # seuls les doublons de cible sont a ecarter
+    link_rows = [
+        {"source_id": expr.id, "target_id": target_id, "link_type": "internal"}
+        for target_id in set(targets.values())
+        if target_id != expr.id
+    ]
+
+    # 4. Extraire medias du contenu readable, une ligne par URL
+    # (contrainte uq_media_expression_url)
+    media_by_url: Dict[str, Dict[str, Any]] = {}
+    if expr.readable:
+        # Images markdown
+        img_matches = _IMG_MD_RE.findall(expr.readable)
+        for img_url in img_matches:
+            if img_url and not img_url.startswith("data:"):
+                media_by_url.setdefault(img_url, {
+                    "expression_id": expr.id,
+                    "url": img_url,
+                    "url_hash": models.Media.compute_url_hash(img_url),
+                    "type": "img",
+                })
+
+        # Videos
+        video_matches = _VIDEO_RE.findall(expr.readable)
+        for vid_url in video_matches:
+            if vid_url:
+                vid_url = vid_url.strip()
+                media_by_url.setdefault(vid_url, {
+                    "expression_id": expr.id,
+                    "url": vid_url,
+                    "url_hash": models.Media.compute_url_hash(vid_url),
+                    "type": "video",
+                })
+    media_rows = list(media_by_url.values())
+
+    if link_rows:
+        db.execute(insert(models.ExpressionLink), link_rows)
+        stats["links_rebuilt"] += len(link_rows)
+    if media_rows:
+        db.execute(insert(models.Media), media_rows)
+        stats["media_rebuilt"] += len(media_rows)
+
+
+def _delete_outgoing(db, expression_ids: List[int]) -> None:
+    """Supprime en deux requetes les liens sortants et medias d'un lot d'expressions."""
+    db.query(models.ExpressionLink).filter(
+        models.ExpressionLink.source_id.in_(expression_ids)
+    ).delete(synchronize_session=False)
+    db.query(models.Media).filter(
+        models.Media.expression_id.in_(expression_ids)
+    ).delete(synchronize_session=False)
+    # Commit immediat : un rollback sur une expression ne doit pas restaurer
+    # les anciens liens des suivantes (ils seraient dupliques)
+    db.commit()
+
+
+def _consolidate_expressions(
+    db,
+    land_id: int,
+    expression_ids: List[int],
+    dictionary: Dict[str, float],
+) -> Dict[str, int]:
+    """Consolide une liste d'expressions (par ids), un commit par expression."""
+    stats = _empty_stats()
+    # Une seule boucle pour toute la liste plutot qu'un asyncio.run par expression
+    loop = asyncio.new_event_loop()
+    total = len(expression_ids)
+    try:
+        if expression_ids:
+            _delete_outgoing(db, expression_ids)
+        for i, expr in enumerate(_iter_expressions(db, expression_ids)):
+            try:
+                _consolidate_expression(db, loop, land_id, expr, dictionary, stats)
+                db.commit()
+                stats["processed"] += 1
+
+                if (i + 1) % 50 == 0:
+                    logger.info("[CONSOLIDATE] [%d/%d] %d traites, %d liens, %d medias",
+                                i + 1, total, stats["processed"], stats["links_rebuilt"], stats["media_rebuilt"])
+
+            except Exception as e:
+                db.rollback()
+                stats["errors"] += 1
+                logger.error("[CONSOLIDATE] ERROR expr=%s: %s", expr.id, e)
+    finally:
+        loop.close()
+    return stats
+
+
+def _repair_approved_at(db, land_id: int) -> None:
+    """Aligne approved_at sur la relevance recalculee (un seul UPDATE)."""
+    expression = models.Expression
+    to_approve = and_(
+        expression.relevance > 0,
+        expression.crawled_at.isnot(None),
+        expression.approved_at.is_(None),
+    )
+    to_unapprove = and_(expression.relevance == 0, expression.approved_at.isnot(None))
+    db.execute(
+        expression.__table__.update()
+        .where(expression.land_id == land_id, or_(to_approve, to_unapprove))
+        .values(
+            approved_at=case(
+                (to_approve, datetime.now(timezone.utc)),
+                else_=None,
+            )
+        )
+    )
+    db.commit()
+
+
+def _completed(land_id: int, stats: Dict[str, int], start_time: datetime) -> Dict[str, Any]:
+    duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+
+    logger.info("=" * 60)
+    logger.info("[CONSOLIDATE] DONE - land=%s processed=%d errors=%d links=%d media=%d exprs_added=%d duration=%.1fs",
+                land_id, stats["processed"], stats["errors"], stats["links_rebuilt"],
+                stats["media_rebuilt"], stats["expressions_added"], duration)
+    logger.info("=" * 60)
+
+    return {
+        **stats,
+        "status": "completed",
+        "duration_seconds": duration,
+    }
+
+
 @celery_app.task(bind=True)
 def consolidate_land_task(self, land_id: int, limit: int = 0, depth: Optional[int] = None) -> Dict[str, Any]:
     """
@@ -64,6 +334,10 @@ def consolidate_land_task(self, land_id: int, limit: int = 0, depth: Optional[in
     3. Supprime et recree les liens sortants depuis le contenu readable
     4. Ajoute les expressions manquantes decouvertes dans les liens
     5. Recree les medias depuis le contenu readable
+
+    Au-dela de CONSOLIDATION_CHUNK_SIZE expressions, le travail est reparti
+    en un chord de consolidate_expressions_chunk_task ; les statistiques
+    finales sont alors le resultat de finalize_consolidation_task.
     """
     db = SessionLocal()
     start_time = datetime.now(timezone.utc)
@@ -72,14 +346,7 @@ def consolidate_land_task(self, land_id: int, limit: int = 0, depth: Optional[in
     logger.info("[CONSOLIDATE] START - land=%s limit=%s depth=%s", land_id, limit, depth)
     logger.info("=" * 60)
 
-    stats = {
-        "processed": 0,
-        "errors": 0,
-        "links_rebuilt": 0,
-        "media_rebuilt": 0,
-        "expressions_added": 0,
-        "relevance_updated": 0,
-    }
+    stats = _empty_stats()
 
     try:
         land = db.query(models.Land).filter(models.Land.id == land_id).first()
@@ -90,9 +357,9 @@ def consolidate_land_task(self, land_id: int, limit: int = 0, depth: Optional[in
 
         dictionary = _get_land_dictionary(db, land)
 
-        # Selectionner les expressions deja crawlees
+        # Selectionner les ids des expressions deja crawlees
         query = (
-            db.query(models.Expression)
+            db.query(models.Expression.id)
             .filter(
                 models.Expression.land_id == land_id,
                 (models.Expression.approved_at.isnot(None))
@@ -104,199 +371,71 @@ def consolidate_land_task(self, land_id: int, limit: int = 0, depth: Optional[in
         if limit > 0:
             query = query.limit(limit)
 
-        expressions = query.all()
+        expression_ids = [expression_id for (expression_id,) in query.all()]
 
-        if not expressions:
+        if not expression_ids:
             logger.info("[CONSOLIDATE] Aucune expression a consolider")
             result = {**stats, "status": "completed", "message": "Aucune expression a consolider"}
             db.close()
             return result
 
-        total = len(expressions)
+        total = len(expression_ids)
         logger.info("[CONSOLIDATE] %d expressions a traiter", total)
 
-        for i, expr in enumerate(expressions):
-            try:
-                # 1. Supprimer anciens liens sortants
-                db.query(models.ExpressionLink).filter(
-                    models.ExpressionLink.source_id == expr.id
-                ).delete(synchronize_session=False)
-
-                # 2. Supprimer anciens medias
-                db.query(models.Media).filter(
-                    models.Media.expression_id == expr.id
-                ).delete(synchronize_session=False)
-                db.flush()
-
-                # 3. Recalculer la relevance
-                class TempExpr:
-                    def __init__(self, title, readable, eid):
-                        self.title = title
-                        self.readable = readable
-                        self.id = eid
-
-                temp = TempExpr(expr.title, expr.readable, expr.id)
-                lang = expr.lang or "fr"
-                new_relevance = _compute_relevance_sync(dictionary, temp, lang)
-                if new_relevance != expr.relevance:
-                    expr.relevance = new_relevance
-                    stats["relevance_updated"] += 1
-
-                # 4. Extraire liens du contenu readable
-                links: List[str] = []
-                if expr.readable:
-                    links = extract_md_links(expr.readable)
-                    # Aussi extraire les liens HTML si le contenu en contient
-                    html_links = re.findall(r'href=["\']([^"\']+)["\']', expr.readable)
-                    for lnk in html_links:
-                        if lnk not in links:
-                            links.append(lnk)
-
-                # 5. Ajouter expressions manquantes et creer les liens
-                for link_url in set(links):
-                    if not _is_crawlable(link_url):
-                        continue
-
-                    # Chercher l'expression cible existante
-                    target = (
-                        db.query(models.Expression)
-                        .filter(
-                            models.Expression.land_id == land_id,
-                            models.Expression.url == link_url,
-                        )
-                        .first()
-                    )
-
-                    if not target:
-                        # Ajouter l'expression manquante
-                        import hashlib
-                        url_hash = hashlib.md5(link_url.encode()).hexdigest()
-                        # Trouver ou creer le domaine
-                        from urllib.parse import urlparse
-                        parsed = urlparse(link_url)
-                        domain_name = parsed.netloc
-                        domain = (
-                            db.query(models.Domain)
-                            .filter(
-                                models.Domain.land_id == land_id,
-                                models.Domain.name == domain_name,
-                            )
-                            .first()
-                        )
-                        if not domain:
-                            domain = models.Domain(
-                                land_id=land_id,
-                                name=domain_name,
-                            )
-                            db.add(domain)
-                            db.flush()
-
-                        target = models.Expression(
-                            land_id=land_id,
-                            domain_id=domain.id,
-                            url=link_url,
-                            url_hash=url_hash,
-                            depth=(expr.depth or 0) + 1,
-                        )
-                        db.add(target)
-                        db.flush()
-                        stats["expressions_added"] += 1
-
-                    # Creer le lien
-                    if target.id != expr.id:
-                        existing_link = (
-                            db.query(models.ExpressionLink)
-                            .filter(
-                                models.ExpressionLink.source_id == expr.id,
-                                models.ExpressionLink.target_id == target.id,
-                            )
-                            .first()
-                        )
-                        if not existing_link:
-                            db.add(models.ExpressionLink(
-                                source_id=expr.id,
-                                target_id=target.id,
-                                link_type="internal",
-                            ))
-                            stats["links_rebuilt"] += 1
-
-                # 6. Extraire medias du contenu readable
-                if expr.readable:
-                    # Images markdown
-                    img_matches = re.findall(r'!\[.*?\]\((.*?)\)', expr.readable)
-                    for img_url in img_matches:
-                        if img_url and not img_url.startswith("data:"):
-                            db.add(models.Media(
-                                expression_id=expr.id,
-                                url=img_url,
-                                type="img",
-                            ))
-                            stats["media_rebuilt"] += 1
-
-                    # Videos
-                    video_matches = re.findall(r'\[VIDEO:\s*(.*?)\]', expr.readable)
-                    for vid_url in video_matches:
-                        if vid_url:
-                            db.add(models.Media(
-                                expression_id=expr.id,
-                                url=vid_url.strip(),
-                                type="video",
-                            ))
-                            stats["media_rebuilt"] += 1
-
-                db.commit()
-                stats["processed"] += 1
-
-                if (i + 1) % 50 == 0:
-                    logger.info("[CONSOLIDATE] [%d/%d] %d traites, %d liens, %d medias",
-                                i + 1, total, stats["processed"], stats["links_rebuilt"], stats["media_rebuilt"])
+        chunk_size = settings.CONSOLIDATION_CHUNK_SIZE
+        if total > chunk_size:
+            chunks = [expression_ids[i:i + chunk_size] for i in range(0, total, chunk_size)]
+            db.close()
+            result = chord(
+                consolidate_expressions_chunk_task.s(land_id, chunk, dictionary)
+                for chunk in chunks
+            )(finalize_consolidation_task.s(land_id, start_time.isoformat()))
+            logger.info("[CONSOLIDATE] %d chunks dispatches (chord %s)", len(chunks), result.id)
+            return {
+                **stats,
+                "status": "dispatched",
+                "chunks": len(chunks),
+                "total_expressions": total,
+                "finalize_task_id": result.id,
+            }
+
+        stats = _consolidate_expressions(db, land_id, expression_ids, dictionary)
+        _repair_approved_at(db, land_id)
+        return _completed(land_id, stats, start_time)
 
-            except Exception as e:
-                db.rollback()
-                stats["errors"] += 1
-                logger.error("[CONSOLIDATE] ERROR expr=%s: %s", expr.id, e)
+    except Exception as exc:
+        logger.exception("[CONSOLIDATE] FAILED land=%s: %s", land_id, exc)
+        db.rollback()
+        return {**stats, "status": "failed", "error": str(exc)}
+    finally:
+        db.close()
 
-        # Reparer les approved_at
-        now = datetime.now(timezone.utc)
-        db.execute(
-            models.Expression.__table__.update()
-            .where(
-                models.Expression.land_id == land_id,
-                models.Expression.relevance > 0,
-                models.Expression.crawled_at.isnot(None),
-                models.Expression.approved_at.is_(None),
-            )
-            .values(approved_at=now)
-        )
-        db.execute(
-            models.Expression.__table__.update()
-            .where(
-                models.Expression.land_id == land_id,
-                models.Expression.relevance == 0,
-                models.Expression.approved_at.isnot(None),
-            )
-            .values(approved_at=None)
-        )
-        db.commit()
 
-        end_time = datetime.now(timezone.utc)
-        duration = (end_time - start_time).total_seconds()
+@celery_app.task
+def consolidate_expressions_chunk_task(
+    land_id: int, expression_ids: List[int], dictionary: Dict[str, float]
+) -> Dict[str, int]:
+    """Consolide un sous-ensemble des expressions d'un land (membre du chord)."""
+    db = SessionLocal()
+    try:
+        return _consolidate_expressions(db, land_id, expression_ids, dictionary)
+    finally:
+        db.close()
 
-        logger.info("=" * 60)
-        logger.info("[CONSOLIDATE] DONE - land=%s processed=%d errors=%d links=%d media=%d exprs_added=%d duration=%.1fs",
-                    land_id, stats["processed"], stats["errors"], stats["links_rebuilt"],
-                    stats["media_rebuilt"], stats["expressions_added"], duration)
-        logger.info("=" * 60)
 
-        return {
-            **stats,
-            "status": "completed",
-            "duration_seconds": duration,
-        }
+@celery_app.task
+def finalize_consolidation_task(
+    chunk_stats: List[Dict[str, int]], land_id: int, started_at: str
+) -> Dict[str, Any]:
+    """Callback du chord : additionne les statistiques et repare approved_at."""
+    stats = _empty_stats()
+    for partial in chunk_stats:
+        for key in stats:
+            stats[key] += partial.get(key, 0)
 
-    except Exception as exc:
-        logger.exception("[CONSOLIDATE] FAILED land=%s: %s", land_id, exc)
-        db.rollback()
-        return {**stats, "status": "failed", "error": str(exc)}
+    db = SessionLocal()
+    try:
+        _repair_approved_at(db, land_id)
     finally:
         db.close()
+    return _completed(land_id, stats, datetime.fromisoformat(started_at))
@@ -9,11 +9,13 @@ Tâche Celery pour Domain Crawl V2 SYNC
 Tâche background pour crawler les domaines en batch.
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 from datetime import datetime
 import logging
 
-from app.core.celery_app import celery_app
+from app.config import settings
+from app.core.celery_app import celery_app, throttled_update_state
 from app.db.session import get_sync_db_context
 from app.db.models import Domain
 from app.core.domain_crawler import DomainCrawler
@@ -21,6 +23,9 @@ from app.services.domain_crawl_service import DomainCrawlService
 
 logger = logging.getLogger(__name__)
 
+# Nombre de domaines mis à jour par commit dans domain_crawl_task
+COMMIT_EVERY = 50
+
 
 @celery_app.task(name="domain_crawl", bind=True)
 def domain_crawl_task(
@@ -96,60 +101,69 @@ def domain_crawl_task(
             # Initialiser le crawler
             crawler = DomainCrawler()
 
-            # Crawler chaque domaine
-            for i, domain in enumerate(domains, 1):
-                try:
-                    logger.info(f"Crawling {i}/{len(domains)}: {domain.name}")
-
-                    # Fetch le domaine
-                    fetch_result = crawler.fetch_domain(domain.name)
-
-                    # Mettre à jour directement le domain object
-                    domain.title = fetch_result.title
-                    domain.description = fetch_result.description
-                    domain.keywords = fetch_result.keywords
-                    domain.language = fetch_result.language
-                    domain.http_status = str(fetch_result.http_status) if fetch_result.http_status else None
-                    domain.fetched_at = fetch_result.fetched_at
-                    domain.last_crawled = fetch_result.fetched_at
-
-                    service.db.commit()
-                    logger.info(f"Saved fetch result for {domain.name}")
-
-                    # Mettre à jour les stats
-                    stats["processed"] += 1
-
-                    if fetch_result.http_status == 200:
-                        stats["success"] += 1
-                    else:
+            # Fetch en parallèle (I/O réseau) ; la session DB reste sur ce thread
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(settings.DOMAIN_CRAWL_CONCURRENCY, len(domains)))
+            ) as executor:
+                futures = {
+                    executor.submit(crawler.fetch_domain, domain.name): domain
+                    for domain in domains
+                }
+
+                # Enregistrer chaque domaine dès que son fetch est terminé
+                last_progress = float("-inf")
+                for i, future in enumerate(as_completed(futures), 1):
+                    domain = futures[future]
+                    try:
+                        fetch_result = future.result()
+
+                        # Mettre à jour directement le domain object
+                        domain.title = fetch_result.title
+                        domain.description = fetch_result.description
+                        domain.keywords = fetch_result.keywords
+                        domain.language = fetch_result.language
+                        domain.http_status = str(fetch_result.http_status) if fetch_result.http_status else None
+                        domain.fetched_at = fetch_result.fetched_at
+                        domain.last_crawled = fetch_result.fetched_at
+
+                        # Mettre à jour les stats
+                        stats["processed"] += 1
+
+                        if fetch_result.http_status == 200:
+                            stats["success"] += 1
+                        else:
+                            stats["errors"] += 1
+
+                        stats["by_source"][fetch_result.source_method] += 1
+
+                        # Mettre à jour la progression du job
+                        # (au plus une publication par seconde vers le backend)
+                        last_progress = throttled_update_state(
+                            self,
+                            last_progress,
+                            current=i,
+                            total=len(domains),
+                            percent=int((i / len(domains)) * 100),
+                            domain=domain.name,
+                            http_status=fetch_result.http_status,
+                            source=fetch_result.source_method,
+                        )
+
+                        logger.info(
+                            f"✅ {domain.name} - HTTP {fetch_result.http_status} "
+                            f"via {fetch_result.source_method} ({i}/{len(domains)})"
+                        )
+
+                    except Exception as e:
+                        logger.error(f"❌ Error crawling {domain.name}: {e}", exc_info=True)
                         stats["errors"] += 1
+                        stats["by_source"]["error"] += 1
 
-                    stats["by_source"][fetch_result.source_method] += 1
-
-                    # Mettre à jour la progression du job
-                    progress = int((i / len(domains)) * 100)
-                    self.update_state(
-                        state='PROGRESS',
-                        meta={
-                            'current': i,
-                            'total': len(domains),
-                            'percent': progress,
-                            'domain': domain.name,
-                            'http_status': fetch_result.http_status,
-                            'source': fetch_result.source_method
-                        }
-                    )
+                    if i % COMMIT_EVERY == 0:
+                        service.db.commit()
 
-                    logger.info(
-                        f"✅ {domain.name} - HTTP {fetch_result.http_status} "
-                        f"via {fetch_result.source_method} ({i}/{len(domains)})"
-                    )
-
-                except Exception as e:
-                    logger.error(f"❌ Error crawling {domain.name}: {e}", exc_info=True)
-                    stats["errors"] += 1
-                    stats["by_source"]["error"] += 1
-                    continue
+            # Commit des derniers domaines mis à jour
+            service.db.commit()
 
             # Fermer le crawler
             if crawler:
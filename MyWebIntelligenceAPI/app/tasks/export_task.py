@@ -1,8 +1,7 @@
 """
 Tâche Celery pour l'exportation
 """
-import asyncio
-from app.core.celery_app import celery_app
+from app.core.celery_app import celery_app, run_async
 from app.services.export_service import ExportService
 from app.db.base import AsyncSessionLocal
 from app.crud import crud_land
@@ -28,4 +27,4 @@ def export_land_task(self, land_id: int, export_type: str, minimum_relevance: in
         finally:
             await db.close()
 
-    return asyncio.run(async_export())
+    return run_async(async_export())
@@ -3,16 +3,26 @@ Celery tasks for export operations
 Based on the old crawler export functionality
 """
 
+import logging
 import os
+import tempfile
+import time
 import uuid
 from typing import Dict, Any
-from celery import current_task
+from celery import chord, current_task, group
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.celery_app import celery_app
+from app.core.celery_app import celery_app, throttled_update_state
+from app.db import models
 from app.db.session import SessionLocal
 from app.services.export_service_sync import SyncExportService
-from app.crud.crud_land import land as land_crud
+
+logger = logging.getLogger(__name__)
+
+# Export files removed by cleanup_export_files_task: export_*_*.{csv,gexf,zip}
+EXPORT_FILE_SUFFIXES = ('.csv', '.gexf', '.zip')
+# create_export_task result fields kept in a batch item result (chord payload)
+BATCH_ITEM_RESULT_KEYS = ('export_type', 'land_id', 'file_path', 'record_count')
 
 
 @celery_app.task(bind=True)
@@ -51,18 +61,12 @@ def create_export_task(
             }
         )
         
-        # Create sync session for Celery (Celery workers run in sync context)
-        from app.db.base import engine
-        from sqlalchemy.orm import sessionmaker, Session
-        
-        # Create sync sessionmaker
-        SyncSessionLocal = sessionmaker(bind=engine.sync_engine)
-        
-        db: Session = SyncSessionLocal()
+        # Sync session from the shared psycopg2 pool (Celery workers run in sync context)
+        db = SessionLocal()
         
         try:
             # Validate land exists
-            land = db.query(land_crud.model).filter(land_crud.model.id == land_id).first()
+            land = db.query(models.Land).filter(models.Land.id == land_id).first()
             if not land:
                 raise ValueError(f"Land with ID {land_id} not found")
             
@@ -77,10 +81,6 @@ def create_export_task(
                 }
             )
             
-            # Create export service (we'll need a sync version or async wrapper)
-            # For now, let's create a synchronous version of the export
-            from app.services.export_service_sync import SyncExportService
-            
             export_service = SyncExportService(db)
             
             # Update progress
@@ -153,96 +153,107 @@ def batch_export_task(
 ) -> Dict[str, Any]:
     """
     Celery task for batch exports
-    
+
+    Dispatches one export per request as a chord instead of waiting on each
+    export in turn; the aggregated summary is the result of
+    finalize_batch_export_task (see finalize_task_id).
+
     Args:
         export_requests: List of export request dictionaries
         user_id: ID of the user requesting the exports
-        
+
     Returns:
-        Dictionary with batch export results
+        Dictionary with the dispatch summary
     """
     task_id = self.request.id
     total_requests = len(export_requests)
-    results = []
-    
+
+    if not export_requests:
+        return finalize_batch_export_task.run([], total_requests, task_id)
+
+    header = group(
+        batch_export_item_task.s(i, request, user_id)
+        for i, request in enumerate(export_requests)
+    )
+    result = chord(header)(finalize_batch_export_task.s(total_requests, task_id))
+
+    return {
+        'progress': 0,
+        'message': f'Batch export of {total_requests} requests dispatched',
+        'total_requests': total_requests,
+        'finalize_task_id': result.id,
+        'task_id': task_id
+    }
+
+
+@celery_app.task
+def batch_export_item_task(
+    request_index: int,
+    request: Dict[str, Any],
+    user_id: int = None
+) -> Dict[str, Any]:
+    """
+    Chord member of batch_export_task: runs one export in this worker
+
+    Failures are returned rather than raised so that one failed export does
+    not prevent the batch summary. Only BATCH_ITEM_RESULT_KEYS are kept: the
+    item result travels through the result backend to the chord callback.
+    """
     try:
-        self.update_state(
-            state='STARTED',
-            meta={
-                'progress': 0,
-                'message': f'Starting batch export of {total_requests} requests',
-                'total_requests': total_requests
-            }
-        )
-        
-        for i, request in enumerate(export_requests):
-            try:
-                # Update progress
-                progress = int((i / total_requests) * 100)
-                self.update_state(
-                    state='PROGRESS',
-                    meta={
-                        'progress': progress,
-                        'message': f'Processing request {i+1} of {total_requests}',
-                        'current_request': i + 1,
-                        'total_requests': total_requests
-                    }
-                )
-                
-                # Execute individual export
-                result = create_export_task.apply_async(
-                    args=[
-                        request['export_type'],
-                        request['land_id'],
-                        request.get('minimum_relevance', 1),
-                        user_id,
-                        request.get('filename')
-                    ]
-                ).get()
-                
-                results.append({
-                    'request_index': i,
-                    'success': True,
-                    'result': result
-                })
-                
-            except Exception as e:
-                results.append({
-                    'request_index': i,
-                    'success': False,
-                    'error': str(e)
-                })
-        
-        # Final result
-        successful_exports = sum(1 for r in results if r['success'])
-        failed_exports = total_requests - successful_exports
-        
+        result = create_export_task.apply(
+            args=[
+                request['export_type'],
+                request['land_id'],
+                request.get('minimum_relevance', 1),
+                user_id,
+                request.get('filename')
+            ],
+            throw=True
+        ).get()
         return {
-            'progress': 100,
-            'message': f'Batch export completed: {successful_exports} successful, {failed_exports} failed',
-            'total_requests': total_requests,
-            'successful_exports': successful_exports,
-            'failed_exports': failed_exports,
-            'results': results,
-            'task_id': task_id
+            'request_index': request_index,
+            'success': True,
+            'result': {key: result[key] for key in BATCH_ITEM_RESULT_KEYS}
+        }
+    except Exception as e:
+        return {
+            'request_index': request_index,
+            'success': False,
+            'error': str(e)
         }
-        
-    except Exception as exc:
-        self.update_state(
-            state='FAILURE',
-            meta={
-                'progress': 0,
-                'message': f'Batch export failed: {str(exc)}',
-                'error': str(exc)
-            }
-        )
-        raise exc
 
 
-@celery_app.task(bind=True)
+@celery_app.task
+def finalize_batch_export_task(
+    results: list,
+    total_requests: int,
+    batch_task_id: str = None
+) -> Dict[str, Any]:
+    """
+    Chord callback of batch_export_task: aggregates the per-request results
+    """
+    results = sorted(results, key=lambda r: r['request_index'])
+    successful_exports = sum(1 for r in results if r['success'])
+    failed_exports = total_requests - successful_exports
+
+    return {
+        'progress': 100,
+        'message': f'Batch export completed: {successful_exports} successful, {failed_exports} failed',
+        'total_requests': total_requests,
+        'successful_exports': successful_exports,
+        'failed_exports': failed_exports,
+        'results': results,
+        'task_id': batch_task_id
+    }
+
+
+@celery_app.task(bind=True, ignore_result=True)
 def cleanup_export_files_task(self, max_age_hours: int = 24) -> Dict[str, Any]:
     """
     Celery task to clean up old export files
+
+    Fire-and-forget: the result (with per-file details) is not stored in the
+    result backend, the summary is logged instead.
     
     Args:
         max_age_hours: Maximum age of files to keep in hours
@@ -250,10 +261,6 @@ def cleanup_export_files_task(self, max_age_hours: int = 24) -> Dict[str, Any]:
     Returns:
         Dictionary with cleanup results
     """
-    import tempfile
-    import time
-    from pathlib import Path
-    
     task_id = self.request.id
     
     try:
@@ -265,57 +272,61 @@ def cleanup_export_files_task(self, max_age_hours: int = 24) -> Dict[str, Any]:
             }
         )
         
-        temp_dir = Path(tempfile.gettempdir())
+        temp_dir = tempfile.gettempdir()
         current_time = time.time()
-        max_age_seconds = max_age_hours * 3600
+        # Files modified before cutoff are deleted
+        cutoff = current_time - max_age_hours * 3600
         
         deleted_files = []
         total_size_freed = 0
         
-        # Find export files
-        export_patterns = [
-            'export_*_*.csv',
-            'export_*_*.gexf', 
-            'export_*_*.zip'
-        ]
-        
-        files_to_check = []
-        for pattern in export_patterns:
-            files_to_check.extend(temp_dir.glob(pattern))
+        # Find export files (export_*_*.csv / .gexf / .zip) in a single
+        # directory pass; DirEntry caches the stat result
+        with os.scandir(temp_dir) as it:
+            files_to_check = [
+                entry for entry in it
+                if entry.name.startswith('export_')
+                and entry.name.endswith(EXPORT_FILE_SUFFIXES)
+                and '_' in entry.name[len('export_'):]
+                and entry.is_file()
+            ]
         
         total_files = len(files_to_check)
         
-        for i, file_path in enumerate(files_to_check):
+        last_progress = float('-inf')
+        for i, entry in enumerate(files_to_check):
             try:
-                # Update progress
-                progress = int((i / max(total_files, 1)) * 100)
-                self.update_state(
-                    state='PROGRESS',
-                    meta={
-                        'progress': progress,
-                        'message': f'Checking file {i+1} of {total_files}',
-                        'current_file': str(file_path.name)
-                    }
+                # Update progress (throttled: each update hits the result backend)
+                last_progress = throttled_update_state(
+                    self,
+                    last_progress,
+                    progress=int((i / max(total_files, 1)) * 100),
+                    message=f'Checking file {i+1} of {total_files}',
+                    current_file=entry.name,
                 )
                 
                 # Check file age
-                file_age = current_time - file_path.stat().st_mtime
+                stat = entry.stat()
                 
-                if file_age > max_age_seconds:
-                    file_size = file_path.stat().st_size
-                    file_path.unlink()
+                if stat.st_mtime < cutoff:
+                    os.unlink(entry.path)
                     
                     deleted_files.append({
-                        'filename': str(file_path.name),
-                        'size': file_size,
-                        'age_hours': round(file_age / 3600, 1)
+                        'filename': entry.name,
+                        'size': stat.st_size,
+                        'age_hours': round((current_time - stat.st_mtime) / 3600, 1)
                     })
-                    total_size_freed += file_size
+                    total_size_freed += stat.st_size
                     
             except Exception as e:
                 # Log error but continue with other files
                 continue
         
+        logger.info(
+            "Export cleanup: %d files deleted, %d bytes freed in %s",
+            len(deleted_files), total_size_freed, temp_dir,
+        )
+
         return {
             'progress': 100,
             'message': f'Cleanup completed: {len(deleted_files)} files deleted, {total_size_freed} bytes freed',
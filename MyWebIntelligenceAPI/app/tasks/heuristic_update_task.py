@@ -10,26 +10,72 @@ import json
 import logging
 import re
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Pattern, Tuple
 from urllib.parse import urlparse
 
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
 from app.core.celery_app import celery_app
 from app.db import models
 from app.db.session import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round-trip while streaming
+STREAM_BATCH_SIZE = 1000
+# Domains per INSERT and expressions per UPDATE/commit
+WRITE_BATCH_SIZE = 5000
+
+
+# {last label of the suffix (None if it has no dot):
+#     {suffix length: {suffix: (declaration order, compiled pattern)}}}
+CompiledHeuristics = Dict[Optional[str], Dict[int, Dict[str, Tuple[int, Pattern[str]]]]]
+
+
+def _compile_heuristics(heuristics: Dict[str, str]) -> CompiledHeuristics:
+    """
+    Compile heuristic patterns once, indexed for O(1) lookups.
+
+    A suffix containing a dot can only match a netloc ending with the same
+    last label ("twitter.com" needs a ".com" netloc), so suffixes are first
+    grouped by that label, then by length. Suffixes without a dot are kept
+    under None and checked for every netloc.
+    """
+    compiled: CompiledHeuristics = {}
+    for order, (key, pattern) in enumerate(heuristics.items()):
+        label = key.rpartition(".")[2] if "." in key else None
+        compiled.setdefault(label, {}).setdefault(len(key), {})[key] = (order, re.compile(pattern))
+    return compiled
 
-def _get_domain_name_sync(url: str, heuristics: Dict[str, str]) -> str:
+
+def _get_domain_name_sync(url: str, heuristics: CompiledHeuristics) -> str:
     """Extract domain name from URL, applying heuristic patterns."""
     try:
-        domain_name = urlparse(url).netloc
-        for key, pattern in heuristics.items():
-            if domain_name.endswith(key):
-                matches = re.findall(pattern, url)
-                if matches:
-                    domain_name = matches[0]
-                break
+        # Cheap netloc for scheme://netloc/... URLs, urlparse otherwise
+        parts = url.split("/", 3)
+        if len(parts) > 2 and parts[0].endswith(":") and not parts[1]:
+            domain_name = parts[2].split("?", 1)[0].split("#", 1)[0]
+        else:
+            domain_name = urlparse(url).netloc
+
+        # First declared suffix matching the end of the netloc (endswith
+        # semantics, as CRUDDomain.get_domain_name); most netlocs share no
+        # last label with any suffix and stop at the first lookup
+        best = None
+        for by_length in (heuristics.get(domain_name.rpartition(".")[2]), heuristics.get(None)):
+            if not by_length:
+                continue
+            for length, by_suffix in by_length.items():
+                candidate = by_suffix.get(domain_name[-length:])
+                if candidate is not None and (best is None or candidate[0] < best[0]):
+                    best = candidate
+        if best is not None:
+            pattern = best[1]
+            match = pattern.search(url)
+            if match:
+                # Same value as re.findall(...)[0] for 0 or 1 group
+                domain_name = match.group(1 if pattern.groups else 0)
         return domain_name
     except Exception:
         return ""
@@ -71,6 +117,7 @@ def heuristic_update_task(
 
     if not heuristics:
         return {"status": "completed", "updated": 0, "message": "No heuristics configured"}
+    compiled_heuristics = _compile_heuristics(heuristics)
 
     logger.info("=" * 60)
     logger.info("[HEURISTIC] START - land=%s heuristics=%s", land_id, list(heuristics.keys()))
@@ -79,74 +126,97 @@ def heuristic_update_task(
     stats = {"updated": 0, "errors": 0, "domains_created": 0, "processed": 0}
 
     try:
-        # Build domain name cache {id: name}
+        # Domain caches from (id, land_id, name) tuples, no ORM objects:
+        # {id: name} for the current domain, {(land_id, name): id} for targets
+        domain_query = select(models.Domain.id, models.Domain.land_id, models.Domain.name)
         if land_id:
-            domains = db.query(models.Domain).filter(models.Domain.land_id == land_id).all()
-        else:
-            domains = db.query(models.Domain).all()
-        domain_cache = {d.id: d.name for d in domains}
-
-        # Select expressions
-        query = db.query(models.Expression)
+            domain_query = domain_query.where(models.Domain.land_id == land_id)
+        domain_cache: Dict[int, str] = {}
+        domain_ids: Dict[Tuple[int, str], int] = {}
+        for domain_id, domain_land_id, domain_name in db.execute(domain_query):
+            domain_cache[domain_id] = domain_name
+            domain_ids[(domain_land_id, domain_name)] = domain_id
+
+        # Stream (id, url, land_id, domain_id) tuples instead of hydrating
+        # full Expression objects
+        expr_query = select(
+            models.Expression.id,
+            models.Expression.url,
+            models.Expression.land_id,
+            models.Expression.domain_id,
+        )
         if land_id:
-            query = query.filter(models.Expression.land_id == land_id)
-        expressions = query.all()
+            expr_query = expr_query.where(models.Expression.land_id == land_id)
+        rows = db.execute(
+            expr_query.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE)
+        )
 
-        total = len(expressions)
-        logger.info("[HEURISTIC] %d expressions to process", total)
+        # Expression ids to move, grouped by target (land_id, domain name);
+        # nothing is written while the cursor is open
+        moves: Dict[Tuple[int, str], List[int]] = {}
 
-        for i, expr in enumerate(expressions):
+        for i, (expr_id, url, expr_land_id, domain_id) in enumerate(rows):
             try:
-                if not expr.url:
+                if not url:
                     continue
 
-                new_domain_name = _get_domain_name_sync(expr.url, heuristics)
+                new_domain_name = _get_domain_name_sync(url, compiled_heuristics)
                 if not new_domain_name:
                     continue
 
-                current_domain_name = domain_cache.get(expr.domain_id, "")
-
-                if new_domain_name != current_domain_name:
-                    # Find or create the target domain
-                    expr_land_id = expr.land_id
-                    target_domain = (
-                        db.query(models.Domain)
-                        .filter(
-                            models.Domain.land_id == expr_land_id,
-                            models.Domain.name == new_domain_name,
-                        )
-                        .first()
-                    )
-
-                    if not target_domain:
-                        target_domain = models.Domain(
-                            land_id=expr_land_id,
-                            name=new_domain_name,
-                        )
-                        db.add(target_domain)
-                        db.flush()
-                        domain_cache[target_domain.id] = new_domain_name
-                        stats["domains_created"] += 1
-
-                    expr.domain_id = target_domain.id
+                if new_domain_name != domain_cache.get(domain_id, ""):
+                    moves.setdefault((expr_land_id, new_domain_name), []).append(expr_id)
                     stats["updated"] += 1
 
                 stats["processed"] += 1
 
-                if (i + 1) % 100 == 0:
-                    db.commit()
-                    logger.info(
-                        "[HEURISTIC] [%d/%d] %d updated, %d domains created",
-                        i + 1, total, stats["updated"], stats["domains_created"],
-                    )
+                if (i + 1) % STREAM_BATCH_SIZE == 0:
+                    logger.info("[HEURISTIC] [%d] %d to update", i + 1, stats["updated"])
 
             except Exception as e:
                 stats["errors"] += 1
-                logger.error("[HEURISTIC] ERROR expr=%s: %s", expr.id, e)
-                db.rollback()
+                logger.error("[HEURISTIC] ERROR expr=%s: %s", expr_id, e)
+
+        # Create all missing target domains, one INSERT ... RETURNING per chunk
+        missing = [key for key in moves if key not in domain_ids]
+        for start in range(0, len(missing), WRITE_BATCH_SIZE):
+            chunk = missing[start:start + WRITE_BATCH_SIZE]
+            insert_stmt = pg_insert(models.Domain).values([
+                {"land_id": domain_land_id, "name": domain_name}
+                for domain_land_id, domain_name in chunk
+            ])
+            # ON CONFLICT: a domain created concurrently is reused, not an error
+            insert_stmt = insert_stmt.on_conflict_do_update(
+                constraint="uq_domain_land_name",
+                set_={"name": insert_stmt.excluded.name},
+            ).returning(models.Domain.land_id, models.Domain.name, models.Domain.id)
+            for domain_land_id, domain_name, domain_id in db.execute(insert_stmt):
+                domain_ids[(domain_land_id, domain_name)] = domain_id
+            stats["domains_created"] += len(chunk)
+        db.commit()
 
+        # One UPDATE ... WHERE id IN (...) per target domain, one commit per
+        # WRITE_BATCH_SIZE expressions
+        pending = 0
+        for key, expr_ids in moves.items():
+            for start in range(0, len(expr_ids), WRITE_BATCH_SIZE):
+                chunk_ids = expr_ids[start:start + WRITE_BATCH_SIZE]
+                db.execute(
+                    update(models.Expression.__table__)
+                    .where(models.Expression.id.in_(chunk_ids))
+                    .values(domain_id=domain_ids[key])
+                )
+                pending += len(chunk_ids)
+                if pending >= WRITE_BATCH_SIZE:
+                    db.commit()
+                    pending = 0
         db.commit()
 
+        logger.info(
+            "[HEURISTIC] %d expressions moved to %d domains (%d created)",
+            stats["updated"], len(moves), stats["domains_created"],
+        )
+
         duration = (datetime.now(timezone.utc) - start_time).total_seconds()
         logger.info("=" * 60)
         logger.info(
@@ -4,13 +4,20 @@ Telecharge et analyse les images associees aux expressions d'un land.
 """
 
 import logging
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait,
+)
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Iterator, Optional, List, Sequence, Tuple
 
 import httpx
+from celery import chord
+from sqlalchemy import bindparam, func, select, update
 
+from app.config import settings
 from app.core.celery_app import celery_app
-from app.core.media_processor import MediaProcessorSync
+from app.core.media_processor import MediaProcessorSync, analyze_image_bytes
 from app.db import models
 from app.db.models import CrawlStatus
 from app.db.session import SessionLocal
@@ -18,6 +25,185 @@ from app.db.session import SessionLocal
 logger = logging.getLogger(__name__)
 
 
+# UPDATE Core execute en executemany : le SET reprend les cles des parametres
+# (colonnes de Media), sans le suivi d'attributs de l'UPDATE ORM par cle primaire
+_MEDIA_UPDATE = (
+    update(models.Media.__table__)
+    .where(models.Media.__table__.c.id == bindparam("media_id"))
+)
+
+
+def _media_update(media_id: int, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Parametres de _MEDIA_UPDATE pour un media analyse (colonnes du modele Media)."""
+    return {
+        "media_id": media_id,
+        "width": analysis.get("width"),
+        "height": analysis.get("height"),
+        "file_size": analysis.get("file_size"),
+        "format": analysis.get("format"),
+        "color_mode": analysis.get("color_mode"),
+        "has_transparency": analysis.get("has_transparency"),
+        "aspect_ratio": analysis.get("aspect_ratio"),
+        "mime_type": analysis.get("mime_type"),
+        "exif_data": analysis.get("exif_data"),
+        "image_hash": analysis.get("image_hash"),
+        "dominant_colors": analysis.get("dominant_colors", []),
+        "websafe_colors": analysis.get("websafe_colors"),
+        "is_processed": True,
+        "processed_at": datetime.now(timezone.utc),
+    }
+
+
+def _analysis_executor(media_count: int) -> Executor:
+    """Pool de l'etape CPU : threads par defaut, processus si configure (hors prefork)."""
+    workers = settings.MEDIA_ANALYSIS_CPU_WORKERS or os.cpu_count() or 1
+    workers = max(1, min(workers, media_count))
+    if settings.MEDIA_ANALYSIS_USE_PROCESSES:
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers)
+
+
+def _analyze_pipeline(
+    processor: MediaProcessorSync,
+    media_items: Sequence[Tuple[int, str]],
+    download_pool: Executor,
+    analysis_pool: Executor,
+) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+    """
+    Telecharge (I/O) et analyse (CPU) les images sur deux pools distincts.
+
+    Chaque image telechargee part aussitot a l'analyse pendant que les autres
+    telechargements continuent. Au plus MEDIA_ANALYSIS_QUEUE_SIZE images sont
+    en cours (telechargement ou analyse), ce qui borne la memoire.
+    Produit (media_id, url, analyse) dans l'ordre de fin de traitement.
+    """
+    items = iter(media_items)
+    owners: Dict[Future, Tuple[int, str, bool]] = {}  # future -> (id, url, telechargement ?)
+
+    def next_download() -> None:
+        item = next(items, None)
+        if item is not None:
+            media_id, media_url = item
+            owners[download_pool.submit(processor.download_image, media_url)] = (media_id, media_url, True)
+
+    for _ in range(max(1, settings.MEDIA_ANALYSIS_QUEUE_SIZE)):
+        next_download()
+
+    while owners:
+        finished, _ = wait(owners, return_when=FIRST_COMPLETED)
+        for future in finished:
+            media_id, media_url, is_download = owners.pop(future)
+            try:
+                if is_download:
+                    content, mime_type = future.result()
+                    analysis_future = analysis_pool.submit(analyze_image_bytes, media_url, content, mime_type)
+                    owners[analysis_future] = (media_id, media_url, False)
+                    continue
+                analysis = future.result()
+            except Exception as e:
+                analysis = {"error": str(e)}
+            # Image sortie du pipeline : sa place passe au telechargement suivant
+            next_download()
+            yield media_id, media_url, analysis
+
+
+def _analyze_media(
+    db,
+    media_items: Sequence[Tuple[int, str]],
+    batch_size: int,
+    on_progress: Callable[[int], None],
+) -> Dict[str, int]:
+    """
+    Analyse une liste de medias (id, url) et enregistre les resultats par lot.
+
+    on_progress(done) est appele avant chaque commit de lot, avec le nombre
+    de medias traites jusque-la.
+    """
+    stats = {"analyzed": 0, "failed": 0}
+
+    # Telechargements (threads, I/O reseau) et analyses (CPU) en pipeline,
+    # sans DB ; les mises a jour restent sur ce thread, la Session n'etant
+    # pas thread-safe
+    concurrency = max(1, min(settings.MEDIA_ANALYSIS_CONCURRENCY, len(media_items)))
+    limits = httpx.Limits(max_connections=2 * concurrency, max_keepalive_connections=2 * concurrency)
+    with httpx.Client(timeout=30.0, follow_redirects=True, limits=limits) as http_client, \
+            ThreadPoolExecutor(max_workers=concurrency) as download_pool, \
+            _analysis_executor(len(media_items)) as analysis_pool:
+        processor = MediaProcessorSync(db, http_client)
+        batch_size = max(1, batch_size)
+        pending: List[Dict[str, Any]] = []  # mises a jour depuis le dernier commit
+
+        results = _analyze_pipeline(processor, media_items, download_pool, analysis_pool)
+        for i, (media_id, media_url, analysis) in enumerate(results):
+            try:
+                if analysis.get("error"):
+                    stats["failed"] += 1
+                    logger.warning("[MEDIA] FAIL %s: %s", media_url, analysis["error"])
+                else:
+                    pending.append(_media_update(media_id, analysis))
+                    stats["analyzed"] += 1
+                    logger.info("[MEDIA] [%d/%d] OK %s (%dx%d)", i + 1, len(media_items), media_url,
+                                analysis.get("width", 0), analysis.get("height", 0))
+
+            except Exception as e:
+                stats["failed"] += 1
+                logger.error("[MEDIA] ERROR %s: %s", media_url, e)
+
+            # Un UPDATE groupe (par cle primaire) et un commit par lot de
+            # batch_size medias, progression du job incluse
+            done = i + 1
+            if done % batch_size == 0 or done == len(media_items):
+                try:
+                    on_progress(done)
+                    if pending:
+                        db.execute(_MEDIA_UPDATE, pending)
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    stats["analyzed"] -= len(pending)
+                    stats["failed"] += len(pending)
+                    logger.error("[MEDIA] ERROR commit (%d medias): %s", len(pending), e)
+                pending = []
+
+    return stats
+
+
+def _complete_job(
+    db,
+    job: Optional[models.CrawlJob],
+    land_id: int,
+    stats: Dict[str, int],
+    start_time: datetime,
+    depth: int,
+    minrel: float,
+) -> Dict[str, Any]:
+    """Statistiques finales ; marque le job termine s'il existe."""
+    end_time = datetime.now(timezone.utc)
+    duration = (end_time - start_time).total_seconds()
+
+    logger.info("=" * 60)
+    logger.info("[MEDIA] DONE - land=%s analyzed=%d failed=%d duration=%.1fs",
+                land_id, stats["analyzed"], stats["failed"], duration)
+    logger.info("=" * 60)
+
+    result_data = {
+        **stats,
+        "status": "completed",
+        "land_id": land_id,
+        "duration_seconds": duration,
+        "filters": {"depth": depth, "minrel": minrel},
+    }
+
+    if job:
+        job.status = CrawlStatus.COMPLETED
+        job.completed_at = end_time
+        job.progress = 1.0
+        job.result_data = result_data
+        db.commit()
+
+    return result_data
+
+
 @celery_app.task(name="tasks.analyze_land_media_task", bind=True)
 def analyze_land_media_task(
     self,
@@ -32,6 +218,10 @@ def analyze_land_media_task(
 
     Selectionne les medias non traites des expressions correspondant aux filtres,
     telecharge et analyse chaque image (dimensions, couleurs, hash, EXIF).
+
+    Au-dela de MEDIA_ANALYSIS_CHUNK_SIZE medias, le travail est reparti en un
+    chord de analyze_media_chunk_task ; le job est alors termine par
+    finalize_media_analysis_task.
     """
     db = SessionLocal()
     start_time = datetime.now(timezone.utc)
@@ -57,23 +247,19 @@ def analyze_land_media_task(
             job.started_at = datetime.now(timezone.utc)
             db.commit()
 
-        # Recuperer les expression_ids filtres
-        expr_query = (
-            db.query(models.Expression.id)
-            .filter(
-                models.Expression.land_id == land_id,
-                models.Expression.approved_at.isnot(None),
-                models.Expression.http_status == 200,
-            )
-        )
+        # Filtres des expressions, appliques en SQL (jointure) plutot que via
+        # une liste d'ids en IN (...) qui peut atteindre des centaines de milliers
+        expr_filters = [
+            models.Expression.land_id == land_id,
+            models.Expression.approved_at.isnot(None),
+            models.Expression.http_status == 200,
+        ]
         if depth is not None and depth < 999:
-            expr_query = expr_query.filter(models.Expression.depth <= depth)
+            expr_filters.append(models.Expression.depth <= depth)
         if minrel > 0:
-            expr_query = expr_query.filter(models.Expression.relevance >= minrel)
-
-        expression_ids = [row[0] for row in expr_query.all()]
+            expr_filters.append(models.Expression.relevance >= minrel)
 
-        if not expression_ids:
+        if db.query(models.Expression.id).filter(*expr_filters).first() is None:
             logger.info("[MEDIA] Aucune expression correspondante pour land %s", land_id)
             result = {**stats, "status": "completed", "message": "No matching expressions"}
             if job:
@@ -84,17 +270,17 @@ def analyze_land_media_task(
             db.close()
             return result
 
-        # Recuperer les medias non traites (images)
-        media_items = (
-            db.query(models.Media)
-            .filter(
-                models.Media.expression_id.in_(expression_ids),
+        # Recuperer les medias non traites (images) : (id, url) seulement
+        media_items = db.execute(
+            select(models.Media.id, models.Media.url)
+            .join(models.Expression, models.Expression.id == models.Media.expression_id)
+            .where(
+                *expr_filters,
                 models.Media.type == "img",
                 (models.Media.is_processed.is_(None)) | (models.Media.is_processed == False),
             )
             .order_by(models.Media.id.asc())
-            .all()
-        )
+        ).all()
 
         stats["total_media"] = len(media_items)
 
@@ -111,77 +297,36 @@ def analyze_land_media_task(
 
         logger.info("[MEDIA] %d medias a analyser", len(media_items))
 
-        # Traiter les medias avec un client HTTP synchrone
-        with httpx.Client(timeout=30.0, follow_redirects=True) as http_client:
-            processor = MediaProcessorSync(db, http_client)
-
-            for i, media in enumerate(media_items):
-                try:
-                    logger.info("[MEDIA] [%d/%d] %s", i + 1, len(media_items), media.url)
-
-                    analysis = processor.analyze_image(media.url)
-
-                    if analysis.get("error"):
-                        stats["failed"] += 1
-                        logger.warning("[MEDIA] FAIL %s: %s", media.url, analysis["error"])
-                    else:
-                        # Mettre a jour le media
-                        media.width = analysis.get("width")
-                        media.height = analysis.get("height")
-                        media.file_size = analysis.get("file_size")
-                        media.metadata_ = {
-                            "format": analysis.get("format"),
-                            "color_mode": analysis.get("color_mode"),
-                            "has_transparency": analysis.get("has_transparency"),
-                            "aspect_ratio": analysis.get("aspect_ratio"),
-                            "mime_type": analysis.get("mime_type"),
-                            "exif_data": analysis.get("exif_data"),
-                            "image_hash": analysis.get("image_hash"),
-                        }
-                        media.dominant_colors = analysis.get("dominant_colors", [])
-                        media.is_processed = True
-                        media.analyzed_at = datetime.now(timezone.utc)
-
-                        db.commit()
-                        stats["analyzed"] += 1
-                        logger.info("[MEDIA] OK %s (%dx%d)", media.url,
-                                    analysis.get("width", 0), analysis.get("height", 0))
-
-                    # Update job progress
-                    if job and len(media_items) > 0:
-                        job.progress = (i + 1) / len(media_items)
-                        db.commit()
-
-                except Exception as e:
-                    db.rollback()
-                    stats["failed"] += 1
-                    logger.error("[MEDIA] ERROR %s: %s", media.url, e)
-
-        # Finaliser
-        end_time = datetime.now(timezone.utc)
-        duration = (end_time - start_time).total_seconds()
-
-        logger.info("=" * 60)
-        logger.info("[MEDIA] DONE - land=%s analyzed=%d failed=%d duration=%.1fs",
-                    land_id, stats["analyzed"], stats["failed"], duration)
-        logger.info("=" * 60)
+        chunk_size = max(1, settings.MEDIA_ANALYSIS_CHUNK_SIZE)
+        if len(media_items) > chunk_size:
+            # Repartition sur les workers : un chord de sous-taches, le job
+            # est finalise par finalize_media_analysis_task
+            chunks = [
+                [tuple(item) for item in media_items[i:i + chunk_size]]
+                for i in range(0, len(media_items), chunk_size)
+            ]
+            db.close()
+            result = chord(
+                analyze_media_chunk_task.s(job_id, chunk, len(media_items), batch_size)
+                for chunk in chunks
+            )(finalize_media_analysis_task.s(job_id, land_id, depth, minrel, start_time.isoformat()))
+            logger.info("[MEDIA] %d chunks dispatches (chord %s)", len(chunks), result.id)
+            return {
+                **stats,
+                "status": "dispatched",
+                "chunks": len(chunks),
+                "finalize_task_id": result.id,
+            }
 
-        result_data = {
-            **stats,
-            "status": "completed",
-            "land_id": land_id,
-            "duration_seconds": duration,
-            "filters": {"depth": depth, "minrel": minrel},
-        }
+        def on_progress(done: int) -> None:
+            if job:
+                job.progress = done / len(media_items)
 
-        if job:
-            job.status = CrawlStatus.COMPLETED
-            job.completed_at = end_time
-            job.progress = 1.0
-            job.result_data = result_data
-            db.commit()
+        chunk_stats = _analyze_media(db, media_items, batch_size, on_progress)
+        stats["analyzed"] += chunk_stats["analyzed"]
+        stats["failed"] += chunk_stats["failed"]
 
-        return result_data
+        return _complete_job(db, job, land_id, stats, start_time, depth, minrel)
 
     except Exception as exc:
         logger.exception("[MEDIA] FAILED job=%s: %s", job_id, exc)
@@ -196,3 +341,63 @@ def analyze_land_media_task(
         return {**stats, "status": "failed", "error": str(exc)}
     finally:
         db.close()
+
+
+@celery_app.task(name="tasks.analyze_media_chunk_task")
+def analyze_media_chunk_task(
+    job_id: int,
+    media_items: List[Tuple[int, str]],
+    total_media: int,
+    batch_size: int = 50,
+) -> Dict[str, int]:
+    """
+    Analyse un sous-ensemble des medias d'un land (membre du chord).
+
+    La progression du job avance par increment atomique, les chunks
+    s'executant en parallele sur plusieurs workers. Une erreur inattendue
+    est comptee en echecs plutot que levee, pour ne pas bloquer le chord.
+    """
+    db = SessionLocal()
+    reported = 0
+
+    def on_progress(done: int) -> None:
+        nonlocal reported
+        db.execute(
+            update(models.CrawlJob)
+            .where(models.CrawlJob.id == job_id)
+            .values(progress=func.coalesce(models.CrawlJob.progress, 0.0) + (done - reported) / total_media)
+        )
+        reported = done
+
+    try:
+        return _analyze_media(db, media_items, batch_size, on_progress)
+    except Exception as exc:
+        logger.exception("[MEDIA] FAILED chunk job=%s: %s", job_id, exc)
+        db.rollback()
+        return {"analyzed": 0, "failed": len(media_items)}
+    finally:
+        db.close()
+
+
+@celery_app.task(name="tasks.finalize_media_analysis_task")
+def finalize_media_analysis_task(
+    chunk_stats: List[Dict[str, int]],
+    job_id: int,
+    land_id: int,
+    depth: int,
+    minrel: float,
+    started_at: str,
+) -> Dict[str, Any]:
+    """Callback du chord : additionne les statistiques et termine le job."""
+    stats = {"total_media": 0, "analyzed": 0, "failed": 0, "skipped": 0}
+    for partial in chunk_stats:
+        stats["analyzed"] += partial.get("analyzed", 0)
+        stats["failed"] += partial.get("failed", 0)
+    stats["total_media"] = stats["analyzed"] + stats["failed"]
+
+    db = SessionLocal()
+    try:
+        job = db.query(models.CrawlJob).filter(models.CrawlJob.id == job_id).first()
+        return _complete_job(db, job, land_id, stats, datetime.fromisoformat(started_at), depth, minrel)
+    finally:
+        db.close()
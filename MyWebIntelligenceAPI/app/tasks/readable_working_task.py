@@ -3,10 +3,20 @@ Tache Celery pour le pipeline readable (V2 sync).
 Extrait le contenu lisible des expressions crawlees via Trafilatura/fallbacks.
 """
 
+import asyncio
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
+import httpx
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import load_only
+
+from app.config import settings
 from app.core.celery_app import celery_app
 from app.core.content_extractor import get_readable_content_with_fallbacks
 from app.db import models
@@ -15,6 +25,22 @@ from app.db.session import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# Colonnes lues par le pipeline readable (merge et extraction)
+_READABLE_COLUMNS = (
+    models.Expression.id,
+    models.Expression.url,
+    models.Expression.content,
+    models.Expression.readable,
+    models.Expression.title,
+    models.Expression.description,
+    models.Expression.lang,
+    models.Expression.depth,
+)
+# Taille des pages d'expressions chargees en memoire a la fois
+READABLE_PAGE_SIZE = 200
+# Nombre d'expressions traitees par commit (progression du job comprise)
+COMMIT_EVERY = 25
+
 
 def _apply_merge(expr: models.Expression, result: Dict[str, Any], strategy: str) -> Dict[str, str]:
     """
@@ -80,20 +106,95 @@ def _apply_merge(expr: models.Expression, result: Dict[str, Any], strategy: str)
     return changes
 
 
-def _extract_content_sync(url: str, html: Optional[str] = None) -> Dict[str, Any]:
-    """Extraction de contenu synchrone via asyncio.run."""
-    import asyncio
+def _create_links(db, land_id: int, source_id: int, links: Iterable[Any]) -> int:
+    """
+    Cree les liens sortants vers les expressions connues du land.
+
+    Une requete pour resoudre les cibles, un INSERT ... ON CONFLICT DO NOTHING
+    (contrainte uq_expression_link) au lieu d'un SELECT par lien existant.
+    Retourne le nombre de liens reellement crees.
+    """
+    urls = {link_url for link_url in links if link_url and isinstance(link_url, str)}
+    if not urls:
+        return 0
+    target_ids = {
+        target_id
+        for (target_id,) in db.query(models.Expression.id).filter(
+            models.Expression.land_id == land_id,
+            models.Expression.url.in_(urls),
+        )
+        if target_id != source_id
+    }
+    if not target_ids:
+        return 0
+    result = db.execute(
+        pg_insert(models.ExpressionLink)
+        .values([
+            {"source_id": source_id, "target_id": target_id, "link_type": "internal"}
+            for target_id in target_ids
+        ])
+        .on_conflict_do_nothing(constraint="uq_expression_link")
+    )
+    return result.rowcount
+
+
+def _create_media(db, expression_id: int, media_list: Iterable[Any]) -> int:
+    """
+    Cree les medias d'une expression en un seul INSERT ... ON CONFLICT DO NOTHING
+    (contrainte uq_media_expression_url) au lieu d'un SELECT par media.
+    Retourne le nombre de medias reellement crees.
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    for media_info in media_list:
+        if isinstance(media_info, dict):
+            media_url, media_type = media_info.get("url"), media_info.get("type", "img")
+        else:
+            media_url, media_type = getattr(media_info, "url", None), getattr(media_info, "type", "img")
+        if not media_url or media_url in rows:
+            continue
+        # url_hash explicite : l'INSERT groupe ne declenche pas before_insert
+        rows[media_url] = {
+            "expression_id": expression_id,
+            "url": media_url,
+            "url_hash": models.Media.compute_url_hash(media_url),
+            "type": media_type,
+        }
+    if not rows:
+        return 0
+    result = db.execute(
+        pg_insert(models.Media)
+        .values(list(rows.values()))
+        .on_conflict_do_nothing(constraint="uq_media_expression_url")
+    )
+    return result.rowcount
+
+
+def _iter_expressions(db, expression_ids: List[int]) -> Iterator[models.Expression]:
+    """
+    Charge les expressions par pages d'ids, dans l'ordre de expression_ids.
+
+    Pas de curseur serveur (yield_per) : les commits par lot le fermeraient.
+    """
+    for start in range(0, len(expression_ids), READABLE_PAGE_SIZE):
+        page = expression_ids[start:start + READABLE_PAGE_SIZE]
+        by_id = {
+            expr.id: expr
+            for expr in db.query(models.Expression)
+            .options(load_only(*_READABLE_COLUMNS))
+            .filter(models.Expression.id.in_(page))
+        }
+        yield from (by_id[expression_id] for expression_id in page if expression_id in by_id)
 
+
+def _extract_content_sync(
+    loop: asyncio.AbstractEventLoop,
+    url: str,
+    html: Optional[str] = None,
+    archive_client: Optional[httpx.AsyncClient] = None,
+) -> Dict[str, Any]:
+    """Extraction de contenu synchrone sur la boucle asyncio (persistante) du thread."""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(
-                get_readable_content_with_fallbacks(url, html)
-            )
-            return result
-        finally:
-            loop.close()
+        return loop.run_until_complete(get_readable_content_with_fallbacks(url, html, archive_client))
     except Exception as e:
         logger.error(f"Content extraction failed for {url}: {e}")
         return {
@@ -104,6 +205,59 @@ def _extract_content_sync(url: str, html: Optional[str] = None) -> Dict[str, Any
         }
 
 
+# Pool d'extraction du processus worker et boucle asyncio de chacun de ses
+# threads, crees au premier usage puis reutilises d'une tache a l'autre
+_extraction_pool: Optional[ThreadPoolExecutor] = None
+_extraction_pool_pid: Optional[int] = None
+_extraction_pool_lock = threading.Lock()
+_thread_state = threading.local()
+
+
+def _init_thread_loop() -> None:
+    _thread_state.loop = asyncio.new_event_loop()
+    # Client archive.org du thread, lie a sa boucle et vivant aussi longtemps
+    _thread_state.archive_client = httpx.AsyncClient(timeout=10.0)
+
+
+def _extract_in_thread(item: Tuple[str, Optional[str]]) -> Dict[str, Any]:
+    url, html = item
+    return _extract_content_sync(_thread_state.loop, url, html, _thread_state.archive_client)
+
+
+def _get_extraction_pool() -> ThreadPoolExecutor:
+    """Pool d'extraction partage du processus (recree apres un fork)."""
+    global _extraction_pool, _extraction_pool_pid
+    with _extraction_pool_lock:
+        if _extraction_pool is None or _extraction_pool_pid != os.getpid():
+            _extraction_pool = ThreadPoolExecutor(
+                max_workers=max(settings.READABLE_CONCURRENCY, 1),
+                initializer=_init_thread_loop,
+                thread_name_prefix="readable",
+            )
+            _extraction_pool_pid = os.getpid()
+        return _extraction_pool
+
+
+def _iter_extracted(
+    expressions: Iterator[models.Expression], workers: int
+) -> Iterator[Tuple[models.Expression, Dict[str, Any]]]:
+    """
+    Extrait le contenu des expressions par fenetres de `workers` en parallele
+    et rend les couples (expression, resultat) dans l'ordre.
+
+    L'extraction (trafilatura/lxml, fallback archive.org) tourne dans le pool
+    du processus, chaque thread gardant sa boucle asyncio ; les threads ne
+    recoivent que url et html, les objets ORM restent dans le thread appelant.
+    """
+    executor = _get_extraction_pool()
+    while True:
+        window = list(islice(expressions, workers))
+        if not window:
+            return
+        results = executor.map(_extract_in_thread, [(expr.url, expr.content) for expr in window])
+        yield from zip(window, results)
+
+
 @celery_app.task(name="readable_working_task", bind=True)
 def readable_working_task(
     self,
@@ -146,9 +300,9 @@ def readable_working_task(
             job.started_at = datetime.now(timezone.utc)
             db.commit()
 
-        # Selectionner les expressions candidates
+        # Selectionner les ids des expressions candidates
         query = (
-            db.query(models.Expression)
+            db.query(models.Expression.id)
             .filter(
                 models.Expression.land_id == land_id,
                 models.Expression.approved_at.isnot(None),  # Deja crawlee
@@ -170,9 +324,9 @@ def readable_working_task(
         if limit:
             query = query.limit(limit)
 
-        expressions = query.all()
+        expression_ids = [expression_id for (expression_id,) in query.all()]
 
-        if not expressions:
+        if not expression_ids:
             logger.info("[READABLE] Aucune expression a traiter pour land %s", land_id)
             if job:
                 job.status = CrawlStatus.COMPLETED
@@ -182,103 +336,61 @@ def readable_working_task(
             db.close()
             return {**stats, "status": "completed", "message": "Aucune expression a traiter"}
 
-        total = len(expressions)
+        total = len(expression_ids)
         logger.info("[READABLE] %d expressions a traiter", total)
 
-        for i, expr in enumerate(expressions):
+        # Extraction en parallele, ecritures en base sequentielles
+        extracted = _iter_extracted(
+            _iter_expressions(db, expression_ids), max(settings.READABLE_CONCURRENCY, 1)
+        )
+        for i, (expr, result) in enumerate(extracted):
+            expr_url = expr.url
             try:
-                logger.info("[READABLE] [%d/%d] %s", i + 1, total, expr.url)
-
-                # Extraction
-                result = _extract_content_sync(expr.url, expr.content)
+                logger.info("[READABLE] [%d/%d] %s", i + 1, total, expr_url)
 
                 if not result.get("readable"):
                     stats["skipped"] += 1
-                    logger.info("[READABLE] Skipped (no content): %s", expr.url)
-                    continue
-
-                # Appliquer merge
-                changes = _apply_merge(expr, result, merge_strategy)
-
-                if result.get("extraction_source") == "archive_org":
-                    stats["wayback_fallbacks"] += 1
-
-                # Mettre a jour readable_at
-                expr.readable_at = datetime.now(timezone.utc)
-
-                # Creer media si presents
-                media_list = result.get("media_list", [])
-                for media_info in media_list:
-                    media_url = media_info.get("url") if isinstance(media_info, dict) else getattr(media_info, "url", None)
-                    media_type = media_info.get("type", "img") if isinstance(media_info, dict) else getattr(media_info, "type", "img")
-                    if not media_url:
-                        continue
-                    # Verifier doublon
-                    existing = (
-                        db.query(models.Media)
-                        .filter(
-                            models.Media.expression_id == expr.id,
-                            models.Media.url == media_url,
-                        )
-                        .first()
-                    )
-                    if not existing:
-                        db.add(models.Media(
-                            expression_id=expr.id,
-                            url=media_url,
-                            type=media_type,
-                        ))
-                        stats["media_created"] += 1
-
-                # Creer links si presents
-                links = result.get("links", [])
-                for link_url in links:
-                    if not link_url or not isinstance(link_url, str):
-                        continue
-                    # Chercher l'expression cible
-                    target = (
-                        db.query(models.Expression)
-                        .filter(
-                            models.Expression.land_id == land_id,
-                            models.Expression.url == link_url,
-                        )
-                        .first()
-                    )
-                    if target and target.id != expr.id:
-                        existing_link = (
-                            db.query(models.ExpressionLink)
-                            .filter(
-                                models.ExpressionLink.source_id == expr.id,
-                                models.ExpressionLink.target_id == target.id,
-                            )
-                            .first()
-                        )
-                        if not existing_link:
-                            db.add(models.ExpressionLink(
-                                source_id=expr.id,
-                                target_id=target.id,
-                                link_type="internal",
-                            ))
-                            stats["links_created"] += 1
+                    logger.info("[READABLE] Skipped (no content): %s", expr_url)
+                else:
+                    # Savepoint par expression : une erreur n'annule que
+                    # cette expression, pas le lot en attente de commit
+                    with db.begin_nested():
+                        # Appliquer merge
+                        changes = _apply_merge(expr, result, merge_strategy)
+
+                        # Mettre a jour readable_at
+                        expr.readable_at = datetime.now(timezone.utc)
+
+                        # Creer media si presents
+                        media_created = _create_media(db, expr.id, result.get("media_list", []))
+
+                        # Creer links si presents
+                        links_created = _create_links(db, land_id, expr.id, result.get("links", []))
+
+                    stats["media_created"] += media_created
+                    stats["links_created"] += links_created
+                    if result.get("extraction_source") == "archive_org":
+                        stats["wayback_fallbacks"] += 1
+                    stats["processed"] += 1
+                    if changes:
+                        stats["updated"] += 1
+
+                    logger.info("[READABLE] OK %s source=%s changes=%s",
+                                expr_url, result.get("extraction_source"), changes)
 
-                db.commit()
+            except Exception as e:
+                stats["errors"] += 1
                 stats["processed"] += 1
-                if changes:
-                    stats["updated"] += 1
+                logger.error("[READABLE] ERROR %s: %s", expr_url, e)
 
-                logger.info("[READABLE] OK %s source=%s changes=%s",
-                            expr.url, result.get("extraction_source"), changes)
-
-                # Update job progress
-                if job and total > 0:
+            # Commit par lot, progression du job dans la meme transaction
+            if (i + 1) % COMMIT_EVERY == 0:
+                if job:
                     job.progress = (i + 1) / total
-                    db.commit()
+                db.commit()
 
-            except Exception as e:
-                db.rollback()
-                stats["errors"] += 1
-                stats["processed"] += 1
-                logger.error("[READABLE] ERROR %s: %s", expr.url, e)
+        # Commit du dernier lot
+        db.commit()
 
         # Finaliser le job
         end_time = datetime.now(timezone.utc)
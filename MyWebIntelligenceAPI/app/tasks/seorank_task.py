@@ -5,30 +5,59 @@ Appelle l'API SEO Rank (seo-rank.my-addr.com) pour chaque expression d'un land
 et stocke le payload JSON brut dans le champ seorank.
 """
 
+import asyncio
 import json
 import logging
-import time
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from urllib.parse import quote
 
 import httpx
+from sqlalchemy import bindparam, update
 
-from app.core.celery_app import celery_app
+from app.core.celery_app import celery_app, throttled_update_state
 from app.config import settings
 from app.db import models
 from app.db.session import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# Expressions fetched concurrently then committed together
+FETCH_WINDOW = 200
 
-def _fetch_seorank(url: str, api_key: str, base_url: str, timeout: int) -> Optional[dict]:
+# Core UPDATE run as executemany: one statement per window, no ORM objects
+_SEORANK_UPDATE = (
+    update(models.Expression.__table__)
+    .where(models.Expression.__table__.c.id == bindparam("expression_id"))
+    # Expression.seo_rank is mapped to the "seorank" column
+    .values({models.Expression.__table__.c.seorank: bindparam("payload")})
+)
+
+
+class _RequestSpacer:
+    """Space request starts at least `interval` seconds apart (aggregate rate cap)."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_start = 0.0
+
+    async def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        now = asyncio.get_running_loop().time()
+        # Reserve the next slot before sleeping: no await between read and write
+        start = max(now, self._next_start)
+        self._next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def _fetch_seorank(client: httpx.AsyncClient, url: str, api_key: str, base_url: str) -> Optional[dict]:
     """Call the SEO Rank API for a single URL and return the JSON payload."""
     safe_url = quote(url, safe=":/?&=%")
     request_url = f"{base_url.rstrip('/')}/{api_key}/{safe_url}"
     try:
-        with httpx.Client(timeout=timeout) as client:
-            response = client.get(request_url)
+        response = await client.get(request_url)
         if response.status_code != 200:
             logger.warning("[SEORANK] HTTP %s for %s", response.status_code, url)
             return None
@@ -41,6 +70,25 @@ def _fetch_seorank(url: str, api_key: str, base_url: str, timeout: int) -> Optio
         return None
 
 
+async def _fetch_all(
+    client: httpx.AsyncClient,
+    urls: List[str],
+    api_key: str,
+    base_url: str,
+    concurrency: int,
+    spacer: _RequestSpacer,
+) -> List[Optional[dict]]:
+    """Fetch the payloads of urls, `concurrency` requests in flight at most, in order."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(url: str) -> Optional[dict]:
+        async with semaphore:
+            await spacer.wait()
+            return await _fetch_seorank(client, url, api_key, base_url)
+
+    return await asyncio.gather(*(fetch_one(url) for url in urls))
+
+
 @celery_app.task(name="seorank_task", bind=True)
 def seorank_task(
     self,
@@ -90,9 +138,9 @@ def seorank_task(
         if not land:
             return {"status": "failed", "error": f"Land {land_id} not found"}
 
-        # Build query
+        # Build query (only the columns the fetch needs)
         query = (
-            db.query(models.Expression)
+            db.query(models.Expression.id, models.Expression.url)
             .filter(
                 models.Expression.land_id == land_id,
                 models.Expression.http_status == 200,
@@ -121,43 +169,55 @@ def seorank_task(
 
         logger.info("[SEORANK] %d expressions to process", total)
 
-        for i, expr in enumerate(expressions):
-            try:
-                if not expr.url:
-                    stats["skipped"] += 1
-                    continue
-
-                payload = _fetch_seorank(expr.url, api_key, base_url, timeout)
-                stats["processed"] += 1
-
-                if payload is not None:
-                    expr.seo_rank = json.dumps(payload)
+        to_fetch = [(expr_id, url) for expr_id, url in expressions if url]
+        stats["skipped"] = total - len(to_fetch)
+        concurrency = max(settings.SEORANK_CONCURRENCY, 1)
+
+        # One event loop and one client for the whole land: the connections to
+        # the API host are kept alive; the delay caps the aggregate request rate
+        loop = asyncio.new_event_loop()
+        client = httpx.AsyncClient(timeout=timeout)
+        spacer = _RequestSpacer(delay)
+        last_progress = float("-inf")
+        try:
+            for start in range(0, len(to_fetch), FETCH_WINDOW):
+                window = to_fetch[start:start + FETCH_WINDOW]
+                payloads = loop.run_until_complete(
+                    _fetch_all(client, [url for _, url in window], api_key, base_url, concurrency, spacer)
+                )
+                stats["processed"] += len(window)
+
+                pending = [
+                    {"expression_id": expr_id, "payload": json.dumps(payload)}
+                    for (expr_id, _), payload in zip(window, payloads)
+                    if payload is not None
+                ]
+                try:
+                    if pending:
+                        db.execute(_SEORANK_UPDATE, pending)
                     db.commit()
-                    stats["updated"] += 1
-                else:
-                    stats["errors"] += 1
-
-                if delay > 0:
-                    time.sleep(delay)
-
-                if (i + 1) % 20 == 0:
-                    logger.info(
-                        "[SEORANK] [%d/%d] processed=%d updated=%d errors=%d",
-                        i + 1, total, stats["processed"], stats["updated"], stats["errors"],
-                    )
-                    self.update_state(
-                        state="PROGRESS",
-                        meta={
-                            "progress": int((i + 1) / total * 100),
-                            "message": f"Processing {i + 1}/{total}",
-                            **stats,
-                        },
-                    )
-
-            except Exception as e:
-                stats["errors"] += 1
-                logger.error("[SEORANK] ERROR expr=%s: %s", expr.id, e)
-                db.rollback()
+                    stats["updated"] += len(pending)
+                    stats["errors"] += len(window) - len(pending)
+                except Exception as e:
+                    stats["errors"] += len(window)
+                    logger.error("[SEORANK] ERROR commit of %d expressions: %s", len(window), e)
+                    db.rollback()
+
+                done = stats["processed"] + stats["skipped"]
+                logger.info(
+                    "[SEORANK] [%d/%d] processed=%d updated=%d errors=%d",
+                    done, total, stats["processed"], stats["updated"], stats["errors"],
+                )
+                last_progress = throttled_update_state(
+                    self,
+                    last_progress,
+                    progress=int(done / total * 100),
+                    message=f"Processing {done}/{total}",
+                    **stats,
+                )
+        finally:
+            loop.run_until_complete(client.aclose())
+            loop.close()
 
         duration = (datetime.now(timezone.utc) - start_time).total_seconds()
         logger.info("=" * 60)
@@ -2,21 +2,61 @@
 Utilitaires d'analyse de texte pour l'extraction de paragraphes et métadonnées
 """
 
+import hashlib
 import re
 import string
-from typing import Dict, List, Optional, Tuple, Any
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    from fast_langdetect import detect as _fast_langdetect_detect
+except ImportError:  # pragma: no cover - optional dependency
+    _fast_langdetect_detect = None
+
 try:
     from langdetect import detect as _langdetect_detect, LangDetectException as _LangDetectException
 except ImportError:  # pragma: no cover - optional dependency
     _langdetect_detect = None
     _LangDetectException = None
 
-def analyze_text_metrics(text: str) -> Dict[str, any]:
-    """Analyse complète des métriques d'un texte."""
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional dependency
+    xxhash = None
+
+# Cache LRU des langues détectées, indexé par empreinte du texte : les
+# contenus répétés (gabarits, mentions légales) ne repassent pas par langdetect
+LANGUAGE_CACHE_SIZE = 4096
+_language_cache: "OrderedDict[int, Optional[str]]" = OrderedDict()
+_language_cache_lock = threading.Lock()
+# Seul ce préfixe est analysé : la précision plafonne bien avant 4 Ko
+LANGUAGE_DETECTION_PREFIX = 4096
+
+
+def _text_digest(text: str) -> int:
+    """Empreinte 64 bits du texte (xxhash si disponible)."""
+    data = text.encode('utf-8', errors='surrogatepass')
+    if xxhash is not None:
+        return xxhash.xxh64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+def clear_language_cache() -> None:
+    """Vide le cache des langues détectées."""
+    with _language_cache_lock:
+        _language_cache.clear()
+
+def analyze_text_metrics(text: str, with_language: bool = True) -> Dict[str, any]:
+    """
+    Analyse complète des métriques d'un texte.
+    
+    with_language=False saute la détection de langue ('language' vaut None)
+    quand l'appelant la connaît déjà.
+    """
     
     # Nettoyage de base
     clean_text = text.strip()
@@ -26,11 +66,10 @@ def analyze_text_metrics(text: str) -> Dict[str, any]:
     word_count = len(clean_text.split()) if clean_text else 0
     
     # Comptage des phrases (approximatif)
-    sentence_endings = re.findall(r'[.!?]+', clean_text)
-    sentence_count = len(sentence_endings) if sentence_endings else 1
+    sentence_count = _count_sentences(clean_text)
     
     # Détection de langue
-    language = detect_language(clean_text)
+    language = detect_language(clean_text) if with_language else None
     
     # Score de lisibilité (approximation française du Flesch Reading Ease)
     reading_level = calculate_reading_level(clean_text, word_count, sentence_count)
@@ -43,18 +82,120 @@ def analyze_text_metrics(text: str) -> Dict[str, any]:
         'reading_level': reading_level
     }
 
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+
+def _count_sentences(clean_text: str) -> int:
+    """Nombre approximatif de phrases (au moins 1)."""
+    return len(_SENTENCE_END_RE.findall(clean_text)) or 1
+
+_KEYWORD_RE = re.compile(r'\b[a-zA-ZàâäéèêëïîôùûüÿñçÀÂÄÉÈÊËÏÎÔÙÛÜŸÑÇ]{3,}\b')
+
+# Mots vides français pour extract_keywords
+_KEYWORD_STOP_WORDS = frozenset({
+    'le', 'de', 'et', 'à', 'un', 'il', 'être', 'et', 'en', 'avoir', 'que', 'pour',
+    'dans', 'ce', 'son', 'une', 'sur', 'avec', 'ne', 'se', 'pas', 'tout', 'plus',
+    'par', 'grand', 'cela', 'les', 'du', 'des', 'la', 'te', 'vous', 'leur', 'où',
+    'très', 'nous', 'quand', 'qui', 'comme', 'si', 'ces', 'cette', 'peut', 'faire',
+    'après', 'sans', 'autres', 'mais', 'elle', 'est', 'sont', 'était', 'ont', 'été'
+})
+
+class DocAnalysis(NamedTuple):
+    """Résultat de analyze_document : un texte découpé et mesuré en une passe."""
+    paragraphs: List[str]
+    tokens: List[str]
+    char_count: int
+    sentence_count: int
+    language: Optional[str]
+    reading_level: Optional[float]
+    keyword_freqs: Dict[str, int]
+
+def analyze_document(
+    text: str,
+    min_paragraph_length: int = 50,
+    max_paragraph_length: int = 5000
+) -> DocAnalysis:
+    """
+    Analyse un texte une seule fois pour toutes les statistiques dérivées.
+    
+    Les tokens servent au comptage des mots, à la longueur moyenne et au
+    plancher de syllabes ; document_metrics et document_summary_stats en
+    tirent les dictionnaires de analyze_text_metrics / get_text_summary_stats
+    sans re-découper le texte.
+    """
+    clean_text = text.strip()
+    tokens = clean_text.split()
+    sentence_count = _count_sentences(clean_text)
+    return DocAnalysis(
+        paragraphs=extract_paragraphs_from_text(text, min_paragraph_length, max_paragraph_length),
+        tokens=tokens,
+        char_count=len(clean_text),
+        sentence_count=sentence_count,
+        language=detect_language(clean_text),
+        reading_level=calculate_reading_level(clean_text, len(tokens), sentence_count),
+        keyword_freqs=keyword_frequencies(text)
+    )
+
+def document_metrics(doc: DocAnalysis) -> Dict[str, Any]:
+    """Métriques au format de analyze_text_metrics."""
+    return {
+        'word_count': len(doc.tokens),
+        'char_count': doc.char_count,
+        'sentence_count': doc.sentence_count,
+        'language': doc.language,
+        'reading_level': doc.reading_level
+    }
+
+def document_summary_stats(doc: DocAnalysis) -> Dict[str, Any]:
+    """Résumé au format de get_text_summary_stats."""
+    tokens = doc.tokens
+    avg_word_length = sum(len(word.strip(string.punctuation)) for word in tokens) / len(tokens) if tokens else 0
+    return {
+        'char_count': doc.char_count,
+        'word_count': len(tokens),
+        'sentence_count': doc.sentence_count,
+        'paragraph_count': len(doc.paragraphs),
+        'avg_word_length': round(avg_word_length, 2),
+        'language': doc.language,
+        'reading_level': doc.reading_level,
+        'keywords': top_keywords(doc.keyword_freqs)
+    }
+
 def detect_language(text: str) -> Optional[str]:
     """
     Détecte la langue d'un texte de manière robuste.
 
-    Supporte 55+ langues via langdetect (basé sur le détecteur de Google):
+    Utilise fast-langdetect (fastText, code natif) s'il est installé, sinon
+    langdetect (basé sur le détecteur de Google), 55+ langues:
     - Langues européennes: fr, en, es, de, it, pt, nl, pl, ru, etc.
-    - Langues asiatiques: zh-cn, zh-tw, ja, ko, th, vi, etc.
+    - Langues asiatiques: zh, ja, ko, th, vi, etc.
     - Langues du Moyen-Orient: ar, he, fa, tr, etc.
 
+    Seuls les LANGUAGE_DETECTION_PREFIX premiers caractères sont analysés ;
+    les résultats sont mémorisés (LRU de LANGUAGE_CACHE_SIZE textes).
+
     Returns:
         Code ISO 639-1 de la langue (ex: 'fr', 'en', 'es') ou None si échec
     """
+    if not text:
+        return _detect_language_uncached(text)
+
+    text = text[:LANGUAGE_DETECTION_PREFIX]
+    key = _text_digest(text)
+    with _language_cache_lock:
+        if key in _language_cache:
+            _language_cache.move_to_end(key)
+            return _language_cache[key]
+
+    language = _detect_language_uncached(text)
+
+    with _language_cache_lock:
+        _language_cache[key] = language
+        while len(_language_cache) > LANGUAGE_CACHE_SIZE:
+            _language_cache.popitem(last=False)
+    return language
+
+def _detect_language_uncached(text: str) -> Optional[str]:
+    """Détection sans cache (voir detect_language)."""
     # Minimum 10 caractères pour une détection fiable (réduit de 20 à 10)
     if not text or len(text.strip()) < 10:
         logger.info(f"Text too short for language detection: {len(text.strip()) if text else 0} chars")
@@ -72,18 +213,21 @@ def detect_language(text: str) -> Optional[str]:
         logger.warning(f"Text too short after cleaning ({len(clean_text)} chars), using fallback")
         return _detect_language_fallback(text)
 
-    if not _langdetect_detect:
-        logger.warning("langdetect library not installed, using fallback method")
-        return _detect_language_fallback(text)
+    detected_lang = _detect_with_fasttext(clean_text) if _fast_langdetect_detect else None
 
-    try:
-        detected_lang = _langdetect_detect(clean_text)
-    except _LangDetectException as e:  # type: ignore[misc]
-        logger.warning(f"LangDetectException: {e}, using fallback method")
-        return _detect_language_fallback(text)
-    except Exception as e:
-        logger.warning(f"Unexpected error in language detection: {e}, using fallback method")
-        return _detect_language_fallback(text)
+    if detected_lang is None:
+        if not _langdetect_detect:
+            logger.warning("langdetect library not installed, using fallback method")
+            return _detect_language_fallback(text)
+
+        try:
+            detected_lang = _langdetect_detect(clean_text)
+        except _LangDetectException as e:  # type: ignore[misc]
+            logger.warning(f"LangDetectException: {e}, using fallback method")
+            return _detect_language_fallback(text)
+        except Exception as e:
+            logger.warning(f"Unexpected error in language detection: {e}, using fallback method")
+            return _detect_language_fallback(text)
 
     # Normaliser certains codes (langdetect retourne parfois des codes non-standard)
     lang_mapping = {
@@ -96,12 +240,24 @@ def detect_language(text: str) -> Optional[str]:
 
     # Valider que c'est un code ISO 639-1 valide (2 lettres)
     if detected_lang and len(detected_lang) <= 3:
-        logger.info(f"Language detected by langdetect: {detected_lang}")
+        logger.info(f"Language detected: {detected_lang}")
         return detected_lang
 
-    logger.warning(f"Invalid language code from langdetect: {detected_lang}")
+    logger.warning(f"Invalid language code from detector: {detected_lang}")
     return _detect_language_fallback(text)
 
+def _detect_with_fasttext(text: str) -> Optional[str]:
+    """Langue selon fast-langdetect, None en cas d'échec (relais langdetect)."""
+    try:
+        # fastText traite une seule ligne à la fois
+        result = _fast_langdetect_detect(text.replace('\n', ' '))
+    except Exception as e:
+        logger.warning(f"fast-langdetect error: {e}, falling back to langdetect")
+        return None
+    if isinstance(result, list):  # fast-langdetect >= 1.0 : liste de candidats
+        result = result[0] if result else None
+    return result.get('lang') if result else None
+
 def _detect_language_fallback(text: str) -> Optional[str]:
     """
     Méthode de fallback simple pour détection fr/en uniquement.
@@ -176,7 +332,7 @@ def calculate_reading_level(text: str, word_count: int, sentence_count: int) ->
             return None
         
         # Calcul des syllabes approximatif
-        syllable_count = estimate_syllables(text)
+        syllable_count = estimate_syllables(text, word_count)
         
         if syllable_count == 0:
             return None
@@ -195,8 +351,8 @@ def calculate_reading_level(text: str, word_count: int, sentence_count: int) ->
         logger.warning(f"Error calculating reading level: {e}")
         return None
 
-def estimate_syllables(text: str) -> int:
-    """Estimation approximative du nombre de syllabes."""
+def estimate_syllables(text: str, word_count: Optional[int] = None) -> int:
+    """Estimation approximative du nombre de syllabes (word_count évite un re-découpage)."""
     # Simplification pour le français : compte les voyelles consécutives comme une syllabe
     vowels = "aeiouàâäéèêëïîôùûüÿAEIOUÀÂÄÉÈÊËÏÎÔÙÛÜŸ"
     syllable_count = 0
@@ -209,9 +365,18 @@ def estimate_syllables(text: str) -> int:
         previous_was_vowel = is_vowel
     
     # Au minimum 1 syllabe par mot
-    word_count = len(text.split())
+    if word_count is None:
+        word_count = len(text.split())
     return max(syllable_count, word_count)
 
+# Séparateurs de paragraphes : double saut de ligne ou retour à la ligne HTML.
+# Motifs linéaires (pas de retour arrière coûteux) : le moteur re standard
+# découpe ici deux fois plus vite que google-re2, qui n'est donc pas utilisé.
+_MULTI_BREAK_RE = re.compile(r'\n\s*\n')
+_PARAGRAPH_SPLIT_RE = re.compile(r'\n\s*\n|<br\s*/?>|<p[^>]*>', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
 def extract_paragraphs_from_text(
     text: str, 
     min_length: int = 50,
@@ -222,14 +387,18 @@ def extract_paragraphs_from_text(
     if not text or not text.strip():
         return []
     
-    # Séparation par double saut de ligne ou retour à la ligne HTML
-    raw_paragraphs = re.split(r'\n\s*\n|<br\s*/?>|<p[^>]*>', text.strip(), flags=re.IGNORECASE)
+    text = text.strip()
+    if '<' not in text and not _MULTI_BREAK_RE.search(text):
+        # Chemin rapide : texte brut d'un seul bloc, rien à découper
+        raw_paragraphs = [text]
+    else:
+        raw_paragraphs = _PARAGRAPH_SPLIT_RE.split(text)
     
     paragraphs = []
     for para in raw_paragraphs:
         # Nettoyage HTML basique
         clean_para = clean_html_basic(para)
-        clean_para = re.sub(r'\s+', ' ', clean_para.strip())
+        clean_para = _WHITESPACE_RE.sub(' ', clean_para.strip())
         
         # Filtrage par longueur
         if min_length <= len(clean_para) <= max_length:
@@ -283,7 +452,11 @@ def clean_html_basic(text: str) -> str:
         return ""
     
     # Supprimer les balises HTML
-    text = re.sub(r'<[^>]+>', '', text)
+    if '<' in text:
+        text = _HTML_TAG_RE.sub('', text)
+    
+    if '&' not in text:
+        return text
     
     # Décoder les entités HTML courantes
     html_entities = {
@@ -336,25 +509,18 @@ def extract_keywords(text: str, max_keywords: int = 10) -> List[str]:
     if not text:
         return []
     
-    # Mots vides français
-    stop_words = {
-        'le', 'de', 'et', 'à', 'un', 'il', 'être', 'et', 'en', 'avoir', 'que', 'pour',
-        'dans', 'ce', 'son', 'une', 'sur', 'avec', 'ne', 'se', 'pas', 'tout', 'plus',
-        'par', 'grand', 'cela', 'les', 'du', 'des', 'la', 'te', 'vous', 'leur', 'où',
-        'très', 'nous', 'quand', 'qui', 'comme', 'si', 'ces', 'cette', 'peut', 'faire',
-        'après', 'sans', 'autres', 'mais', 'elle', 'est', 'sont', 'était', 'ont', 'été'
-    }
-    
-    # Nettoyer et extraire les mots
-    words = re.findall(r'\b[a-zA-ZàâäéèêëïîôùûüÿñçÀÂÄÉÈÊËÏÎÔÙÛÜŸÑÇ]{3,}\b', text.lower())
-    
-    # Filtrer les mots vides et compter les occurrences
+    return top_keywords(keyword_frequencies(text), max_keywords)
+
+def keyword_frequencies(text: str) -> Dict[str, int]:
+    """Occurrences des mots de 3 lettres et plus, hors mots vides (ordre d'apparition)."""
     word_count = {}
-    for word in words:
-        if word not in stop_words and len(word) > 2:
+    for word in _KEYWORD_RE.findall(text.lower()):
+        if word not in _KEYWORD_STOP_WORDS:
             word_count[word] = word_count.get(word, 0) + 1
-    
-    # Trier par fréquence et prendre les plus fréquents
+    return word_count
+
+def top_keywords(word_count: Dict[str, int], max_keywords: int = 10) -> List[str]:
+    """Mots les plus fréquents ; à égalité, l'ordre d'apparition est conservé."""
     keywords = sorted(word_count.items(), key=lambda x: x[1], reverse=True)
     return [word for word, count in keywords[:max_keywords]]
 
@@ -373,23 +539,7 @@ def get_text_summary_stats(text: str) -> Dict[str, Any]:
             'keywords': []
         }
     
-    metrics = analyze_text_metrics(text)
-    paragraphs = extract_paragraphs_from_text(text)
-    keywords = extract_keywords(text)
-    
-    words = text.split()
-    avg_word_length = sum(len(word.strip(string.punctuation)) for word in words) / len(words) if words else 0
-    
-    return {
-        'char_count': metrics['char_count'],
-        'word_count': metrics['word_count'],
-        'sentence_count': metrics['sentence_count'],
-        'paragraph_count': len(paragraphs),
-        'avg_word_length': round(avg_word_length, 2),
-        'language': metrics['language'],
-        'reading_level': metrics['reading_level'],
-        'keywords': keywords
-    }
+    return document_summary_stats(analyze_document(text))
 
 def normalize_text(text: str) -> str:
     """Normalise un texte pour la comparaison."""
@@ -0,0 +1,21 @@
+-- Migration: Add content_type_class to expressions table
+-- Date: 2026-10-18
+-- Description: Pre-classify Content-Type at crawl time so quality scoring
+--              compares an integer instead of lowering/scanning the header
+
+BEGIN;
+
+ALTER TABLE expressions ADD COLUMN IF NOT EXISTS content_type_class SMALLINT;
+
+COMMENT ON COLUMN expressions.content_type_class IS 'Content-Type class: 0 = other, 1 = text/html, 2 = application/pdf';
+
+-- Backfill existing rows from the raw header
+UPDATE expressions
+SET content_type_class = CASE
+    WHEN lower(content_type) LIKE '%text/html%' THEN 1
+    WHEN lower(content_type) LIKE '%application/pdf%' THEN 2
+    ELSE 0
+END
+WHERE content_type IS NOT NULL AND content_type <> '' AND content_type_class IS NULL;
+
+COMMIT;
@@ -0,0 +1,19 @@
+-- Migration: Unique media URL per expression
+-- Date: 2026-10-18
+-- Description: One media row per (expression_id, url_hash) so that media
+--              can be bulk-inserted with ON CONFLICT DO NOTHING instead of
+--              checking each URL with a SELECT first
+
+BEGIN;
+
+-- Drop duplicates created before the constraint, keeping the oldest row
+DELETE FROM media AS m
+USING media AS older
+WHERE m.expression_id = older.expression_id
+  AND m.url_hash = older.url_hash
+  AND m.id > older.id;
+
+ALTER TABLE media
+    ADD CONSTRAINT uq_media_expression_url UNIQUE (expression_id, url_hash);
+
+COMMIT;
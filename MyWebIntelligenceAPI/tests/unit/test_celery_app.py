@@ -0,0 +1,50 @@
+"""
+Tests unitaires pour les utilitaires Celery (boucle asyncio persistante, progression).
+"""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from app.core import celery_app
+
+
+class TestRunAsync:
+    def test_loop_reused_between_calls(self):
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = celery_app.run_async(current_loop())
+        second = celery_app.run_async(current_loop())
+
+        assert first is second
+        assert not first.is_running()
+
+    def test_closed_loop_replaced(self):
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = celery_app.run_async(current_loop())
+        first.close()
+
+        assert celery_app.run_async(current_loop()) is not first
+
+
+class TestThrottledUpdateState:
+    def test_first_update_published_then_throttled(self):
+        task = MagicMock()
+
+        last = celery_app.throttled_update_state(task, float("-inf"), progress=1)
+        again = celery_app.throttled_update_state(task, last, progress=2)
+
+        task.update_state.assert_called_once_with(state="PROGRESS", meta={"progress": 1})
+        assert again == last
+
+    def test_published_again_after_interval(self):
+        task = MagicMock()
+
+        with patch.object(celery_app.time, "monotonic", side_effect=[100.0, 100.5, 101.2]):
+            last = celery_app.throttled_update_state(task, float("-inf"), current=1)
+            last = celery_app.throttled_update_state(task, last, current=2)
+            last = celery_app.throttled_update_state(task, last, current=3)
+
+        assert [c.kwargs["meta"]["current"] for c in task.update_state.call_args_list] == [1, 3]
+        assert last == 101.2
@@ -0,0 +1,265 @@
+"""
+Tests unitaires pour la tâche de consolidation d'un land.
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.db import models
+from app.tasks import consolidation_task
+
+
+class FakeQuery:
+    """Requête ORM minimale : filtres ignorés, résultats fixés par entité."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def filter(self, *args, **kwargs):
+        return self
+
+    def limit(self, *args):
+        return self
+
+    def options(self, *args):
+        return self
+
+    def order_by(self, *args):
+        return self
+
+    def all(self):
+        return list(self.rows)
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def delete(self, **kwargs):
+        return 0
+
+
+def _entity_key(entity):
+    """"Expression" pour un modèle, "Expression.url" pour une colonne."""
+    if hasattr(entity, "class_"):
+        return f"{entity.class_.__name__}.{entity.key}"
+    return entity.__name__
+
+
+def _fake_db(land, expressions, rows=None):
+    """Session factice ; les INSERT groupés sont enregistrés dans db.inserted."""
+    rows_by_entity = {
+        "Land": [land],
+        "Expression": expressions,
+        "Expression.id": [(expr.id,) for expr in expressions],
+        **(rows or {}),
+    }
+    db = MagicMock()
+    db.query.side_effect = lambda entity, *rest: FakeQuery(rows_by_entity.get(_entity_key(entity), []))
+    db.inserted = {}
+    new_ids = iter(range(100, 200))
+
+    def execute(stmt, params=None):
+        result = MagicMock()
+        if stmt.is_insert:
+            table = stmt.table.name
+            db.inserted.setdefault(table, []).extend(params)
+            # RETURNING (clé, id) : name pour les domaines, url pour les expressions
+            key = "name" if table == "domains" else "url"
+            result.all.side_effect = lambda: [(row[key], next(new_ids)) for row in params]
+        return result
+
+    db.execute.side_effect = execute
+    return db
+
+
+def _expression(eid, **overrides):
+    fields = dict(id=eid, url=f"https://site.org/{eid}", title=f"Titre {eid}", readable="texte", lang="fr", relevance=0, depth=0)
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+@pytest.fixture
+def run_task():
+    def run(db, land_id=1, dictionary=None):
+        with patch.object(consolidation_task, "SessionLocal", return_value=db), patch.object(
+            consolidation_task.text_processing,
+            "get_land_dictionary_sync",
+            return_value=dictionary or {},
+        ):
+            return consolidation_task.consolidate_land_task.run(land_id)
+    return run
+
+
+class TestRelevance:
+    def test_single_event_loop_for_all_expressions(self, run_task):
+        db = _fake_db(SimpleNamespace(id=1), [_expression(1), _expression(2)])
+        relevance = AsyncMock(return_value=3.0)
+
+        with patch.object(consolidation_task.text_processing, "expression_relevance", relevance), patch.object(
+            consolidation_task.asyncio, "new_event_loop", wraps=asyncio.new_event_loop
+        ) as new_loop:
+            result = run_task(db, dictionary={"climat": 1.0})
+
+        assert result["status"] == "completed"
+        assert result["relevance_updated"] == 2
+        assert relevance.await_count == 2
+        new_loop.assert_called_once()
+
+
+class TestLinks:
+    def test_targets_and_domains_resolved_in_one_query_each(self, run_task):
+        readable = (
+            "[a](https://known.org/a) [b](https://new.org/b) [c](https://other.org/c) "
+            '<a href="https://known.org/a">a</a> [self](https://known.org/self) [m](mailto:x@y.z)'
+        )
+        expr = _expression(5, readable=readable)
+        db = _fake_db(
+            SimpleNamespace(id=1),
+            [expr],
+            rows={
+                "Expression.url": [("https://known.org/a", 10), ("https://known.org/self", 5)],
+                "Domain.name": [("new.org", 3)],
+            },
+        )
+
+        result = run_task(db)
+
+        queried = [_entity_key(call.args[0]) for call in db.query.call_args_list]
+        assert queried.count("Expression.url") == 1
+        assert queried.count("Domain.name") == 1
+
+        # Un seul INSERT par table
+        inserts = [call.args[0].table.name for call in db.execute.call_args_list if call.args[0].is_insert]
+        assert sorted(inserts) == ["domains", "expression_links", "expressions"]
+
+        assert [domain["name"] for domain in db.inserted["domains"]] == ["other.org"]
+        targets = {target["url"]: target for target in db.inserted["expressions"]}
+        assert set(targets) == {"https://new.org/b", "https://other.org/c"}
+        assert targets["https://new.org/b"]["domain_id"] == 3
+        assert targets["https://other.org/c"]["domain_id"] == 100
+        assert targets["https://new.org/b"]["url_hash"] == models.Expression.compute_url_hash("https://new.org/b")
+
+        links = db.inserted["expression_links"]
+        assert all(link["source_id"] == 5 for link in links)
+        assert 10 in {link["target_id"] for link in links}
+        assert 5 not in {link["target_id"] for link in links}
+        assert result["links_rebuilt"] == 3
+        assert result["expressions_added"] == 2
+
+    def test_self_links_skip_database(self, run_task):
+        expr = _expression(5, readable="[accueil](https://site.org/5) <a href=\"https://site.org/5\">")
+        db = _fake_db(SimpleNamespace(id=1), [expr])
+
+        result = run_task(db)
+
+        queried = [_entity_key(call.args[0]) for call in db.query.call_args_list]
+        assert "Expression.url" not in queried
+        assert "expression_links" not in db.inserted
+        assert result["links_rebuilt"] == 0
+
+    def test_old_links_and_media_deleted_once_per_batch(self, run_task):
+        db = _fake_db(SimpleNamespace(id=1), [_expression(i) for i in range(1, 4)])
+
+        result = run_task(db)
+
+        queried = [_entity_key(call.args[0]) for call in db.query.call_args_list]
+        assert queried.count("ExpressionLink") == 1
+        assert queried.count("Media") == 1
+        assert result["processed"] == 3
+
+    def test_media_inserted_in_one_statement(self, run_task):
+        readable = "![a](https://img.org/a.png) ![b](data:image/png;base64,xx) [VIDEO: https://v.org/1 ]"
+        db = _fake_db(SimpleNamespace(id=1), [_expression(5, readable=readable)])
+
+        result = run_task(db)
+
+        media = db.inserted["media"]
+        assert [(row["url"], row["type"]) for row in media] == [
+            ("https://img.org/a.png", "img"),
+            ("https://v.org/1", "video"),
+        ]
+        assert media[0]["url_hash"] == models.Media.compute_url_hash("https://img.org/a.png")
+        assert result["media_rebuilt"] == 2
+
+
+class TestLoading:
+    def test_expressions_loaded_by_pages_of_ids(self, run_task):
+        db = _fake_db(SimpleNamespace(id=1), [_expression(i) for i in range(1, 4)])
+
+        with patch.object(consolidation_task, "CONSOLIDATION_PAGE_SIZE", 2):
+            run_task(db)
+
+        queried = [_entity_key(call.args[0]) for call in db.query.call_args_list]
+        # Ids d'abord, puis une requête par page de 2 ids
+        assert queried.count("Expression.id") == 1
+        assert queried.count("Expression") == 2
+class TestChunking:
+    def test_large_land_dispatched_as_chord(self, run_task):
+        db = _fake_db(SimpleNamespace(id=1), [_expression(i) for i in range(1, 6)])
+        chord_result = MagicMock(id="chord-1")
+        header = MagicMock(return_value=chord_result)
+
+        with patch.object(consolidation_task.settings, "CONSOLIDATION_CHUNK_SIZE", 2), patch.object(
+            consolidation_task, "chord", return_value=header
+        ) as chord:
+            result = run_task(db, dictionary={"climat": 1.0})
+
+        signatures = list(chord.call_args.args[0])
+        assert [signature.args[1] for signature in signatures] == [[1, 2], [3, 4], [5]]
+        assert signatures[0].args[2] == {"climat": 1.0}
+        assert header.call_args.args[0].args[0] == 1
+        assert result["status"] == "dispatched"
+        assert result["chunks"] == 3
+        assert result["finalize_task_id"] == "chord-1"
+
+    def test_chunk_uses_dictionary_from_parent(self):
+        """Un chunk ne relit ni le land ni son dictionnaire."""
+        db = _fake_db(SimpleNamespace(id=1), [_expression(1), _expression(2)])
+        relevance = AsyncMock(return_value=2.0)
+
+        with patch.object(consolidation_task, "SessionLocal", return_value=db), patch.object(
+            consolidation_task.text_processing, "expression_relevance", relevance
+        ), patch.object(consolidation_task, "_get_land_dictionary") as get_dictionary:
+            result = consolidation_task.consolidate_expressions_chunk_task.run(1, [1, 2], {"climat": 1.0})
+
+        get_dictionary.assert_not_called()
+        queried = [_entity_key(call.args[0]) for call in db.query.call_args_list]
+        assert "Land" not in queried
+        assert relevance.await_args.args[0] == {"climat": 1.0}
+        assert result["processed"] == 2
+
+    def test_finalize_sums_chunk_stats(self):
+        db = MagicMock()
+        partial = {"processed": 2, "errors": 1, "links_rebuilt": 4, "media_rebuilt": 0,
+                   "expressions_added": 1, "relevance_updated": 2}
+
+        with patch.object(consolidation_task, "SessionLocal", return_value=db):
+            result = consolidation_task.finalize_consolidation_task.run(
+                [partial, partial], 1, "2026-01-01T00:00:00+00:00"
+            )
+
+        assert result["status"] == "completed"
+        assert result["processed"] == 4
+        assert result["links_rebuilt"] == 8
+        # Réparation de approved_at : un seul UPDATE (CASE) puis commit
+        assert db.execute.call_count == 1
+        db.commit.assert_called_once()
+
+
+class TestDictionary:
+    def test_words_edited_between_consolidations_use_new_weights(self):
+        """Pas de cache entre deux consolidations : les poids modifiés sont relus."""
+        fetch = MagicMock(side_effect=[{"climat": 1.0}, {"climat": 5.0}])
+        relevance = AsyncMock(return_value=3.0)
+        land = SimpleNamespace(id=1)
+
+        with patch.object(consolidation_task, "SessionLocal", side_effect=lambda: _fake_db(land, [_expression(1)])), \
+                patch.object(consolidation_task.text_processing, "get_land_dictionary_sync", fetch), \
+                patch.object(consolidation_task.text_processing, "expression_relevance", relevance):
+            consolidation_task.consolidate_land_task.run(1)
+            # Édition des mots du land, puis nouvelle consolidation
+            consolidation_task.consolidate_land_task.run(1)
+
+        assert fetch.call_count == 2
+        assert [call.args[0] for call in relevance.await_args_list] == [{"climat": 1.0}, {"climat": 5.0}]
@@ -0,0 +1,55 @@
+"""
+Tests unitaires pour l'extracteur de contenu.
+"""
+import asyncio
+import gc
+import weakref
+from unittest.mock import patch
+
+import httpx
+
+from app.core import content_extractor
+
+HttpxAsyncClient = httpx.AsyncClient
+
+
+class TestArchiveClient:
+    def test_nothing_retained_across_asyncio_run_calls(self):
+        """Sans client fourni, chaque appel ferme son client ; boucles et clients sont libérés."""
+        loops, clients = [], []
+
+        async def handler(request):
+            loops.append(weakref.ref(asyncio.get_running_loop()))
+            return httpx.Response(200, json={"archived_snapshots": {}})
+
+        def make_client(**kwargs):
+            clients.append(HttpxAsyncClient(transport=httpx.MockTransport(handler), **kwargs))
+            return clients[-1]
+
+        with patch.object(content_extractor.httpx, "AsyncClient", side_effect=make_client):
+            for i in range(5):
+                assert asyncio.run(content_extractor._extract_from_archive_org(f"https://a.org/{i}")) is None
+
+        assert len(clients) == 5 and all(client.is_closed for client in clients)
+        clients.clear()
+        gc.collect()
+        assert len(loops) == 5 and all(ref() is None for ref in loops)
+
+    def test_caller_client_reused_and_left_open(self):
+        requested = []
+        client = HttpxAsyncClient(transport=httpx.MockTransport(
+            lambda request: requested.append(request.url) or httpx.Response(200, json={"archived_snapshots": {}})
+        ))
+
+        async def extract_twice():
+            await content_extractor._extract_from_archive_org("https://a.org/1", client)
+            await content_extractor._extract_from_archive_org("https://a.org/2", client)
+            still_open = not client.is_closed
+            await client.aclose()
+            return still_open
+
+        with patch.object(content_extractor.httpx, "AsyncClient") as factory:
+            assert asyncio.run(extract_twice()) is True
+
+        factory.assert_not_called()
+        assert len(requested) == 2
@@ -0,0 +1,92 @@
+"""
+Tests unitaires pour la tâche Celery de crawl des domaines.
+"""
+import importlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Le package app.tasks réexporte la tâche sous le même nom que le module
+module = importlib.import_module("app.tasks.domain_crawl_task")
+
+
+def _fetch_result(name, status=200):
+    return SimpleNamespace(
+        domain_name=name,
+        title=f"Titre {name}",
+        description=None,
+        keywords=None,
+        language="fr",
+        http_status=status,
+        fetched_at=datetime(2026, 1, 1),
+        source_method="trafilatura" if status == 200 else "http_direct",
+    )
+
+
+@pytest.fixture
+def crawl():
+    """Lance domain_crawl_task avec une session, un service et un crawler factices."""
+    def run(domains, fetch_domain):
+        db = MagicMock()
+        service = MagicMock(db=db)
+        service.select_domains_to_crawl.return_value = domains
+        crawler = MagicMock()
+        crawler.fetch_domain.side_effect = fetch_domain
+
+        @contextmanager
+        def db_context():
+            yield db
+
+        with patch.object(module, "get_sync_db_context", db_context), patch.object(
+            module, "DomainCrawlService", return_value=service
+        ), patch.object(module, "DomainCrawler", return_value=crawler), patch.object(
+            module.domain_crawl_task, "update_state"
+        ):
+            stats = module.domain_crawl_task.run(job_id=1)
+        return stats, db, crawler
+    return run
+
+
+class TestDomainCrawlTask:
+    def test_domains_fetched_concurrently(self, crawl):
+        """Les fetchs se chevauchent : deux threads atteignent la barrière ensemble."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fetch_domain(name):
+            barrier.wait()
+            return _fetch_result(name)
+
+        domains = [SimpleNamespace(name="a.org"), SimpleNamespace(name="b.org")]
+        stats, _, crawler = crawl(domains, fetch_domain)
+
+        assert stats["success"] == 2
+        assert stats["by_source"]["trafilatura"] == 2
+        assert {d.title for d in domains} == {"Titre a.org", "Titre b.org"}
+        crawler.close.assert_called_once()
+
+    def test_fetch_error_counted_and_others_saved(self, crawl):
+        def fetch_domain(name):
+            if name == "down.org":
+                raise RuntimeError("boom")
+            return _fetch_result(name, status=404)
+
+        domains = [SimpleNamespace(name="down.org"), SimpleNamespace(name="ok.org")]
+        stats, _, _ = crawl(domains, fetch_domain)
+
+        assert stats["processed"] == 1
+        assert stats["errors"] == 2
+        assert stats["by_source"]["error"] == 1
+        assert domains[1].http_status == "404"
+
+    def test_commits_grouped(self, crawl):
+        domains = [SimpleNamespace(name=f"d{i}.org") for i in range(5)]
+
+        with patch.object(module, "COMMIT_EVERY", 2):
+            _, db, _ = crawl(domains, _fetch_result)
+
+        # Après le 2e et le 4e domaine, puis le reste en fin de boucle
+        assert db.commit.call_count == 3
@@ -0,0 +1,108 @@
+"""
+Tests unitaires pour les tâches Celery d'export par lot.
+"""
+import os
+import tempfile
+import time
+from unittest.mock import MagicMock, patch
+
+from app.tasks import export_tasks
+
+
+class TestBatchExport:
+    def test_requests_dispatched_as_chord(self):
+        requests = [
+            {"export_type": "pagecsv", "land_id": 1},
+            {"export_type": "nodegexf", "land_id": 2, "minimum_relevance": 3},
+        ]
+        header_result = MagicMock(id="chord-1")
+        callback = MagicMock(return_value=header_result)
+
+        with patch.object(export_tasks, "chord", return_value=callback) as chord:
+            result = export_tasks.batch_export_task.run(requests, user_id=7)
+
+        signatures = list(chord.call_args.args[0].tasks)
+        assert [signature.args for signature in signatures] == [
+            (0, requests[0], 7),
+            (1, requests[1], 7),
+        ]
+        assert callback.call_args.args[0].args[0] == 2
+        assert result["finalize_task_id"] == "chord-1"
+        assert result["total_requests"] == 2
+
+    def test_failed_export_reported_not_raised(self):
+        with patch.object(export_tasks.create_export_task, "apply", side_effect=ValueError("Land 9 not found")):
+            item = export_tasks.batch_export_item_task.run(0, {"export_type": "pagecsv", "land_id": 9})
+
+        assert item == {"request_index": 0, "success": False, "error": "Land 9 not found"}
+
+    def test_item_result_trimmed_for_chord_payload(self):
+        export_result = {
+            "progress": 100, "message": "Export completed successfully", "export_type": "pagecsv",
+            "land_id": 1, "file_path": "/tmp/export.csv", "record_count": 3, "task_id": "t-1",
+        }
+        with patch.object(export_tasks.create_export_task, "apply") as apply:
+            apply.return_value.get.return_value = export_result
+            item = export_tasks.batch_export_item_task.run(0, {"export_type": "pagecsv", "land_id": 1})
+
+        assert item["result"] == {
+            "export_type": "pagecsv", "land_id": 1, "file_path": "/tmp/export.csv", "record_count": 3,
+        }
+
+    def test_finalize_aggregates_in_request_order(self):
+        results = [
+            {"request_index": 1, "success": False, "error": "boom"},
+            {"request_index": 0, "success": True, "result": {"record_count": 3}},
+        ]
+
+        summary = export_tasks.finalize_batch_export_task.run(results, 2, "batch-1")
+
+        assert summary["successful_exports"] == 1
+        assert summary["failed_exports"] == 1
+        assert [r["request_index"] for r in summary["results"]] == [0, 1]
+        assert summary["task_id"] == "batch-1"
+
+
+class TestCreateExport:
+    def test_uses_shared_session_factory(self):
+        db = MagicMock()
+        service = MagicMock()
+        service.export_data.return_value = ("/tmp/export.csv", 12)
+
+        with patch.object(export_tasks, "SessionLocal", return_value=db) as session_factory, patch.object(
+            export_tasks, "SyncExportService", return_value=service
+        ), patch.object(export_tasks.create_export_task, "update_state"):
+            result = export_tasks.create_export_task.run("pagecsv", 1)
+
+        session_factory.assert_called_once_with()
+        service.export_data.assert_called_once()
+        assert result["record_count"] == 12
+        db.close.assert_called_once()
+
+
+class TestCleanupExportFiles:
+    def test_old_export_files_removed_in_one_scan(self, tmp_path):
+        old = time.time() - 48 * 3600
+        for name in ("export_pagecsv_1.csv", "export_nodegexf_2.gexf", "export_x.csv", "notes.csv", "export_a_b.txt"):
+            (tmp_path / name).write_text("x")
+            os.utime(tmp_path / name, (old, old))
+        (tmp_path / "export_corpus_3.zip").write_text("recent")
+        (tmp_path / "export_dir_4.csv").mkdir()
+
+        with patch.object(tempfile, "gettempdir", return_value=str(tmp_path)), patch.object(
+            export_tasks.cleanup_export_files_task, "update_state"
+        ) as update_state:
+            result = export_tasks.cleanup_export_files_task.run(max_age_hours=24)
+
+        assert sorted(f["filename"] for f in result["deleted_files"]) == [
+            "export_nodegexf_2.gexf",
+            "export_pagecsv_1.csv",
+        ]
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "export_a_b.txt", "export_corpus_3.zip", "export_dir_4.csv", "export_x.csv", "notes.csv",
+        ]
+        # STARTED puis une seule mise à jour de progression pour 3 fichiers
+        assert update_state.call_count == 2
+
+    def test_result_not_stored_in_backend(self):
+        assert export_tasks.cleanup_export_files_task.ignore_result is True
@@ -327,5 +327,73 @@ class TestExportServiceUnit:
             assert count == 5
 
 
+    def test_get_sql_data_streams_rows(self):
+        """Test du streaming des résultats SQL (curseur serveur, pas de fetchall)"""
+        result = MagicMock()
+        result.__iter__.return_value = iter([(1, 'a'), (2, 'b')])
+        self.mock_db.execute.return_value = result
+
+        rows = self.service.get_sql_data("SELECT {} FROM expressions AS e", {'id': 'e.id', 'url': 'e.url'}, 1, 0)
+
+        # Generator: nothing executed before the writer consumes it
+        self.mock_db.execute.assert_not_called()
+        assert list(rows) == [{'id': 1, 'url': 'a'}, {'id': 2, 'url': 'b'}]
+        query = self.mock_db.execute.call_args.args[0]
+        assert query.get_execution_options()['stream_results'] is True
+        assert query.get_execution_options()['yield_per'] == self.service.STREAM_BATCH_SIZE
+        result.fetchall.assert_not_called()
+
+    def test_write_csv_file_from_generator(self):
+        """Test d'écriture CSV depuis un générateur consommé ligne à ligne"""
+        headers = ['id', 'title']
+        data = ({'id': i, 'title': f't{i}'} for i in range(3))
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp_file:
+            filename = tmp_file.name
+
+        try:
+            assert self.service.write_csv_file(filename, headers, data) == 3
+            with open(filename, 'r', encoding='utf-8') as f:
+                assert f.read().strip().split('\n')[-1] == '"2","t2"'
+        finally:
+            os.unlink(filename)
+
+    def test_write_nodelinkcsv_streams_queries_into_zip(self):
+        """Test de l'export nodelinkcsv : requêtes en curseur serveur, CSV écrits dans le ZIP"""
+        page = (1, 'https://a.org', 3, 'a.org', 'T', None, None, 'fr', 2, 0, 200,
+                None, None, None, None, None, None, None, '{"rank": 5}')
+        results = [[page], [(1, 'https://a.org', 3, 2, 'https://b.org', 4)], [], []]
+        self.mock_db.execute.side_effect = lambda query, params: iter(results.pop(0))
+
+        with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp_file:
+            filename = tmp_file.name
+
+        try:
+            assert self.service.write_nodelinkcsv(filename, 1, 1) == 1
+            with ZipFile(filename) as archive:
+                pages = archive.read('pagesnodes.csv').decode('utf-8').splitlines()
+                links = archive.read('pageslinks.csv').decode('utf-8').splitlines()
+            assert pages[0].endswith('"validmodel","rank"')
+            assert pages[1].endswith('"5"')
+            assert links[1] == '"1","https://a.org","3","2","https://b.org","4"'
+            for call in self.mock_db.execute.call_args_list:
+                assert call.args[0].get_execution_options()['stream_results'] is True
+        finally:
+            os.unlink(filename)
+
+    def test_write_tagmatrix_fills_missing_cells(self):
+        """Test de la matrice de tags construite en un seul passage"""
+        self.mock_db.execute.return_value = iter([(1, 'a', 2), (2, 'b', 1), (1, 'b', 3)])
+
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as tmp_file:
+            filename = tmp_file.name
+
+        try:
+            assert self.service.write_tagmatrix(filename, 1, 1) == 2
+            with open(filename, 'r', encoding='utf-8') as f:
+                assert f.read().splitlines() == ['"expression_id","a","b"', '"1","2","3"', '"2","0","1"']
+        finally:
+            os.unlink(filename)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Tests unitaires pour la tâche de mise à jour heuristique des domaines.
+"""
+import importlib
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+# Le package app.tasks réexporte la tâche sous le même nom que le module
+module = importlib.import_module("app.tasks.heuristic_update_task")
+
+HEURISTICS = json.dumps({"twitter.com": r"twitter\.com/([a-zA-Z0-9_]+)"})
+
+
+def _fake_db(domains, expressions):
+    """Session factice : lectures Core en tuples, écritures enregistrées dans db.writes."""
+    db = MagicMock()
+    db.writes = []
+    new_ids = iter(range(100, 200))
+
+    def execute(stmt, params=None):
+        result = MagicMock()
+        if stmt.is_select:
+            rows = domains if stmt.get_final_froms()[0].name == "domains" else expressions
+            result.__iter__.side_effect = lambda: iter(list(rows))
+        else:
+            compiled = stmt.compile(dialect=postgresql.dialect())
+            db.writes.append((stmt.is_insert, compiled.params))
+            if stmt.is_insert:
+                created = [
+                    (compiled.params[f"land_id_m{n}"], compiled.params[f"name_m{n}"], next(new_ids))
+                    for n in range(sum(1 for key in compiled.params if key.startswith("name_m")))
+                ]
+                result.__iter__.side_effect = lambda: iter(created)
+        return result
+
+    db.execute.side_effect = execute
+    return db
+
+
+@pytest.fixture
+def run_task():
+    def run(db, **kwargs):
+        with patch.object(module, "SessionLocal", return_value=db):
+            return module.heuristic_update_task.run(heuristics_override=HEURISTICS, **kwargs)
+    return run
+
+
+class TestDomainName:
+    @pytest.fixture
+    def compiled(self):
+        return module._compile_heuristics({
+            "twitter.com": r"twitter\.com/([a-zA-Z0-9_]+)",
+            "youtube.com": r"youtube\.com/(?:user|c)/[^/?]+",
+            "com": r"zzz",
+        })
+
+    def test_captured_group_replaces_domain(self, compiled):
+        assert module._get_domain_name_sync("https://twitter.com/alice?x=1", compiled) == "alice"
+
+    def test_whole_match_without_group(self, compiled):
+        assert module._get_domain_name_sync("https://youtube.com/user/foo/videos", compiled) == "youtube.com/user/foo"
+
+    def test_first_declared_suffix_wins(self, compiled):
+        """Comme l'ancien parcours du dict : "twitter.com" passe avant "com"."""
+        assert module._get_domain_name_sync("https://nottwitter.com/bob", compiled) == "bob"
+        assert module._get_domain_name_sync("https://example.com/a", compiled) == "example.com"
+
+    def test_same_result_as_crud_domain(self, compiled):
+        """L'index par dernier label garde la sémantique endswith du crawl."""
+        from app.crud.crud_domain import CRUDDomain
+
+        heuristics = {"twitter.com": r"twitter\.com/([a-zA-Z0-9_]+)", "tter.com": r"x", "m": r"zzz", "org": r"org/(\w+)"}
+        compiled = module._compile_heuristics(heuristics)
+        for url in (
+            "https://twitter.com/alice", "https://nottwitter.com/bob", "https://example.com/a",
+            "https://example.org/news", "https://example.fr/a", "https://localhost/a",
+        ):
+            assert module._get_domain_name_sync(url, compiled) == CRUDDomain().get_domain_name(url, heuristics)
+
+    def test_netloc_without_path_or_scheme(self, compiled):
+        assert module._get_domain_name_sync("https://example.org?q=1", compiled) == "example.org"
+        assert module._get_domain_name_sync("example.org/a", compiled) == ""
+
+
+class TestHeuristicUpdate:
+    def test_expressions_read_as_tuples_and_moved_in_bulk(self, run_task):
+        domains = [(1, 1, "twitter.com"), (2, 1, "alice")]
+        expressions = [
+            (10, "https://twitter.com/alice", 1, 1),
+            (11, "https://twitter.com/bob", 1, 1),
+            (12, "https://twitter.com/alice", 1, 2),
+            (13, "https://twitter.com/bob", 1, 1),
+            (14, "https://example.org/", 1, 1),
+        ]
+        db = _fake_db(domains, expressions)
+
+        result = run_task(db, land_id=1)
+
+        assert result["status"] == "completed"
+        assert result["processed"] == 5
+        assert result["updated"] == 4
+        assert result["domains_created"] == 2
+        # Aucune hydratation ORM, aucune requête par ligne
+        db.query.assert_not_called()
+
+        inserts = [params for is_insert, params in db.writes if is_insert]
+        assert len(inserts) == 1
+        updates = {params["domain_id"]: params["id_1"] for is_insert, params in db.writes if not is_insert}
+        # alice existe déjà (id 2) ; bob et example.org sont créés (ids 100, 101)
+        assert updates[2] == [10]
+        assert sorted(map(sorted, (updates[100], updates[101]))) == [[11, 13], [14]]
+
+    def test_target_domains_resolved_per_land_in_memory(self, run_task):
+        """Le même nom dans un autre land n'est pas réutilisé ; aucun SELECT par ligne."""
+        domains = [(1, 1, "twitter.com"), (2, 2, "alice"), (3, 2, "twitter.com")]
+        expressions = [
+            (10, "https://twitter.com/alice", 1, 1),
+            (11, "https://twitter.com/alice", 2, 3),
+        ]
+        db = _fake_db(domains, expressions)
+
+        result = run_task(db)
+
+        assert result["domains_created"] == 1
+        inserts = [params for is_insert, params in db.writes if is_insert]
+        assert (inserts[0]["land_id_m0"], inserts[0]["name_m0"]) == (1, "alice")
+        updates = {params["domain_id"]: params["id_1"] for is_insert, params in db.writes if not is_insert}
+        assert updates == {2: [11], 100: [10]}
+        selects = [call for call in db.execute.call_args_list if call.args[0].is_select]
+        assert len(selects) == 2
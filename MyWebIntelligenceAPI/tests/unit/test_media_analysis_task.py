@@ -0,0 +1,232 @@
+"""
+Tests unitaires pour la tâche d'analyse des médias d'un land.
+"""
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.tasks import media_analysis_task
+
+
+class FakeQuery:
+    """Requête ORM minimale : filtres ignorés, résultats fixés par entité."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def filter(self, *args, **kwargs):
+        return self
+
+    def order_by(self, *args):
+        return self
+
+    def all(self):
+        return list(self.rows)
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+
+def _fake_db(job, media_rows):
+    """Session factice : (id, url) des médias via select, UPDATE groupés dans db.updates."""
+    rows = {"CrawlJob": [job], "Expression.id": [(1,)]}
+    db = MagicMock()
+    db.updates = []
+
+    def query(entity, *rest):
+        key = f"{entity.class_.__name__}.{entity.key}" if hasattr(entity, "class_") else entity.__name__
+        return FakeQuery(rows.get(key, []))
+
+    def execute(stmt, params=None):
+        result = MagicMock()
+        if stmt.is_select:
+            result.all.return_value = list(media_rows)
+        else:
+            db.updates.append(params)
+        return result
+
+    db.query.side_effect = query
+    db.execute.side_effect = execute
+    return db
+
+
+@pytest.fixture
+def run_task():
+    def run(db, analyze_image, download=None, **kwargs):
+        """analyze_image(url) simule l'etape CPU ; download(url) l'etape reseau."""
+        processor = MagicMock()
+        processor.download_image.side_effect = download or (lambda url: (url.encode(), "image/png"))
+        with patch.object(media_analysis_task, "SessionLocal", return_value=db), patch.object(
+            media_analysis_task, "MediaProcessorSync", return_value=processor
+        ), patch.object(
+            media_analysis_task, "analyze_image_bytes",
+            side_effect=lambda url, content, mime_type: analyze_image(url),
+        ):
+            return media_analysis_task.analyze_land_media_task.run(job_id=1, land_id=1, **kwargs)
+    return run
+
+
+class TestMediaAnalysis:
+    def test_images_analyzed_concurrently(self, run_task):
+        """Les téléchargements se chevauchent : deux threads atteignent la barrière ensemble."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def download(url):
+            barrier.wait()
+            return b"png", "image/png"
+
+        job = SimpleNamespace()
+        db = _fake_db(job, [(1, "https://img.org/a.png"), (2, "https://img.org/b.png")])
+
+        result = run_task(db, lambda url: {"width": 10, "height": 20, "format": "PNG", "dominant_colors": []},
+                          download=download)
+
+        assert result["status"] == "completed"
+        assert result["analyzed"] == 2
+        [batch] = db.updates
+        assert {row["media_id"] for row in batch} == {1, 2}
+        assert all(row["is_processed"] and row["width"] == 10 and row["format"] == "PNG" for row in batch)
+        assert job.progress == 1.0
+
+    def test_failed_analysis_not_updated(self, run_task):
+        def analyze_image(url):
+            if url.endswith("broken.png"):
+                return {"error": "HTTP 404"}
+            return {"width": 1, "height": 1}
+
+        db = _fake_db(SimpleNamespace(), [(1, "https://img.org/broken.png"), (2, "https://img.org/ok.png")])
+
+        result = run_task(db, analyze_image)
+
+        assert result["analyzed"] == 1
+        assert result["failed"] == 1
+        assert [row["media_id"] for batch in db.updates for row in batch] == [2]
+
+    def test_download_error_counted_as_failure(self, run_task):
+        def download(url):
+            if url.endswith("down.png"):
+                raise ValueError("File size exceeds limit (1 bytes)")
+            return b"png", "image/png"
+
+        db = _fake_db(SimpleNamespace(), [(1, "https://img.org/down.png"), (2, "https://img.org/ok.png")])
+
+        result = run_task(db, lambda url: {"width": 1, "height": 1}, download=download)
+
+        assert (result["analyzed"], result["failed"]) == (1, 1)
+        assert [row["media_id"] for batch in db.updates for row in batch] == [2]
+
+    def test_images_in_flight_bounded_by_queue_size(self, run_task):
+        """Un téléchargement ne démarre que lorsqu'une image sort du pipeline."""
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def download(url):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            return b"png", "image/png"
+
+        def analyze_image(url):
+            with lock:
+                state["in_flight"] -= 1
+            return {"width": 1, "height": 1}
+
+        db = _fake_db(SimpleNamespace(), [(i, f"https://img.org/{i}.png") for i in range(6)])
+
+        with patch.object(media_analysis_task.settings, "MEDIA_ANALYSIS_QUEUE_SIZE", 2):
+            result = run_task(db, analyze_image, download=download)
+
+        assert result["analyzed"] == 6
+        assert state["peak"] <= 2
+
+    def test_updates_written_and_committed_by_batch(self, run_task):
+        db = _fake_db(SimpleNamespace(), [(i, f"https://img.org/{i}.png") for i in range(5)])
+
+        run_task(db, lambda url: {"width": 1, "height": 1}, batch_size=2)
+
+        assert sorted(len(batch) for batch in db.updates) == [1, 2, 2]
+        # Job en running, lots de 2, 2 et 1, job terminé
+        assert db.commit.call_count == 5
+
+    def test_media_selected_by_join_without_id_list(self, run_task):
+        """Les filtres d'expression passent par une jointure, pas par un IN (...) d'ids."""
+        db = _fake_db(SimpleNamespace(), [(1, "https://img.org/a.png")])
+
+        run_task(db, lambda url: {"width": 1, "height": 1}, depth=2)
+
+        [select_stmt] = [call.args[0] for call in db.execute.call_args_list if call.args[0].is_select]
+        sql = str(select_stmt.compile(dialect=postgresql.dialect()))
+        assert "JOIN expressions ON expressions.id = media.expression_id" in sql
+        assert "expressions.depth <=" in sql
+        assert " IN " not in sql
+
+    def test_no_matching_expression_skips_media_query(self, run_task):
+        db = _fake_db(SimpleNamespace(), [(1, "https://img.org/a.png")])
+        db.query.side_effect = lambda *entities: FakeQuery([])
+
+        result = run_task(db, lambda url: {})
+
+        assert result["message"] == "No matching expressions"
+        db.execute.assert_not_called()
+
+
+class TestChunking:
+    def test_large_land_dispatched_as_chord(self, run_task):
+        db = _fake_db(SimpleNamespace(), [(i, f"https://img.org/{i}.png") for i in range(1, 6)])
+        chord_result = MagicMock(id="chord-1")
+        header = MagicMock(return_value=chord_result)
+
+        with patch.object(media_analysis_task.settings, "MEDIA_ANALYSIS_CHUNK_SIZE", 2), patch.object(
+            media_analysis_task, "chord", return_value=header
+        ) as chord:
+            result = run_task(db, lambda url: pytest.fail("analysed in the dispatcher"))
+
+        signatures = list(chord.call_args.args[0])
+        assert [[media_id for media_id, _ in signature.args[1]] for signature in signatures] == [[1, 2], [3, 4], [5]]
+        assert all(signature.args[2] == 5 for signature in signatures)
+        assert header.call_args.args[0].args[:2] == (1, 1)
+        assert result["status"] == "dispatched"
+        assert result["chunks"] == 3
+        assert result["finalize_task_id"] == "chord-1"
+        assert db.updates == []
+
+    def test_chunk_advances_job_progress_atomically(self):
+        db = _fake_db(SimpleNamespace(), [])
+        processor = MagicMock()
+        processor.download_image.return_value = (b"png", "image/png")
+        items = [(i, f"https://img.org/{i}.png") for i in range(3)]
+
+        with patch.object(media_analysis_task, "SessionLocal", return_value=db), patch.object(
+            media_analysis_task, "MediaProcessorSync", return_value=processor
+        ), patch.object(media_analysis_task, "analyze_image_bytes", return_value={"width": 1, "height": 1}):
+            result = media_analysis_task.analyze_media_chunk_task.run(7, items, 12, batch_size=2)
+
+        assert result == {"analyzed": 3, "failed": 0}
+        progress_updates = [
+            call.args[0].compile(dialect=postgresql.dialect())
+            for call in db.execute.call_args_list
+            if call.args[0].is_update and call.args[0].table.name == "crawl_jobs"
+        ]
+        # progress = coalesce(progress, 0) + part du chunk, en SQL (chunks concurrents)
+        assert all("coalesce(crawl_jobs.progress" in str(stmt) for stmt in progress_updates)
+        assert [stmt.params["coalesce_2"] for stmt in progress_updates] == [2 / 12, 1 / 12]
+        assert {stmt.params["id_1"] for stmt in progress_updates} == {7}
+        db.close.assert_called_once()
+
+    def test_finalize_sums_chunk_stats_and_completes_job(self):
+        job = SimpleNamespace()
+        db = _fake_db(job, [])
+
+        with patch.object(media_analysis_task, "SessionLocal", return_value=db):
+            result = media_analysis_task.finalize_media_analysis_task.run(
+                [{"analyzed": 2, "failed": 1}, {"analyzed": 1, "failed": 0}],
+                1, 1, 999, 0.0, "2026-01-01T00:00:00+00:00",
+            )
+
+        assert (result["analyzed"], result["failed"], result["total_media"]) == (3, 1, 4)
+        assert result["status"] == "completed"
+        assert job.status == media_analysis_task.CrawlStatus.COMPLETED
+        assert job.progress == 1.0
@@ -309,15 +309,13 @@ class TestMediaLinkExtractor:
     
     async def test_create_expression_links(self, extractor, mock_db):
         """Test de création des liens d'expressions."""
-        # Mock pour la recherche d'expressions cibles (scalar_one_or_none)
+        # Résolution des cibles en une requête : (id, url)
         mock_target_result = MagicMock()
-        mock_target_expression = MagicMock()
-        mock_target_expression.id = 2
-        mock_target_result.scalar_one_or_none.return_value = mock_target_expression
+        mock_target_result.all.return_value = [(2, "https://example.com/target-page")]
 
-        # Mock pour la recherche de liens existants (scalar_one_or_none)
+        # Liens existants de la source (target_id) : aucun
         mock_existing_result = MagicMock()
-        mock_existing_result.scalar_one_or_none.return_value = None  # Pas de lien existant
+        mock_existing_result.scalars.return_value.all.return_value = []
 
         # Configuration des appels mock (await db.execute returns these sequentially)
         mock_db.execute = AsyncMock(side_effect=[mock_target_result, mock_existing_result])
@@ -339,6 +337,34 @@ class TestMediaLinkExtractor:
         assert created_count == 1
         mock_db.add.assert_called_once()
         mock_db.flush.assert_called_once()
+
+    async def test_create_expression_links_batched_lookup(self, extractor, mock_db):
+        """Deux requêtes quel que soit le nombre de liens ; liens existants ignorés."""
+        mock_target_result = MagicMock()
+        mock_target_result.all.return_value = [
+            (2, "https://example.com/a"),
+            (3, "https://example.com/b"),
+        ]
+        mock_existing_result = MagicMock()
+        mock_existing_result.scalars.return_value.all.return_value = [3]
+        mock_db.execute = AsyncMock(side_effect=[mock_target_result, mock_existing_result])
+
+        link_list = [
+            LinkInfo(url=url, anchor_text=None, title=None, link_type="internal")
+            for url in ("https://example.com/a", "https://example.com/b",
+                        "https://example.com/a", "https://example.com/unknown")
+        ]
+
+        created_count = await extractor.create_expression_links(1, link_list, land_id=5)
+
+        assert created_count == 1
+        assert mock_db.execute.await_count == 2
+        target_sql = str(mock_db.execute.await_args_list[0].args[0].compile(
+            compile_kwargs={"literal_binds": True}
+        ))
+        assert "expressions.url IN" in target_sql
+        assert "expressions.land_id = 5" in target_sql
+        assert mock_db.add.call_args.args[0].target_id == 2
     
     async def test_process_expression_media_and_links(self, extractor, sample_markdown):
         """Test du traitement complet média et liens."""
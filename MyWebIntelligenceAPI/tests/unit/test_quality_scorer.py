@@ -9,7 +9,14 @@ import json
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
-from app.services.quality_scorer import QualityScorer, QualityResult
+from app.services.quality_scorer import (
+    QualityScorer,
+    QualityResult,
+    classify_content_type,
+    CONTENT_TYPE_HTML,
+    CONTENT_TYPE_PDF,
+    CONTENT_TYPE_OTHER,
+)
 
 
 # Mock classes for testing
@@ -121,6 +128,26 @@ class TestAccessBlock:
         assert result["score"] == 0.0
         assert "non_html_pdf" in result["flags"]
 
+    def test_content_type_class_used_before_header(self, scorer, test_land):
+        """content_type_class pré-calculé prime sur le header brut"""
+        expr = MockExpression(
+            http_status=200,
+            content_type="text/html",
+            content_type_class=CONTENT_TYPE_PDF,
+            crawled_at=datetime.now(timezone.utc)
+        )
+        result = scorer.compute_quality_score(expr, test_land)
+        assert result["score"] == 0.0
+        assert "non_html_pdf" in result["flags"]
+
+    def test_classify_content_type(self):
+        """Classification du header Content-Type"""
+        assert classify_content_type("text/html; charset=UTF-8") == CONTENT_TYPE_HTML
+        assert classify_content_type("Application/PDF") == CONTENT_TYPE_PDF
+        assert classify_content_type("application/json") == CONTENT_TYPE_OTHER
+        assert classify_content_type("") is None
+        assert classify_content_type(None) is None
+
 
 class TestStructureBlock:
     """Tests pour le bloc Structure (15%)"""
@@ -299,6 +326,30 @@ class TestQualityScorer:
         assert "reason" in result
         assert "details" in result
 
+    def test_reason_main_issues(self, scorer, test_land):
+        """La raison liste les principales pénalités"""
+        expr = MockExpression(
+            http_status=200,
+            content_type="text/html",
+            word_count=50,
+            language="de",
+            crawled_at=datetime.now(timezone.utc)
+        )
+        result = scorer.compute_quality_score(expr, test_land)
+        assert "contenu trop court" in result["reason"]
+        assert "langue incorrecte" in result["reason"]
+        assert "extraction échouée" in result["reason"]
+
+    def test_without_reason(self, scorer, perfect_expression, test_land):
+        """include_reason=False ne change que reason"""
+        full = scorer.compute_quality_score(perfect_expression, test_land)
+        fast = scorer.compute_quality_score(perfect_expression, test_land, include_reason=False)
+
+        assert fast["reason"] == ""
+        assert fast["score"] == full["score"]
+        assert fast["category"] == full["category"]
+        assert fast["flags"] == full["flags"]
+
     def test_result_structure(self, scorer, perfect_expression, test_land):
         """Vérifier structure QualityResult"""
         result = scorer.compute_quality_score(perfect_expression, test_land)
@@ -0,0 +1,189 @@
+"""
+Tests unitaires pour la tâche readable working.
+"""
+import importlib
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+# Le package app.tasks réexporte la tâche sous le même nom que le module
+module = importlib.import_module("app.tasks.readable_working_task")
+
+
+class TestCreateLinks:
+    def test_single_insert_on_conflict_without_self_link(self):
+        db = MagicMock()
+        db.query.return_value.filter.return_value = [(3,), (4,), (1,)]
+        db.execute.return_value.rowcount = 2
+
+        created = module._create_links(db, 7, 1, ["https://a.org", "https://b.org", "https://a.org", None])
+
+        assert created == 2
+        db.execute.assert_called_once()
+        sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT ON CONSTRAINT uq_expression_link DO NOTHING" in sql
+        params = db.execute.call_args.args[0].compile(dialect=postgresql.dialect()).params
+        assert {params["target_id_m0"], params["target_id_m1"]} == {3, 4}
+
+    def test_no_known_target_skips_insert(self):
+        db = MagicMock()
+        db.query.return_value.filter.return_value = []
+
+        assert module._create_links(db, 7, 1, ["https://a.org"]) == 0
+        db.execute.assert_not_called()
+
+
+class TestCreateMedia:
+    def test_single_insert_on_conflict_with_url_hash(self):
+        db = MagicMock()
+        db.execute.return_value.rowcount = 1
+        media_list = [
+            {"url": "https://img.org/a.png", "type": "img"},
+            SimpleNamespace(url="https://img.org/b.mp4", type="video"),
+            {"url": "https://img.org/a.png"},
+            {"url": None},
+        ]
+
+        created = module._create_media(db, 5, media_list)
+
+        assert created == 1
+        db.execute.assert_called_once()
+        compiled = db.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert "ON CONFLICT ON CONSTRAINT uq_media_expression_url DO NOTHING" in str(compiled)
+        assert [compiled.params["url_m0"], compiled.params["url_m1"]] == [
+            "https://img.org/a.png", "https://img.org/b.mp4",
+        ]
+        assert compiled.params["url_hash_m0"] == module.models.Media.compute_url_hash("https://img.org/a.png")
+        assert compiled.params["type_m1"] == "video"
+
+    def test_empty_list_skips_insert(self):
+        db = MagicMock()
+
+        assert module._create_media(db, 5, [{"url": ""}]) == 0
+        db.execute.assert_not_called()
+
+
+class TestIterExpressions:
+    def test_pages_loaded_in_selection_order(self):
+        """Les pages gardent l'ordre depth/id de la sélection ; ids disparus ignorés."""
+        db = MagicMock()
+        pages = [
+            [SimpleNamespace(id=1), SimpleNamespace(id=5)],
+            [SimpleNamespace(id=2)],
+        ]
+        db.query.return_value.options.return_value.filter.side_effect = lambda *args: pages.pop(0)
+
+        with patch.object(module, "READABLE_PAGE_SIZE", 2):
+            loaded = [expr.id for expr in module._iter_expressions(db, [5, 1, 9, 2])]
+
+        assert loaded == [5, 1, 2]
+        assert db.query.return_value.options.call_count == 2
+
+
+class TestIterExtracted:
+    def test_window_extracted_concurrently_in_order(self):
+        """Deux extractions se chevauchent ; les résultats gardent l'ordre des expressions."""
+        barrier = threading.Barrier(2, timeout=5)
+        loops = set()
+
+        def extract(loop, url, html, archive_client):
+            loops.add(loop)
+            if url.endswith(("/1", "/2")):
+                barrier.wait()
+            return {"readable": url}
+
+        expressions = [SimpleNamespace(id=i, url=f"https://a.org/{i}", content=None) for i in range(1, 6)]
+        with patch.object(module, "_extract_content_sync", side_effect=extract):
+            pairs = list(module._iter_extracted(iter(expressions), 2))
+
+        assert [(expr.id, result["readable"]) for expr, result in pairs] == [
+            (i, f"https://a.org/{i}") for i in range(1, 6)
+        ]
+        # Une boucle persistante par thread du pool
+        assert all(not loop.is_closed() for loop in loops)
+
+    def test_pool_and_loops_reused_across_tasks(self):
+        loops = []
+
+        def extract(loop, url, html, archive_client):
+            loops.append((loop, archive_client))
+            return {"readable": url}
+
+        expressions = [SimpleNamespace(id=1, url="https://a.org/1", content=None)]
+        with patch.object(module, "_extract_content_sync", side_effect=extract), patch.object(
+            module, "_extraction_pool", None
+        ), patch.object(module.settings, "READABLE_CONCURRENCY", 1):
+            list(module._iter_extracted(iter(expressions), 1))
+            pool = module._get_extraction_pool()
+            list(module._iter_extracted(iter(expressions), 1))
+
+            assert module._get_extraction_pool() is pool
+        # Même boucle et même client archive.org (celui du thread) d'une tâche à l'autre
+        assert loops[0][0] is loops[1][0]
+        assert loops[0][1] is loops[1][1]
+        assert isinstance(loops[0][1], module.httpx.AsyncClient) and not loops[0][1].is_closed
+        pool.shutdown()
+
+
+class TestBatchedCommits:
+    def _run(self, expressions, extract, create_media=None, on_commit=None):
+        db = MagicMock()
+        job = SimpleNamespace()
+        if on_commit:
+            db.commit.side_effect = lambda: on_commit(job)
+        query = db.query.return_value.filter.return_value
+        query.first.return_value = job
+        query.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
+            (expr.id,) for expr in expressions
+        ]
+        with patch.object(module, "SessionLocal", return_value=db), patch.object(
+            module, "_iter_expressions", return_value=iter(expressions)
+        ), patch.object(
+            module, "_extract_content_sync", side_effect=lambda loop, url, html, archive_client: extract(url, html)
+        ), patch.object(
+            module, "_create_media", side_effect=create_media or (lambda *args: 0)
+        ), patch.object(module, "_create_links", return_value=0), patch.object(module, "COMMIT_EVERY", 2):
+            result = module.readable_working_task.run(land_id=1, job_id=1, limit=10)
+        return db, job, result
+
+    @staticmethod
+    def _expr(expr_id):
+        return SimpleNamespace(id=expr_id, url=f"https://a.org/{expr_id}", content="<p>x</p>",
+                               readable=None, title=None, description=None, lang=None)
+
+    def test_commit_every_n_expressions_with_progress(self):
+        progress_at_commit = []
+        expressions = [self._expr(i) for i in range(1, 6)]
+
+        def extract(url, html):
+            return {"readable": "texte", "extraction_source": "trafilatura"}
+
+        db, job, result = self._run(
+            expressions, extract,
+            on_commit=lambda job: progress_at_commit.append(getattr(job, "progress", None)),
+        )
+
+        assert result["processed"] == 5
+        # running, lots de 2 et 2, dernier lot, job termine
+        assert progress_at_commit == [None, 0.4, 0.8, 0.8, 1.0]
+        assert db.begin_nested.call_count == 5
+
+    def test_failed_expression_rolled_back_alone(self):
+        expressions = [self._expr(i) for i in range(1, 4)]
+
+        def create_media(db, expression_id, media_list):
+            if expression_id == 2:
+                raise RuntimeError("insert failed")
+            return 1
+
+        db, job, result = self._run(
+            expressions, lambda url, html: {"readable": "texte"}, create_media=create_media
+        )
+
+        assert (result["processed"], result["errors"], result["media_created"]) == (3, 1, 2)
+        # Le savepoint de l'expression 2 est annule, sans rollback de la transaction du lot
+        assert db.begin_nested.return_value.__exit__.call_args_list[1].args[0] is RuntimeError
+        db.rollback.assert_not_called()
+        assert job.progress == 1.0
@@ -0,0 +1,128 @@
+"""
+Tests unitaires pour la tâche SEO Rank.
+"""
+import asyncio
+import importlib
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+# Le package app.tasks réexporte la tâche sous le même nom que le module
+module = importlib.import_module("app.tasks.seorank_task")
+HttpxAsyncClient = httpx.AsyncClient
+
+
+def _run_task(expressions, handler, **settings):
+    clients = []
+
+    def make_client(**kwargs):
+        clients.append(HttpxAsyncClient(transport=httpx.MockTransport(handler), **kwargs))
+        return clients[-1]
+
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = SimpleNamespace(id=1)
+    db.query.return_value.filter.return_value.filter.return_value.filter.return_value \
+        .order_by.return_value.all.return_value = expressions
+
+    with patch.object(module, "SessionLocal", return_value=db), patch.object(
+        module.httpx, "AsyncClient", side_effect=make_client
+    ), patch.object(module.settings, "SEORANK_REQUEST_DELAY", settings.get("delay", 0)), patch.object(
+        module.settings, "SEORANK_CONCURRENCY", settings.get("concurrency", 8)
+    ), patch.object(module.seorank_task, "update_state"):
+        result = module.seorank_task.run(land_id=1, api_key_override="key")
+    return db, clients, result
+
+
+def _expr(expr_id, url=None):
+    """Ligne (id, url) de la requête d'expressions."""
+    return expr_id, f"https://a.org/{expr_id}" if url is None else url
+
+
+def _updates(db):
+    """Paramètres des UPDATE seorank exécutés, par lot."""
+    return [call.args[1] for call in db.execute.call_args_list if call.args[0] is module._SEORANK_UPDATE]
+
+
+class TestSeorankTask:
+    def test_one_client_for_all_expressions(self):
+        requested = []
+
+        def handler(request):
+            requested.append(str(request.url).rsplit("/", 1)[1])
+            if requested[-1] == "2":
+                return httpx.Response(503)
+            return httpx.Response(200, json={"da": 42})
+
+        expressions = [_expr(1), _expr(2), _expr(3), _expr(4, url="")]
+        db, clients, result = _run_task(expressions, handler)
+
+        assert (result["processed"], result["updated"], result["errors"], result["skipped"]) == (3, 2, 1, 1)
+        assert len(clients) == 1 and clients[0].is_closed
+        assert sorted(requested) == ["1", "2", "3"]
+        # Un UPDATE executemany et un commit par fenêtre d'expressions
+        [batch] = _updates(db)
+        assert sorted(row["expression_id"] for row in batch) == [1, 3]
+        assert json.loads(batch[0]["payload"]) == {"da": 42}
+        db.commit.assert_called_once()
+
+    def test_requests_in_flight_bounded_by_concurrency(self):
+        state = {"in_flight": 0, "peak": 0}
+
+        async def handler(request):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+            return httpx.Response(200, json={})
+
+        _, _, result = _run_task([_expr(i) for i in range(1, 9)], handler, concurrency=3)
+
+        assert result["updated"] == 8
+        assert state["peak"] == 3
+
+    def test_commit_per_window(self):
+        with patch.object(module, "FETCH_WINDOW", 2):
+            db, _, result = _run_task([_expr(i) for i in range(1, 6)], lambda request: httpx.Response(200, json={}))
+
+        assert result["updated"] == 5
+        assert [len(batch) for batch in _updates(db)] == [2, 2, 1]
+        assert db.commit.call_count == 3
+
+    def test_failed_window_rolled_back_and_counted(self):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = SimpleNamespace(id=1)
+        db.query.return_value.filter.return_value.filter.return_value.filter.return_value \
+            .order_by.return_value.all.return_value = [_expr(1), _expr(2)]
+        db.execute.side_effect = RuntimeError("deadlock")
+
+        with patch.object(module, "SessionLocal", return_value=db), patch.object(
+            module.httpx, "AsyncClient",
+            side_effect=lambda **kwargs: HttpxAsyncClient(
+                transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})), **kwargs
+            ),
+        ), patch.object(module.settings, "SEORANK_REQUEST_DELAY", 0), patch.object(
+            module.seorank_task, "update_state"
+        ):
+            result = module.seorank_task.run(land_id=1, api_key_override="key")
+
+        assert (result["status"], result["updated"], result["errors"]) == ("completed", 0, 2)
+        db.rollback.assert_called_once()
+
+
+class TestRequestSpacer:
+    def test_request_starts_spaced_by_interval(self):
+        async def start_times():
+            spacer = module._RequestSpacer(0.05)
+            loop = asyncio.get_running_loop()
+
+            async def one():
+                await spacer.wait()
+                return loop.time()
+
+            return sorted(await asyncio.gather(*(one() for _ in range(3))))
+
+        times = asyncio.run(start_times())
+
+        assert all(later - earlier >= 0.045 for earlier, later in zip(times, times[1:]))
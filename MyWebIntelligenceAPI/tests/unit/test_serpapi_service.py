@@ -0,0 +1,536 @@
+"""
+Tests unitaires pour le service SerpAPI.
+"""
+import io
+import json
+
+import httpx
+from datetime import date, datetime, timedelta
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services import serpapi_service
+from app.services.serpapi_service import (
+    SerpApiError,
+    SerpEntry,
+    cache_stats,
+    clear_cache,
+    fetch_serpapi_batch,
+    fetch_serpapi_url_list,
+    fetch_serpapi_url_list_async,
+    iter_serpapi_url_list,
+    parse_serp_result_date,
+    parse_serp_result_dates,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Chaque test part d'un cache SerpAPI vide."""
+    clear_cache()
+    serpapi_service._RATE_LIMITER.clear()
+    FakeAiohttpSession.history.clear()
+    yield
+    clear_cache()
+    serpapi_service._RATE_LIMITER.clear()
+
+
+def _page(links, next_offset=None):
+    """Payload SerpAPI minimal pour une page de résultats."""
+    payload = {
+        "organic_results": [
+            {
+                "position": i + 1,
+                "title": f"T{link}",
+                "link": link,
+                "date": None,
+                "snippet": "...",
+                "sitelinks": {"inline": [{"title": "nested", "link": "https://nested"}]},
+            }
+            for i, link in enumerate(links)
+        ]
+    }
+    if next_offset is not None:
+        payload["serpapi_pagination"] = {
+            "next_link": f"https://serpapi.com/search?start={next_offset}",
+            "next_offset": next_offset,
+        }
+    return payload
+
+
+def _google_pages(params):
+    """Deux pages par fenêtre, liens préfixés par la fenêtre (tbs) ou la requête."""
+    if params["q"] == "boom":
+        return {"error": "Invalid query"}
+    window = params.get("tbs", "all" if params["q"] == "q" else params["q"])
+    if params["start"] == 0:
+        return _page([f"{window}-a", f"{window}-b"], next_offset=2)
+    return _page([f"{window}-c"])
+
+
+class FakeStreamReader:
+    def __init__(self, body):
+        self._buffer = io.BytesIO(body)
+
+    async def read(self, n=-1):
+        return self._buffer.read(n)
+
+
+class FakeAiohttpResponse:
+    def __init__(self, payload, status=200, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = json.dumps(payload)
+        self.content = FakeStreamReader(self._body.encode())
+
+    async def read(self):
+        return self._body.encode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeAiohttpSession:
+    """Remplace aiohttp.ClientSession en servant les pages de _google_pages."""
+
+    history = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get(self, url, params=None, headers=None):
+        self.history.append(dict(params))
+        return FakeAiohttpResponse(_google_pages(params))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeRaw(io.BytesIO):
+    decode_content = False
+
+
+def _requests_response(payload, status=200, headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.content = json.dumps(payload).encode()
+    response.raw = FakeRaw(response.content)
+    response.__enter__.return_value = response
+    return response
+
+
+class TestValidation:
+    def test_empty_query_rejected(self):
+        with pytest.raises(SerpApiError):
+            fetch_serpapi_url_list("key", "   ")
+
+    def test_unsupported_engine_rejected(self):
+        with pytest.raises(SerpApiError):
+            fetch_serpapi_url_list("key", "q", engine="yahoo")
+
+    def test_bing_date_filter_rejected(self):
+        with pytest.raises(SerpApiError):
+            fetch_serpapi_url_list("key", "q", engine="bing", datestart="2024-01-01", dateend="2024-01-31")
+
+
+class TestFetchSync:
+    def test_pagination_follows_next_offset(self):
+        with patch.object(serpapi_service._SESSION, "get") as mock_get:
+            mock_get.side_effect = lambda url, params, **kwargs: _requests_response(_google_pages(params))
+            results = fetch_serpapi_url_list("key", "q", sleep_seconds=0)
+
+        assert [r.link for r in results] == ["all-a", "all-b", "all-c"]
+        assert results[0] == SerpEntry(position=1, title="Tall-a", link="all-a", date=None)
+        assert [call.kwargs["params"]["start"] for call in mock_get.call_args_list] == [0, 2]
+
+    def test_iter_yields_before_next_page(self):
+        with patch.object(serpapi_service._SESSION, "get") as mock_get:
+            mock_get.side_effect = lambda url, params, **kwargs: _requests_response(_google_pages(params))
+            entries = iter_serpapi_url_list("key", "q", sleep_seconds=0)
+            assert next(entries).link == "all-a"
+            assert mock_get.call_count == 1
+            assert [entry.link for entry in entries] == ["all-b", "all-c"]
+
+    def test_iter_validates_eagerly(self):
+        with pytest.raises(SerpApiError):
+            iter_serpapi_url_list("key", "")
+
+    def test_http_error_raises(self):
+        with patch.object(serpapi_service._SESSION, "get", return_value=_requests_response({}, status=500)):
+            with pytest.raises(SerpApiError):
+                fetch_serpapi_url_list("key", "q", sleep_seconds=0)
+
+
+class TestStreamedPayload:
+    def test_only_used_fields_are_kept(self):
+        payload = _page(["x"], next_offset=1)
+        payload["search_information"] = {"total_results": 42}
+        payload["related_searches"] = [{"query": "noise"}]
+
+        streamed = serpapi_service._read_serpapi_response(_requests_response(payload))
+
+        assert streamed == {
+            "organic_results": [{"position": 1, "title": "Tx", "link": "x", "date": None}],
+            "serpapi_pagination": payload["serpapi_pagination"],
+            "search_information": {"total_results": 42},
+        }
+
+    def test_error_payload_streamed(self):
+        streamed = serpapi_service._read_serpapi_response(_requests_response({"error": "Invalid API key"}))
+        assert streamed == {"error": "Invalid API key"}
+
+    def test_truncated_json_raises(self):
+        response = _requests_response({})
+        response.raw = FakeRaw(b'{"organic_results": [{"link": ')
+        with pytest.raises(SerpApiError):
+            serpapi_service._read_serpapi_response(response)
+
+    def test_http_error_body_in_message(self):
+        response = _requests_response({})
+        response.status_code = 503
+        response.content = b"Service Unavailable"
+        with pytest.raises(SerpApiError, match="503: Service Unavailable"):
+            serpapi_service._read_serpapi_response(response)
+
+    def test_invalid_json_without_ijson(self):
+        response = _requests_response({})
+        response.content = b"<html>"
+        with patch.object(serpapi_service, "IJSON_AVAILABLE", False):
+            with pytest.raises(SerpApiError, match="Invalid JSON"):
+                serpapi_service._read_serpapi_response(response)
+
+    def test_fallback_without_ijson(self):
+        payload = _page(["x"])
+        with patch.object(serpapi_service, "IJSON_AVAILABLE", False):
+            assert serpapi_service._read_serpapi_response(_requests_response(payload)) == payload
+
+
+class TestRequestParams:
+    def test_google_window_page(self):
+        base = serpapi_service._build_serpapi_base_params("key", "q", "google", "fr", 100)
+        window = serpapi_service._build_serpapi_window_params(base, "google", date(2024, 1, 1), date(2024, 1, 7))
+        params = {**window, **serpapi_service._serpapi_paginator_params("google", 100)}
+
+        assert params == {
+            "api_key": "key",
+            "engine": "google",
+            "q": "q",
+            "google_domain": "google.fr",
+            "gl": "fr",
+            "hl": "fr",
+            "lr": "lang_fr",
+            "safe": "off",
+            "num": 100,
+            "tbs": "cdr:1,cd_min:01/01/2024,cd_max:01/07/2024",
+            "start": 100,
+        }
+        assert "tbs" not in base
+
+    def test_bing_and_duckduckgo_pages(self):
+        bing = serpapi_service._build_serpapi_base_params("key", "q", "bing", "en", 50)
+        assert {**bing, **serpapi_service._serpapi_paginator_params("bing", 0)} == {
+            "api_key": "key", "engine": "bing", "q": "q", "mkt": "en-US", "count": 50, "first": 1,
+        }
+
+        ddg = serpapi_service._build_serpapi_base_params("key", "q", "duckduckgo", "fr", 50)
+        window = serpapi_service._build_serpapi_window_params(ddg, "duckduckgo", date(2024, 1, 1), date(2024, 1, 7))
+        assert window["df"] == "2024-01-01..2024-01-07"
+        assert window["kl"] == "fr-fr"
+
+
+class TestNextIndex:
+    @pytest.mark.parametrize(
+        "link, start_index, expected",
+        [
+            ("https://serpapi.com/search.json?engine=google&q=x&start=100", 0, 100),
+            ("https://serpapi.com/search.json?engine=bing&first=51&q=x", 1, 51),
+            ("https://serpapi.com/search.json?start=0&offset=20", 10, 20),
+            ("https://serpapi.com/search.json?start=10", 10, None),
+            ("https://serpapi.com/search.json?q=x", 0, None),
+        ],
+    )
+    def test_index_from_link(self, link, start_index, expected):
+        assert serpapi_service._next_index_from_link(link, start_index) == expected
+
+    def test_next_offset_preferred(self):
+        payload = {"serpapi_pagination": {"next_link": "https://x?start=5", "next_offset": 100}}
+        assert serpapi_service._serpapi_next_index(payload, 0) == (True, 100)
+
+    def test_link_without_offset_advances_by_count(self):
+        payload = {"serpapi_pagination": {"next": "https://x?q=y"}}
+        assert serpapi_service._serpapi_next_index(payload, 0) == (True, None)
+        assert serpapi_service._serpapi_next_index({}, 0) == (False, None)
+
+
+class TestResponseCache:
+    def test_repeated_crawl_served_from_cache(self):
+        with patch.object(serpapi_service._SESSION, "get") as mock_get:
+            mock_get.side_effect = lambda url, params, **kwargs: _requests_response(_google_pages(params))
+            first = fetch_serpapi_url_list("key", "q", sleep_seconds=0)
+            second = fetch_serpapi_url_list("other-key", "q", sleep_seconds=0)
+
+        assert first == second
+        assert mock_get.call_count == 2
+        assert cache_stats().hits == 2
+
+    def test_error_payload_not_cached(self):
+        with patch.object(serpapi_service._SESSION, "get") as mock_get:
+            mock_get.return_value = _requests_response({"error": "Invalid API key"})
+            for _ in range(2):
+                with pytest.raises(SerpApiError):
+                    fetch_serpapi_url_list("key", "q", sleep_seconds=0)
+
+        assert mock_get.call_count == 2
+
+    def test_ttl_expiry_and_lru_eviction(self):
+        cache = serpapi_service._SerpCache(maxsize=2, default_ttl=60)
+        cache.set(("a",), {"n": 1})
+        cache.set(("b",), {"n": 2})
+        cache.get(("a",))
+        cache.set(("c",), {"n": 3})
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == {"n": 1}
+
+        cache.set(("d",), {"n": 4}, ttl=1)
+        with patch.object(serpapi_service.time, "monotonic", return_value=serpapi_service.time.monotonic() + 5):
+            assert cache.get(("d",)) is None
+        assert cache.stale(("d",)) is None
+
+    def test_expired_entry_revalidated_with_etag(self):
+        """Une entrée expirée avec ETag est renvoyée en requête conditionnelle, un 304 la réutilise."""
+        page = _page(["x"])
+        with patch.object(serpapi_service._SESSION, "get") as mock_get:
+            mock_get.return_value = _requests_response(page, headers={"ETag": '"v1"'})
+            first = fetch_serpapi_url_list("key", "q", sleep_seconds=0)
+
+            later = serpapi_service.time.monotonic() + 3600
+            mock_get.return_value = _requests_response({}, status=304)
+            with patch.object(serpapi_service.time, "monotonic", return_value=later):
+                second = fetch_serpapi_url_list("key", "q", sleep_seconds=0)
+
+        assert first == second
+        assert mock_get.call_args_list[0].kwargs["headers"] is None
+        assert mock_get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"v1"'}
+        assert cache_stats().revalidated == 1
+
+    def test_store_response_keeps_validators_on_304(self):
+        cache = serpapi_service._SerpCache()
+        stale = serpapi_service._StaleEntry({"n": 1}, None, "Mon, 01 Jan 2024 00:00:00 GMT")
+        payload = cache.store_response(("k",), 304, {}, None, stale)
+        assert payload == {"n": 1}
+        assert cache.stale(("k",)) == stale
+
+
+class TestFetchAsync:
+    async def test_windows_fetched_and_ordered(self):
+        hook_calls = []
+        with patch.object(serpapi_service.aiohttp, "ClientSession", FakeAiohttpSession):
+            results = await fetch_serpapi_url_list_async(
+                "key",
+                "q",
+                datestart="2024-01-01",
+                dateend="2024-01-14",
+                timestep="week",
+                sleep_seconds=0,
+                progress_hook=lambda start, end, count: hook_calls.append((start, end, count)),
+            )
+
+        links = [r.link for r in results]
+        assert len(links) == 6
+        # Ordre des fenêtres conservé malgré l'exécution concurrente
+        assert links[0].endswith("cd_max:01/07/2024-a")
+        assert links[-1].endswith("cd_max:01/14/2024-c")
+        assert sorted(hook_calls) == [
+            (date(2024, 1, 1), date(2024, 1, 7), 3),
+            (date(2024, 1, 8), date(2024, 1, 14), 3),
+        ]
+
+    async def test_matches_sync_results(self):
+        with patch.object(serpapi_service.aiohttp, "ClientSession", FakeAiohttpSession):
+            async_results = await fetch_serpapi_url_list_async("key", "q", sleep_seconds=0)
+        with patch.object(serpapi_service._SESSION, "get") as mock_get:
+            mock_get.side_effect = lambda url, params, **kwargs: _requests_response(_google_pages(params))
+            sync_results = fetch_serpapi_url_list("key", "q", sleep_seconds=0)
+
+        assert async_results == sync_results
+
+    async def test_date_windows_request_full_pages(self):
+        with patch.object(serpapi_service.aiohttp, "ClientSession", FakeAiohttpSession):
+            await fetch_serpapi_url_list_async(
+                "key", "q", datestart="2024-01-01", dateend="2024-01-07", sleep_seconds=0
+            )
+
+        params = FakeAiohttpSession.history
+        assert params and all(p["num"] == 100 and p["tbs"].startswith("cdr:1") for p in params)
+
+
+class TestFetchBatch:
+    async def test_results_keyed_by_query(self):
+        with patch.object(serpapi_service.aiohttp, "ClientSession", FakeAiohttpSession):
+            results = await fetch_serpapi_batch(
+                "key", ["alpha", "beta", "alpha"], sleep_seconds=0, requests_per_second=0
+            )
+
+        assert list(results) == ["alpha", "beta"]
+        assert [r.link for r in results["alpha"]] == ["alpha-a", "alpha-b", "alpha-c"]
+        assert [r.link for r in results["beta"]] == ["beta-a", "beta-b", "beta-c"]
+
+    async def test_failing_query_does_not_cancel_others(self):
+        with patch.object(serpapi_service.aiohttp, "ClientSession", FakeAiohttpSession):
+            results = await fetch_serpapi_batch("key", ["boom", "", "beta"], sleep_seconds=0, requests_per_second=0)
+
+        assert isinstance(results["boom"], SerpApiError)
+        assert isinstance(results[""], SerpApiError)
+        assert len(results["beta"]) == 3
+
+    async def test_rate_limiter_spaces_requests(self):
+        limiter = serpapi_service._AsyncRateLimiter(rate=100)
+        start = serpapi_service.time.monotonic()
+        for _ in range(4):
+            await limiter.acquire()
+        assert serpapi_service.time.monotonic() - start >= 0.03
+
+
+class TestAdaptiveRateLimit:
+    def test_interval_from_headers(self):
+        limiter = serpapi_service._RateLimiter()
+        assert limiter.reserve("api") == 0.0
+        assert not limiter.tracks("api")
+
+        limiter.update("api", {"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "5"})
+        assert limiter.tracks("api")
+        first = limiter.reserve("api")
+        second = limiter.reserve("api")
+        assert 0.4 < first <= 0.5
+        assert 0.9 < second <= 1.0
+
+    def test_epoch_reset_and_exhausted_quota(self):
+        limiter = serpapi_service._RateLimiter()
+        reset_at = serpapi_service.time.time() + 20
+        limiter.update("api", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset_at)})
+        assert 19 < limiter.reserve("api") <= 20
+
+    def test_retry_backoff(self):
+        assert serpapi_service._retry_backoff({"Retry-After": "3"}, 0) == 3.0
+        assert serpapi_service._retry_backoff({}, 0) == 1.0
+        assert serpapi_service._retry_backoff({}, 3) == 8.0
+        assert serpapi_service._retry_backoff({}, 10) == 30.0
+
+    async def test_async_retries_on_429(self):
+        responses = [
+            FakeAiohttpResponse({}, status=429, headers={"Retry-After": "0"}),
+            FakeAiohttpResponse(_page(["x"])),
+        ]
+
+        class RetrySession(FakeAiohttpSession):
+            def get(self, url, params=None, headers=None):
+                self.history.append(dict(params))
+                return responses.pop(0)
+
+        with patch.object(serpapi_service.aiohttp, "ClientSession", RetrySession):
+            results = await fetch_serpapi_url_list_async("key", "q", sleep_seconds=0)
+
+        assert [r.link for r in results] == ["x"]
+        assert len(FakeAiohttpSession.history) == 2
+
+    async def test_http2_session_facade(self):
+        """Le transport httpx (HTTP/2) produit les mêmes résultats que aiohttp."""
+
+        def handler(request):
+            params = {k: int(v) if k == "start" else v for k, v in request.url.params.items()}
+            return httpx.Response(200, json=_google_pages(params))
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        session = serpapi_service._Http2Session(client)
+        with patch.object(serpapi_service, "_open_serpapi_session", return_value=session):
+            results = await fetch_serpapi_url_list_async("key", "q", sleep_seconds=0)
+
+        assert [r.link for r in results] == ["all-a", "all-b", "all-c"]
+        assert client.is_closed
+
+    async def test_async_revalidation_sends_conditional_headers(self):
+        sent_headers = []
+        responses = [
+            FakeAiohttpResponse(_page(["x"]), headers={"ETag": '"v1"'}),
+            FakeAiohttpResponse({}, status=304),
+        ]
+
+        class ConditionalSession(FakeAiohttpSession):
+            def get(self, url, params=None, headers=None):
+                sent_headers.append(headers)
+                return responses.pop(0)
+
+        with patch.object(serpapi_service.aiohttp, "ClientSession", ConditionalSession):
+            first = await fetch_serpapi_url_list_async("key", "q", sleep_seconds=0)
+            later = serpapi_service.time.monotonic() + 3600
+            with patch.object(serpapi_service.time, "monotonic", return_value=later):
+                second = await fetch_serpapi_url_list_async("key", "q", sleep_seconds=0)
+
+        assert first == second
+        assert sent_headers == [None, {"If-None-Match": '"v1"'}]
+
+
+class TestParseSerpResultDate:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("2024-03-05", datetime(2024, 3, 5)),
+            ("Updated: Mar. 5th, 2024", datetime(2024, 3, 5)),
+            ("5 March 2024", datetime(2024, 3, 5)),
+            ("05/03/2024", datetime(2024, 5, 3)),
+            ("25/03/2024", datetime(2024, 3, 25)),
+            ("2024.03.05", datetime(2024, 3, 5)),
+            ("25.03.2024", datetime(2024, 3, 25)),
+        ],
+    )
+    def test_absolute_dates(self, value, expected):
+        assert parse_serp_result_date(value) == expected
+
+    def test_relative_date(self):
+        parsed = parse_serp_result_date("about 3 days ago")
+        assert parsed is not None
+        assert abs((datetime.now() - timedelta(days=3)) - parsed) < timedelta(minutes=1)
+
+    @pytest.mark.parametrize("value", [None, "", "   ", " . - ", "not a date", "5 March 2024 " + "a" * 200])
+    def test_unparseable(self, value):
+        assert parse_serp_result_date(value) is None
+
+    def test_batch_matches_single_parse(self):
+        values = ["2024-03-05", None, "5 March 2024", "not a date"] * 4
+        expected = [parse_serp_result_date(value) for value in values]
+        assert parse_serp_result_dates(values) == expected
+        # Forcer le pool de processus même sur un petit lot
+        with patch.object(serpapi_service, "_PARALLEL_PARSE_MIN", 0):
+            assert parse_serp_result_dates(values, workers=2, chunksize=4) == expected
+
+
+class TestDateWindows:
+    @pytest.mark.parametrize("timestep, days", [("day", 1), ("week", 7)])
+    def test_uniform_windows_cover_range(self, timestep, days):
+        windows = serpapi_service._build_serpapi_windows("2022-01-01", "2024-02-29", timestep)
+
+        assert windows[0][0] == date(2022, 1, 1)
+        assert windows[-1][1] == date(2024, 2, 29)
+        assert all(type(start) is date and type(end) is date for start, end in windows)
+        for (start, end), (next_start, _) in zip(windows, windows[1:]):
+            assert (end - start).days == days - 1
+            assert next_start == end + timedelta(days=1)
+
+    def test_month_windows(self):
+        windows = serpapi_service._build_serpapi_windows("2024-01-31", "2024-03-03", "month")
+        assert windows == [
+            (date(2024, 1, 31), date(2024, 2, 28)),
+            (date(2024, 2, 29), date(2024, 3, 3)),
+        ]
+
+    def test_invalid_timestep(self):
+        with pytest.raises(SerpApiError):
+            serpapi_service._build_serpapi_windows("2024-01-01", "2024-01-31", "year")
@@ -0,0 +1,424 @@
+"""
+Tests unitaires pour le TextProcessorService.
+"""
+import asyncio
+import hashlib
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core import text_processing
+from app.crud.crud_paragraph import PARAGRAPH_COPY_COLUMNS, paragraph as paragraph_crud
+from app.schemas.paragraph import ParagraphCreate
+from app.services import text_processor_service
+from app.services.text_processor_service import TextProcessorService
+
+
+def _result(rows):
+    """Résultat SQLAlchemy minimal pour db.execute(...).all()."""
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+class TestExtractParagraphsForLand:
+    async def test_expressions_read_in_keyset_batches(self):
+        expressions = [SimpleNamespace(id=i) for i in (3, 5, 8)]
+        db = MagicMock()
+        db.execute = AsyncMock(
+            side_effect=[_result(expressions[:2]), _result(expressions[2:]), _result([])]
+        )
+        service = TextProcessorService()
+
+        seen = [
+            [expr.id for expr in batch]
+            async for batch in service._iter_expression_batches(db, 1, False, batch_size=2)
+        ]
+
+        assert seen == [[3, 5], [8]]
+        assert db.execute.await_count == 3
+        # Le second lot reprend après le dernier id lu
+        second_stmt = db.execute.await_args_list[1].args[0]
+        assert 5 in second_stmt.compile().params.values()
+
+    async def test_without_force_only_expressions_lacking_paragraphs(self):
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_result([]))
+        service = TextProcessorService()
+
+        stats = await service.extract_paragraphs_for_land(db, 1)
+        sql = str(db.execute.await_args.args[0])
+        assert "NOT (EXISTS" in sql
+        # Projection : pas de colonnes hors EXTRACTION_COLUMNS
+        assert "expressions.url" not in sql
+        assert stats["total_expressions"] == 0
+
+        await service.extract_paragraphs_for_land(db, 1, force_reextract=True)
+        assert "EXISTS" not in str(db.execute.await_args.args[0])
+
+    async def test_paragraphs_flushed_by_copy(self):
+        expressions = [SimpleNamespace(id=i) for i in (1, 2, 3, 4)]
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=[_result(expressions[:2]), _result(expressions[2:]), _result([])])
+        db.commit = AsyncMock()
+        service = TextProcessorService()
+        rows_by_expression = {1: [("r1",), ("r2",)], 2: [], 3: [("r3",)], 4: ValueError("boom")}
+
+        def build_rows(expr, **kwargs):
+            outcome = rows_by_expression[expr.id]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        with patch.object(service, "_build_paragraph_rows", side_effect=build_rows), patch.object(
+            text_processor_service, "PARAGRAPH_FLUSH_SIZE", 2
+        ), patch.object(
+            text_processor_service.paragraph_crud, "copy_insert", AsyncMock(side_effect=lambda db, rows: len(rows))
+        ) as copy_insert:
+            stats = await service.extract_paragraphs_for_land(db, 1)
+
+        # Un COPY après le premier lot (seuil atteint), un pour le reliquat
+        assert [call.args[1] for call in copy_insert.await_args_list] == [
+            [("r1",), ("r2",)],
+            [("r3",)],
+        ]
+        assert db.commit.await_count == 2
+        assert stats["total_expressions"] == 4
+        assert stats["processed_expressions"] == 3
+        assert stats["created_paragraphs"] == 3
+        assert stats["skipped_expressions"] == 1
+        # Une expression en échec n'interrompt pas les autres
+        assert stats["errors"] == ["Error processing expression 4: boom"]
+
+
+    async def test_next_batch_read_before_previous_written(self):
+        batches = iter([[SimpleNamespace(id=1)], [SimpleNamespace(id=2)], []])
+        events = []
+
+        async def execute(stmt):
+            events.append("read")
+            return _result(next(batches))
+
+        async def copy_insert(db, rows):
+            events.append(f"write {rows[0][0]}")
+            return len(rows)
+
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=execute)
+        db.commit = AsyncMock()
+        service = TextProcessorService()
+
+        with patch.object(service, "_build_paragraph_rows", side_effect=lambda expr, **kwargs: [(expr.id,)]), patch.object(
+            text_processor_service, "PARAGRAPH_FLUSH_SIZE", 1
+        ), patch.object(text_processor_service.paragraph_crud, "copy_insert", AsyncMock(side_effect=copy_insert)):
+            stats = await service.extract_paragraphs_for_land(db, 1)
+
+        # Le lot 2 est lu avant l'écriture du lot 1, le lot 1 écrit avant la fin de lecture
+        assert events == ["read", "read", "write 1", "read", "write 2"]
+        assert stats["created_paragraphs"] == 2
+
+
+class TestParagraphRows:
+    def test_rows_follow_copy_columns_and_skip_duplicates(self):
+        paragraph = "Un paragraphe suffisamment long pour être extrait du texte source. " * 2
+        expression = SimpleNamespace(
+            id=7, readable=f"{paragraph}\n\n{paragraph}", content=None,
+            description=None, summary=None, title=None,
+        )
+
+        rows = TextProcessorService()._build_paragraph_rows(expression, min_length=20)
+
+        assert len(rows) == 1
+        row = dict(zip(PARAGRAPH_COPY_COLUMNS, rows[0]))
+        assert row["expression_id"] == 7
+        assert row["position"] == 0
+        assert row["text_hash"] == hashlib.sha256(row["text"].encode("utf-8")).hexdigest()
+        assert row["word_count"] > 0
+
+    def test_language_detected_once_per_expression(self):
+        paragraph = "Un paragraphe suffisamment long pour être extrait du texte source."
+        expression = SimpleNamespace(
+            id=7, readable=f"{paragraph} Un.\n\n{paragraph} Deux.", content=None,
+            description=None, summary=None, title=None,
+        )
+
+        with patch.object(text_processor_service, "detect_language", return_value="fr") as detect, patch(
+            "app.utils.text_utils.detect_language", return_value="en"
+        ) as per_paragraph:
+            rows = TextProcessorService()._build_paragraph_rows(expression, min_length=20)
+            detect.assert_called_once()
+            per_paragraph.assert_not_called()
+            assert {dict(zip(PARAGRAPH_COPY_COLUMNS, row))["language"] for row in rows} == {"fr"}
+
+            rows = TextProcessorService(per_paragraph_language=True)._build_paragraph_rows(
+                expression, min_length=20
+            )
+            assert per_paragraph.call_count == 2
+            assert {dict(zip(PARAGRAPH_COPY_COLUMNS, row))["language"] for row in rows} == {"en"}
+
+    def test_short_text_yields_no_rows(self):
+        expression = SimpleNamespace(id=1, readable="court", content=None, description=None, summary=None, title=None)
+        assert TextProcessorService()._build_paragraph_rows(expression) == []
+
+
+class TestCopyInsert:
+    async def test_copy_records_through_asyncpg(self):
+        driver_connection = MagicMock()
+        driver_connection.copy_records_to_table = AsyncMock()
+        connection = MagicMock()
+        connection.get_raw_connection = AsyncMock(
+            return_value=SimpleNamespace(driver_connection=driver_connection)
+        )
+        db = MagicMock()
+        db.connection = AsyncMock(return_value=connection)
+        rows = [(1, "texte", "hash", 0, 1, 5, 1, "fr", 50.0)]
+
+        assert await paragraph_crud.copy_insert(db, rows) == 1
+        driver_connection.copy_records_to_table.assert_awaited_once_with(
+            "paragraphs", records=rows, columns=PARAGRAPH_COPY_COLUMNS
+        )
+        assert await paragraph_crud.copy_insert(db, []) == 0
+
+
+class TestBulkCreate:
+    def test_duplicates_filtered_with_one_query(self):
+        existing_hash = hashlib.sha256("déjà en base".encode("utf-8")).hexdigest()
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.return_value = [(1, existing_hash)]
+        paragraphs = [
+            ParagraphCreate(expression_id=1, text="déjà en base", position=0),
+            ParagraphCreate(expression_id=1, text="nouveau paragraphe", position=1),
+            ParagraphCreate(expression_id=1, text="nouveau paragraphe", position=2),
+            ParagraphCreate(expression_id=2, text="déjà en base", position=0, language="en"),
+        ]
+
+        created = paragraph_crud.bulk_create(db, paragraphs)
+
+        db.query.assert_called_once()
+        assert [(obj.expression_id, obj.position) for obj in created] == [(1, 1), (2, 0)]
+        assert created[1].language == "en"
+        assert created[0].word_count == 2
+        db.commit.assert_called_once()
+
+
+class TestRelevanceDictionaryCache:
+    @pytest.fixture(autouse=True)
+    def empty_dictionary_cache(self):
+        text_processing.invalidate_land_dictionary()
+        yield
+        text_processing.invalidate_land_dictionary()
+
+    async def test_dictionary_fetched_once_per_land(self):
+        fetch = AsyncMock(return_value={"climat": 1.0})
+        service = TextProcessorService(db=MagicMock())
+
+        with patch.object(text_processing, "get_land_dictionary", fetch):
+            first = await service.calculate_relevance("le climat change", land_id=1)
+            second = await service.calculate_relevance("le climat encore", land_id=1)
+            await service.calculate_relevance("climat", land_id=2)
+
+        assert first > 0 and second > 0
+        assert [call.args[1] for call in fetch.await_args_list] == [1, 2]
+
+    async def test_invalidation_and_ttl_force_reload(self):
+        fetch = AsyncMock(return_value={"climat": 1.0})
+        db = MagicMock()
+
+        with patch.object(text_processing, "get_land_dictionary", fetch):
+            await text_processing.get_land_dictionary_cached(db, 1)
+            text_processing.invalidate_land_dictionary(1)
+            await text_processing.get_land_dictionary_cached(db, 1)
+            await text_processing.get_land_dictionary_cached(db, 1, ttl=0)
+
+        assert fetch.await_count == 3
+
+
+class TestRelevanceKeywords:
+    def test_lemmatization_stops_at_max_keywords(self):
+        text = "climat température énergie politique hausse " * 200
+        with patch.object(text_processing, "_stop_words", return_value=frozenset()), patch.object(
+            text_processing, "get_lemma", side_effect=lambda token, lang: token
+        ) as lemma:
+            keywords = text_processing.extract_keywords(text, "fr", max_keywords=3)
+
+        assert keywords == ["climat", "température", "énergie"]
+        assert lemma.call_count == 3
+
+
+class _ExclusiveSession:
+    """AsyncSession factice qui refuse, comme le driver, deux requêtes simultanées."""
+
+    def __init__(self, rows, dictionaries):
+        self.rows = rows
+        self.dictionaries = dictionaries
+        self.busy = False
+        self.updates = []
+        self.commit = AsyncMock()
+        self.rollback = AsyncMock()
+
+    async def execute(self, stmt):
+        if self.busy:
+            raise RuntimeError("another operation is in progress")
+        self.busy = True
+        try:
+            await asyncio.sleep(0)
+            result = MagicMock()
+            if stmt.is_select and "land_dictionaries" in str(stmt):
+                land_id = stmt.compile().params["land_id_1"]
+                result.fetchall.return_value = list(self.dictionaries[land_id].items())
+            elif stmt.is_select:
+                result.all.return_value = self.rows
+            else:
+                self.updates.append(stmt)
+            return result
+        finally:
+            self.busy = False
+
+
+class TestRelevanceBatch:
+    @pytest.fixture(autouse=True)
+    def empty_dictionary_cache(self):
+        text_processing.invalidate_land_dictionary()
+        yield
+        text_processing.invalidate_land_dictionary()
+
+    async def test_single_update_from_values(self):
+        rows = [
+            SimpleNamespace(id=1, title="Climat", readable="le climat", land_id=1, lang="fr", relevance=None),
+            SimpleNamespace(id=2, title=None, readable="déjà noté", land_id=1, lang=None, relevance=3.0),
+        ]
+        select_result = MagicMock()
+        select_result.all.return_value = rows
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=[select_result, MagicMock()])
+        db.commit = AsyncMock()
+        service = TextProcessorService(db=db)
+
+        with patch.object(
+            text_processor_service, "get_land_dictionary_cached", AsyncMock(return_value={"climat": 1.0})
+        ), patch.object(text_processor_service, "expression_relevance", AsyncMock(return_value=7.0)) as score:
+            outcome = await service.update_expression_relevance_batch([1, 2, 99])
+
+        assert score.await_count == 1
+        assert outcome["updated"] == 1
+        assert outcome["skipped"] == 1
+        assert outcome["missing"] == [99]
+        assert outcome["relevances"] == {1: 7.0}
+        update_sql = str(db.execute.await_args_list[1].args[0])
+        assert "FROM (VALUES" in update_sql
+        db.commit.assert_awaited_once()
+
+    async def test_expressions_from_several_lands_share_the_session_sequentially(self):
+        """Dictionnaires de deux lands non cachés : aucune requête concurrente sur la session."""
+        rows = [
+            SimpleNamespace(id=1, title="Climat", readable="le climat change", land_id=1, lang="fr", relevance=None),
+            SimpleNamespace(id=2, title="Climat", readable="le climat change", land_id=2, lang="fr", relevance=None),
+        ]
+        db = _ExclusiveSession(rows, {1: {"climat": 1.0}, 2: {"climat": 1.0}})
+        service = TextProcessorService(db=db)
+
+        outcome = await service.update_expression_relevance_batch([1, 2])
+
+        assert outcome["success"] is True
+        assert outcome["relevances"][1] > 0
+        assert outcome["relevances"][1] == outcome["relevances"][2]
+        assert len(db.updates) == 1
+        db.commit.assert_awaited_once()
+
+    async def test_dictionary_error_fails_batch_without_writing(self):
+        rows = [SimpleNamespace(id=1, title=None, readable="le climat", land_id=1, lang="fr", relevance=None)]
+        db = _ExclusiveSession(rows, {})
+        service = TextProcessorService(db=db)
+
+        outcome = await service.update_expression_relevance_batch([1])
+
+        assert outcome["success"] is False
+        assert db.updates == []
+        db.rollback.assert_awaited_once()
+
+
+class TestRelevanceSingle:
+    async def test_projected_select_then_update_in_one_commit(self):
+        row = SimpleNamespace(id=4, title="Climat", readable="le climat", land_id=1, lang="fr", relevance=None)
+        select_result = MagicMock()
+        select_result.one_or_none.return_value = row
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=[select_result, MagicMock()])
+        db.commit = AsyncMock()
+        service = TextProcessorService(db=db)
+
+        with patch.object(service, "calculate_relevance", AsyncMock(return_value=2.5)):
+            outcome = await service.update_expression_relevance(4)
+
+        assert outcome["new_relevance"] == 2.5
+        select_sql = str(db.execute.await_args_list[0].args[0])
+        assert "expressions.content" not in select_sql
+        db.commit.assert_awaited_once()
+
+
+class TestParagraphLengthStats:
+    def test_distribution(self):
+        stats = TextProcessorService._paragraph_length_stats(["a" * 10, "b" * 20, "c" * 30, "d" * 40])
+        assert stats["extractable_paragraphs"] == 4
+        assert stats["avg_paragraph_length"] == 25.0
+        assert stats["median_paragraph_length"] == 25.0
+        assert stats["p90_paragraph_length"] == pytest.approx(37.0)
+        assert stats["std_paragraph_length"] == pytest.approx(11.18, abs=0.01)
+        assert len(stats["sample_paragraphs"]) == 3
+
+    def test_empty(self):
+        stats = TextProcessorService._paragraph_length_stats([])
+        assert stats["extractable_paragraphs"] == 0
+        assert stats["avg_paragraph_length"] == 0
+        assert stats["sample_paragraphs"] == []
+
+
+class TestTextQualityScore:
+    @pytest.mark.parametrize(
+        "word_count, expected",
+        [(0, 0), (10, 0), (11, 10), (19, 10), (20, 15), (49, 15), (50, 20), (2000, 20), (2001, 15), (5000, 15), (5001, 10)],
+    )
+    def test_word_count_buckets(self, word_count, expected):
+        score = TextProcessorService._calculate_text_quality_score({"word_count": word_count}, {})
+        assert score == expected
+
+    @pytest.mark.parametrize(
+        "reading_level, expected",
+        [(None, 0), (0, 0), (10, 0), (10.5, 15), (20, 20), (39.9, 20), (40, 25), (80, 25), (80.1, 20), (90, 20), (90.5, 15)],
+    )
+    def test_reading_level_buckets(self, reading_level, expected):
+        score = TextProcessorService._calculate_text_quality_score({}, {"reading_level": reading_level})
+        assert score == expected
+
+    @pytest.mark.parametrize(
+        "char_count, expected",
+        [(19, 0), (20, 5), (39, 5), (40, 10), (80, 10), (81, 5), (120, 5), (121, 0)],
+    )
+    def test_chars_per_word_buckets(self, char_count, expected):
+        # 10 mots : aucun point de longueur, seul le barème caractères/mot compte
+        score = TextProcessorService._calculate_text_quality_score(
+            {"word_count": 10}, {"char_count": char_count}
+        )
+        assert score == expected
+
+
+class TestProcessingStats:
+    def test_coverage_from_single_aggregate(self):
+        db = MagicMock()
+        db.execute.return_value.one.return_value = SimpleNamespace(total=4, with_paragraphs=3, total_chars=2000)
+        paragraph_stats = {"total_paragraphs": 12, "languages": {"fr": 12}}
+
+        with patch.object(
+            text_processor_service.paragraph_crud, "get_stats_by_land", return_value=paragraph_stats
+        ):
+            stats = TextProcessorService().get_processing_stats(db, 1)
+
+        db.execute.assert_called_once()
+        sql = str(db.execute.call_args.args[0])
+        assert "FILTER (WHERE EXISTS" in sql
+        assert stats["total_expressions"] == 4
+        assert stats["expressions_with_paragraphs"] == 3
+        assert stats["expression_processing_coverage"] == 75.0
+        assert stats["avg_expression_length"] == 500.0
+        assert stats["language_distribution"] == {"fr": 12}
@@ -0,0 +1,119 @@
+"""
+Tests unitaires pour les utilitaires d'analyse de texte.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.utils import text_utils
+from app.utils.text_utils import clear_language_cache, detect_language
+
+
+@pytest.fixture(autouse=True)
+def empty_language_cache():
+    """Chaque test part d'un cache de langues vide."""
+    clear_language_cache()
+    yield
+    clear_language_cache()
+
+
+class TestLanguageCache:
+    def test_repeated_text_detected_once(self):
+        text = "Ceci est un texte suffisamment long pour la détection."
+        with patch.object(text_utils, "_detect_language_uncached", return_value="fr") as detect:
+            assert detect_language(text) == "fr"
+            assert detect_language(text) == "fr"
+            assert detect_language(text + " Encore.") == "fr"
+
+        assert detect.call_count == 2
+
+    def test_lru_eviction(self):
+        with patch.object(text_utils, "LANGUAGE_CACHE_SIZE", 2), patch.object(
+            text_utils, "_detect_language_uncached", return_value="en"
+        ) as detect:
+            for text in ("texte a", "texte b", "texte c", "texte a"):
+                detect_language(text)
+
+        assert detect.call_count == 4
+
+    def test_empty_text_not_cached(self):
+        assert detect_language("") is None
+        assert len(text_utils._language_cache) == 0
+
+
+class TestAnalyzeDocument:
+    TEXT = (
+        "Le climat change rapidement. Les chercheurs observent le climat depuis des décennies!\n\n"
+        "Les modèles climatiques prévoient une hausse des températures. Le climat inquiète?"
+    )
+
+    def test_matches_individual_helpers(self):
+        document = text_utils.analyze_document(self.TEXT, min_paragraph_length=10)
+
+        assert text_utils.document_metrics(document) == text_utils.analyze_text_metrics(self.TEXT)
+        assert document.paragraphs == text_utils.extract_paragraphs_from_text(self.TEXT, 10)
+        assert text_utils.top_keywords(document.keyword_freqs) == text_utils.extract_keywords(self.TEXT)
+        assert document.keyword_freqs["climat"] == 3
+
+    def test_summary_stats_from_single_pass(self):
+        with patch.object(text_utils, "extract_paragraphs_from_text", wraps=text_utils.extract_paragraphs_from_text) as split:
+            stats = text_utils.get_text_summary_stats(self.TEXT)
+
+        split.assert_called_once()
+        assert stats["word_count"] == len(self.TEXT.split())
+        assert stats["sentence_count"] == 4
+        assert stats["paragraph_count"] == 2
+        assert stats["keywords"][0] == "climat"
+
+    def test_empty_text_summary(self):
+        assert text_utils.get_text_summary_stats("")["sentence_count"] == 0
+
+
+class TestParagraphExtraction:
+    def test_single_block_fast_path(self):
+        text = "  Un seul bloc de texte,\nsans séparateur &amp; sur deux lignes.  "
+        with patch.object(text_utils, "_PARAGRAPH_SPLIT_RE") as splitter:
+            paragraphs = text_utils.extract_paragraphs_from_text(text, min_length=10)
+
+        splitter.split.assert_not_called()
+        assert paragraphs == ["Un seul bloc de texte, sans séparateur & sur deux lignes."]
+
+    def test_breaks_and_html_still_split(self):
+        text = "Premier paragraphe assez long.\n \nSecond paragraphe assez long.<br/>Troisième paragraphe <b>long</b>."
+        assert text_utils.extract_paragraphs_from_text(text, min_length=10) == [
+            "Premier paragraphe assez long.",
+            "Second paragraphe assez long.",
+            "Troisième paragraphe long.",
+        ]
+
+
+class TestLanguageBackends:
+    TEXT = "This is clearly an English sentence about the weather today."
+
+    def test_fasttext_preferred_when_available(self):
+        fast = MagicMock(return_value={"lang": "en", "score": 0.98})
+        slow = MagicMock(return_value="fr")
+        with patch.object(text_utils, "_fast_langdetect_detect", fast), patch.object(
+            text_utils, "_langdetect_detect", slow
+        ):
+            assert detect_language(self.TEXT + "\nSecond line.") == "en"
+
+        slow.assert_not_called()
+        assert "\n" not in fast.call_args.args[0]
+
+    def test_langdetect_used_when_fasttext_fails(self):
+        fast = MagicMock(side_effect=ValueError("model unavailable"))
+        with patch.object(text_utils, "_fast_langdetect_detect", fast), patch.object(
+            text_utils, "_langdetect_detect", MagicMock(return_value="en")
+        ):
+            assert detect_language(self.TEXT) == "en"
+
+    def test_only_prefix_analyzed(self):
+        with patch.object(text_utils, "LANGUAGE_DETECTION_PREFIX", 20), patch.object(
+            text_utils, "_detect_language_uncached", return_value="en"
+        ) as detect:
+            detect_language(self.TEXT + " suite A")
+            detect_language(self.TEXT + " suite B")
+
+        assert detect.call_count == 1
+        assert detect.call_args.args[0] == self.TEXT[:20]